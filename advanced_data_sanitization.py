@@ -3,73 +3,56 @@
 Advanced Data Sanitization Script
 Project GRIDLOCK - Phase 2 Cleaning
 Purpose: Standardize nulls, sanitize numeric columns, normalize categories
+Usage: python advanced_data_sanitization.py [--csv] [--workers N]
 """
 
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
-import re
-
-print("="*70)
-print("ADVANCED DATA SANITIZATION - PHASE 2")
-print("="*70)
-
-# Load the dataset
-input_file = 'Motor_Vehicle_Collisions_POWERBI_READY.csv'
-print(f"\nLoading: {input_file}")
-df = pd.read_csv(input_file, low_memory=False)
-
-print(f"Initial shape: {df.shape}")
-print(f"Initial rows: {len(df):,}")
-
-# ========================================================================
-# STEP 1: STANDARDIZE NULLS (Case-Insensitive)
-# ========================================================================
-print("\n[STEP 1] Standardizing null representations...")
-
-null_variants = ['Null', 'Unknown', 'nan', 'nan ', 'unspecified', 'Unknown', 
-                 'Null', 'NULL', 'UNKNOWN', 'NaN', 'N/A', 'n/a', '']
-
-# Replace null variants with actual NaN
-for col in df.columns:
-    # Create case-insensitive replacement
-    df[col] = df[col].replace({val: np.nan for val in null_variants})
-    
-    # Also handle as strings (case-insensitive)
-    if df[col].dtype == 'object':
-        mask = df[col].astype(str).str.strip().str.lower().isin(
-            [v.lower() for v in null_variants]
-        )
-        df.loc[mask, col] = np.nan
-
-null_count_after = df.isna().sum().sum()
-print(f"   Total nulls after standardization: {null_count_after:,}")
-
-# ========================================================================
-# STEP 2: SANITIZE NUMERIC COLUMNS
-# ========================================================================
-print("\n[STEP 2] Sanitizing numeric columns...")
+from gridlock_dedup import Deduplicator
+from gridlock_engine import GRID_COLUMNS, NULL_VARIANTS, parse_dates, parse_times, recode, standardize_nulls
+from gridlock_io import (
+    FINAL_SCHEMA, FINAL_TABLE, POWERBI_TABLE, apply_schema, print_memory_report, read_table, table_path,
+    write_table
+)
+from gridlock_metrics import RunReport
 
 def sanitize_numeric(series, dtype='float'):
     """Clean numeric column: remove commas, ?, 'approx', strip whitespace"""
     
-    # Convert to string first
-    cleaned = series.astype(str)
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        # Already typed (engineered columns, schema-loaded tables): nothing to strip
+        cleaned = series
+    else:
+        # Text: every distinct value is cleaned once and mapped back
+        # (a count column holds a handful of distinct strings)
+        codes, uniques = pd.factorize(series)
+
+        # Convert to string first
+        cleaned = pd.Series(uniques).astype(str)
     
-    # Remove unwanted characters and substrings
-    cleaned = cleaned.str.replace(',', '', regex=False)  # Remove commas
-    cleaned = cleaned.str.replace('?', '', regex=False)  # Remove question marks
-    cleaned = cleaned.str.replace('approx.', '', regex=False)  # Remove 'approx.'
-    cleaned = cleaned.str.replace('approx', '', regex=False)  # Remove 'approx'
-    cleaned = cleaned.str.strip()  # Strip whitespace
+        # Remove unwanted characters and substrings
+        cleaned = cleaned.str.replace(',', '', regex=False)  # Remove commas
+        cleaned = cleaned.str.replace('?', '', regex=False)  # Remove question marks
+        cleaned = cleaned.str.replace('approx.', '', regex=False)  # Remove 'approx.'
+        cleaned = cleaned.str.replace('approx', '', regex=False)  # Remove 'approx'
+        cleaned = cleaned.str.strip()  # Strip whitespace
     
-    # Replace empty strings with NaN
-    cleaned = cleaned.replace('', np.nan)
-    cleaned = cleaned.replace('nan', np.nan)
-    cleaned = cleaned.replace('NaN', np.nan)
-    cleaned = cleaned.replace('None', np.nan)
+        # Replace empty strings with NaN
+        cleaned = cleaned.replace('', np.nan)
+        cleaned = cleaned.replace('nan', np.nan)
+        cleaned = cleaned.replace('NaN', np.nan)
+        cleaned = cleaned.replace('None', np.nan)
     
-    # Convert to numeric (use standard types, not nullable)
-    cleaned = pd.to_numeric(cleaned, errors='coerce')
+        # Convert to numeric (use standard types, not nullable)
+        values = pd.to_numeric(cleaned, errors='coerce').to_numpy()
+        if (codes < 0).any():
+            values = np.where(codes >= 0, values.astype(float)[codes], np.nan)
+        else:
+            values = values[codes]
+        cleaned = pd.Series(values, index=series.index, name=series.name)
     
     # Then cast to int if needed (this will convert to float if NaN present)
     if dtype == 'int':
@@ -78,7 +61,8 @@ def sanitize_numeric(series, dtype='float'):
     
     return cleaned
 
-# Apply to specific columns
+
+# Numeric columns and their target type
 numeric_columns = {
     'NUMBER OF PERSONS INJURED': 'int',
     'NUMBER OF PERSONS KILLED': 'int',
@@ -97,172 +81,286 @@ numeric_columns = {
     'coord_recovery_flag': 'int',
 }
 
-for col, dtype in numeric_columns.items():
-    if col in df.columns:
-        original_nulls = df[col].isna().sum()
-        df[col] = sanitize_numeric(df[col], dtype)
-        new_nulls = df[col].isna().sum()
-        if new_nulls > original_nulls:
-            print(f"   {col}: {original_nulls} -> {new_nulls} nulls (sanitized)")
-        else:
-            print(f"   {col}: Sanitized ({new_nulls:,} nulls)")
-
-# ========================================================================
-# STEP 3: CATEGORICAL NORMALIZATION
-# ========================================================================
-print("\n[STEP 3] Normalizing categorical columns...")
-
-# BOROUGH: Strip whitespace + UPPERCASE
-if 'BOROUGH' in df.columns:
-    original_unique = df['BOROUGH'].nunique()
-    df['BOROUGH'] = df['BOROUGH'].astype(str).str.strip().str.upper()
-    df['BOROUGH'] = df['BOROUGH'].replace('NAN', np.nan)
-    new_unique = df['BOROUGH'].nunique()
-    print(f"   BOROUGH: {original_unique} -> {new_unique} unique values (normalized to UPPERCASE)")
-
-# ZIP CODE: Ensure clean integers
-if 'ZIP CODE' in df.columns:
-    df['ZIP CODE'] = sanitize_numeric(df['ZIP CODE'], 'int')
-    print(f"   ZIP CODE: Sanitized (numeric)")
-
-# VEHICLE TYPE CODES: Title Case (already clean, but ensure consistency)
-vehicle_cols = [c for c in df.columns if 'VEHICLE TYPE CODE' in c]
-for col in vehicle_cols:
-    if col in df.columns:
-        df[col] = df[col].astype(str).str.strip().str.title()
-        df[col] = df[col].replace('Nan', np.nan)
-
-print(f"   {len(vehicle_cols)} vehicle type columns normalized to Title Case")
-
-# ========================================================================
-# STEP 4: TEMPORAL STANDARDIZATION
-# ========================================================================
-print("\n[STEP 4] Standardizing temporal columns...")
-
-# CRASH DATE: Ensure YYYY-MM-DD format
-if 'CRASH DATE' in df.columns:
-    try:
-        df['CRASH DATE'] = pd.to_datetime(df['CRASH DATE'], errors='coerce')
-        df['CRASH DATE'] = df['CRASH DATE'].dt.strftime('%Y-%m-%d')
-        print(f"   CRASH DATE: Standardized to YYYY-MM-DD")
-    except Exception as e:
-        print(f"   CRASH DATE: Error - {e}")
-
-# CRASH TIME: Ensure HH:MM:SS format
-if 'CRASH TIME' in df.columns:
-    try:
-        # Handle missing/malformed times
-        df['CRASH TIME'] = df['CRASH TIME'].astype(str).str.strip()
-        
-        # Replace malformed entries with NaN
-        df.loc[df['CRASH TIME'].isin(['', 'nan', 'NaN', 'None']), 'CRASH TIME'] = np.nan
-        
-        # Attempt to parse times
-        # If already HH:MM:SS, keep; if HH:MM, append :00
-        def standardize_time(t):
-            if pd.isna(t):
-                return np.nan
-            t = str(t).strip()
-            if len(t.split(':')) == 2:  # HH:MM
-                return f"{t}:00"
-            elif len(t.split(':')) == 3:  # HH:MM:SS
-                return t
+
+def _title_vehicle(value):
+    return None if pd.isna(value) else str(value).strip().title() or None
+
+
+def clean_column(col, series):
+    """
+    Steps 1-3 for a single column (every column is independent up to Step 4).
+    Returns the cleaned series and the figures the step reports print.
+    """
+    log = {}
+
+    # STEP 1: null variants -> NaN (NULL_VARIANTS, the tokens and rule the audit scores with).
+    # The column's distinct values are checked once and mapped back in one step.
+    series = standardize_nulls(series, NULL_VARIANTS)
+    log['nulls'] = int(series.isna().sum())
+
+    # STEP 2: numeric sanitization
+    if col in numeric_columns:
+        series = sanitize_numeric(series, numeric_columns[col])
+        log['numeric'] = (log['nulls'], int(series.isna().sum()))
+
+    # STEP 3: categorical normalization
+    if col == 'BOROUGH':
+        # Strip whitespace + UPPERCASE
+        original_unique = series.nunique()
+        series = series.astype(str).str.strip().str.upper()
+        series = series.replace('NAN', np.nan)
+        log['unique'] = (original_unique, series.nunique())
+    elif col == 'ZIP CODE':
+        # Ensure clean integers
+        series = sanitize_numeric(series, 'int')
+    elif 'VEHICLE TYPE CODE' in col:
+        # Title Case (the audit already normalized them; this only touches each distinct label once)
+        series = recode(series, _title_vehicle)
+        if 'Nan' in series.cat.categories:
+            series = series.cat.remove_categories('Nan')
+
+    return series, log
+
+
+_shared = {}
+
+
+def _clean_column_task(col, series=None):
+    # Forked workers read the column from the frame they inherited (no copy in)
+    if series is None:
+        series = _shared['df'][col]
+    return clean_column(col, series)
+
+
+def clean_columns(df, workers=1):
+    """
+    Run Steps 1-3 over every column, serially or on a process pool of `workers`.
+    Where fork is available the pool inherits the frame and only the cleaned
+    columns travel back; elsewhere each task is sent just its own column.
+    """
+    if workers <= 1:
+        results = [clean_column(col, df[col]) for col in df.columns]
+    else:
+        fork = 'fork' in multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if fork else None)
+        _shared['df'] = df
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = [pool.submit(_clean_column_task, col, None if fork else df[col]) for col in df.columns]
+                results = [future.result() for future in futures]
+        finally:
+            _shared.clear()
+
+    logs = {}
+    for col, (series, log) in zip(list(df.columns), results):
+        df[col] = series
+        logs[col] = log
+    return df, logs
+
+
+def sanitize(df, workers=1, report=None, dedup=None):
+    """
+    Run sanitization steps 1-6 on a frame and return the cleaned frame.
+    Pass a Deduplicator to drop rows and COLLISION_IDs it has already seen
+    (earlier chunks or runs); a fresh one is used otherwise.
+    """
+    report = report or RunReport('sanitize')
+    dedup = dedup or Deduplicator()
+
+    # Steps 1-3 are per-column, so they run together (optionally in parallel)
+    # and are reported step by step afterwards
+    with report.stage('steps_1_3_column_cleaning', len(df)):
+        df, logs = clean_columns(df, workers)
+
+    # ========================================================================
+    # STEP 1: STANDARDIZE NULLS (Case-Insensitive)
+    # ========================================================================
+    print("\n[STEP 1] Standardizing null representations...")
+
+    null_count_after = sum(log['nulls'] for log in logs.values())
+    print(f"   Total nulls after standardization: {null_count_after:,}")
+
+    # ========================================================================
+    # STEP 2: SANITIZE NUMERIC COLUMNS
+    # ========================================================================
+    print("\n[STEP 2] Sanitizing numeric columns...")
+
+    for col in numeric_columns:
+        if col in df.columns:
+            original_nulls, new_nulls = logs[col]['numeric']
+            if new_nulls > original_nulls:
+                print(f"   {col}: {original_nulls} -> {new_nulls} nulls (sanitized)")
             else:
-                return np.nan
-        
-        df['CRASH TIME'] = df['CRASH TIME'].apply(standardize_time)
-        print(f"   CRASH TIME: Standardized to HH:MM:SS")
-    except Exception as e:
-        print(f"   CRASH TIME: Error - {e}")
-
-# ========================================================================
-# STEP 5: DATA INTEGRITY
-# ========================================================================
-print("\n[STEP 5] Data integrity checks...")
-
-# Drop 100% duplicate rows
-initial_rows = len(df)
-df = df.drop_duplicates()
-duplicates_removed = initial_rows - len(df)
-print(f"   Duplicate rows removed: {duplicates_removed}")
-
-# Check COLLISION_ID uniqueness
-if 'COLLISION_ID' in df.columns:
-    collision_id_nulls = df['COLLISION_ID'].isna().sum()
-    collision_id_dupes = df['COLLISION_ID'].duplicated().sum()
-    
-    print(f"   COLLISION_ID nulls: {collision_id_nulls}")
-    print(f"   COLLISION_ID duplicates: {collision_id_dupes}")
-    
-    if collision_id_dupes > 0:
-        print(f"   WARNING: {collision_id_dupes} duplicate COLLISION_IDs found!")
-        print(f"   Keeping first occurrence, dropping duplicates...")
-        df = df.drop_duplicates(subset=['COLLISION_ID'], keep='first')
-        print(f"   Rows after deduplication: {len(df):,}")
-
-# ========================================================================
-# STEP 6: FINAL VALIDATION
-# ========================================================================
-print("\n[STEP 6] Final validation...")
-
-# Check coordinate validity (NYC boundaries)
-if 'LATITUDE' in df.columns and 'LONGITUDE' in df.columns:
-    valid_coords = (
-        (df['LATITUDE'] >= 40.4) & (df['LATITUDE'] <= 41.0) &
-        (df['LONGITUDE'] >= -74.3) & (df['LONGITUDE'] <= -73.7)
-    )
-    invalid_coords = (~valid_coords) & df['LATITUDE'].notna() & df['LONGITUDE'].notna()
+                print(f"   {col}: Sanitized ({new_nulls:,} nulls)")
+
+    # ========================================================================
+    # STEP 3: CATEGORICAL NORMALIZATION
+    # ========================================================================
+    print("\n[STEP 3] Normalizing categorical columns...")
+
+    if 'BOROUGH' in df.columns:
+        original_unique, new_unique = logs['BOROUGH']['unique']
+        print(f"   BOROUGH: {original_unique} -> {new_unique} unique values (normalized to UPPERCASE)")
+
+    if 'ZIP CODE' in df.columns:
+        print(f"   ZIP CODE: Sanitized (numeric)")
+
+    vehicle_cols = [c for c in df.columns if 'VEHICLE TYPE CODE' in c]
+    print(f"   {len(vehicle_cols)} vehicle type columns normalized to Title Case")
+
+    # ========================================================================
+    # STEP 4: TEMPORAL STANDARDIZATION
+    # ========================================================================
+    print("\n[STEP 4] Standardizing temporal columns...")
+    with report.stage('step_4_temporal', len(df)):
+        # CRASH DATE: Ensure YYYY-MM-DD format (shared parser, distinct values only)
+        if 'CRASH DATE' in df.columns:
+            try:
+                parsed_dates, date_formats = parse_dates(df['CRASH DATE'])
+                df['CRASH DATE'] = parsed_dates.dt.strftime('%Y-%m-%d')
+                print(f"   CRASH DATE: Standardized to YYYY-MM-DD ({date_formats['distinct']:,} distinct values parsed)")
+            except Exception as e:
+                print(f"   CRASH DATE: Error - {e}")
+
+        # CRASH TIME: Ensure HH:MM:SS format
+        # If already HH:MM:SS, keep; if HH:MM, append :00
+        if 'CRASH TIME' in df.columns:
+            try:
+                df['CRASH TIME'], time_formats = parse_times(df['CRASH TIME'])
+                print(f"   CRASH TIME: Standardized to HH:MM:SS ({time_formats['distinct']:,} distinct values parsed)")
+            except Exception as e:
+                print(f"   CRASH TIME: Error - {e}")
+
+    # ========================================================================
+    # STEP 5: DATA INTEGRITY
+    # ========================================================================
+    print("\n[STEP 5] Data integrity checks...")
+    with report.stage('step_5_data_integrity', len(df)) as stage:
+        # Drop 100% duplicate rows, then keep the first row per COLLISION_ID
+        # (64-bit row digests and a sorted ID set, see gridlock_dedup.py)
+        df, dupes = dedup.drop_duplicates(df)
+        print(f"   Duplicate rows removed: {dupes['duplicate_rows']}")
+
+        # Check COLLISION_ID uniqueness
+        if 'COLLISION_ID' in df.columns:
+            collision_id_dupes = dupes['duplicate_ids']
+
+            print(f"   COLLISION_ID nulls: {dupes['id_nulls']}")
+            print(f"   COLLISION_ID duplicates: {collision_id_dupes}")
+
+            if collision_id_dupes > 0:
+                print(f"   WARNING: {collision_id_dupes} duplicate COLLISION_IDs found!")
+                print(f"   Collided IDs ({len(dupes['collided_ids']):,}): "
+                      f"{', '.join(str(i) for i in dupes['collided_ids'][:10])}"
+                      f"{' ...' if len(dupes['collided_ids']) > 10 else ''}")
+                print(f"   Keeping first occurrence, dropping duplicates...")
+                print(f"   Rows after deduplication: {len(df):,}")
+        stage['rows_out'] = len(df)
+
+    # ========================================================================
+    # STEP 6: FINAL VALIDATION
+    # ========================================================================
+    print("\n[STEP 6] Final validation...")
+    with report.stage('step_6_final_validation', len(df)):
+        # Check coordinate validity (NYC boundaries)
+        if 'LATITUDE' in df.columns and 'LONGITUDE' in df.columns:
+            valid_coords = (
+                (df['LATITUDE'] >= 40.4) & (df['LATITUDE'] <= 41.0) &
+                (df['LONGITUDE'] >= -74.3) & (df['LONGITUDE'] <= -73.7)
+            )
+            invalid_coords = (~valid_coords) & df['LATITUDE'].notna() & df['LONGITUDE'].notna()
     
-    print(f"   Valid NYC coordinates: {valid_coords.sum():,}")
-    print(f"   Invalid/out-of-bounds coordinates: {invalid_coords.sum():,}")
+            print(f"   Valid NYC coordinates: {valid_coords.sum():,}")
+            print(f"   Invalid/out-of-bounds coordinates: {invalid_coords.sum():,}")
     
-    # Optionally null out invalid coordinates
-    if invalid_coords.sum() > 0:
-        print(f"   Setting invalid coordinates to NaN...")
-        df.loc[invalid_coords, ['LATITUDE', 'LONGITUDE']] = np.nan
-
-# ========================================================================
-# STEP 7: EXPORT CLEANED DATASET
-# ========================================================================
-output_file = 'Motor_Vehicle_Collisions_FINAL_CLEAN.csv'
-df.to_csv(output_file, index=False, encoding='utf-8')
-
-print("\n" + "="*70)
-print("SANITIZATION COMPLETE")
-print("="*70)
-print(f"\nFinal shape: {df.shape}")
-print(f"Final rows: {len(df):,}")
-print(f"Total columns: {len(df.columns)}")
-print(f"\nOutput file: {output_file}")
-
-# ========================================================================
-# SUMMARY STATISTICS
-# ========================================================================
-print("\n" + "="*70)
-print("SUMMARY STATISTICS")
-print("="*70)
-
-print("\n1. NULL COUNTS BY COLUMN (Top 10):")
-null_counts = df.isna().sum().sort_values(ascending=False).head(10)
-for col, count in null_counts.items():
-    pct = (count / len(df)) * 100
-    print(f"   {col}: {count:,} ({pct:.1f}%)")
-
-print("\n2. BOROUGH DISTRIBUTION:")
-if 'BOROUGH' in df.columns:
-    for borough, count in df['BOROUGH'].value_counts().items():
-        print(f"   {borough}: {count:,}")
-
-print("\n3. DATA QUALITY:")
-print(f"   Rows with complete coordinates: {(df['LATITUDE'].notna() & df['LONGITUDE'].notna()).sum():,}")
-print(f"   Rows with SEVERITY_SCORE > 0: {(df['SEVERITY_SCORE'] > 0).sum():,}")
-print(f"   Vulnerable user crashes: {(df['VULNERABILITY_FLAG'] == 1).sum():,}")
-
-print("\n4. TEMPORAL COVERAGE:")
-if 'CRASH DATE' in df.columns:
-    date_col = pd.to_datetime(df['CRASH DATE'], errors='coerce')
-    print(f"   Earliest crash: {date_col.min()}")
-    print(f"   Latest crash: {date_col.max()}")
-
-print("\n✓ Dataset ready for Power BI import!")
-print("="*70)
+            # Optionally null out invalid coordinates (and their grid cells)
+            if invalid_coords.sum() > 0:
+                print(f"   Setting invalid coordinates to NaN...")
+                df.loc[invalid_coords, ['LATITUDE', 'LONGITUDE']] = np.nan
+                df.loc[invalid_coords, [col for col in GRID_COLUMNS if col in df.columns]] = -1
+
+        # Final in-memory types: categoricals and small integer counts
+        df = apply_schema(df, FINAL_SCHEMA)
+    return df
+
+
+def print_summary(df):
+    print("\n" + "="*70)
+    print("SUMMARY STATISTICS")
+    print("="*70)
+
+    print("\n1. NULL COUNTS BY COLUMN (Top 10):")
+    null_counts = df.isna().sum().sort_values(ascending=False).head(10)
+    for col, count in null_counts.items():
+        pct = (count / len(df)) * 100
+        print(f"   {col}: {count:,} ({pct:.1f}%)")
+
+    print("\n2. BOROUGH DISTRIBUTION:")
+    if 'BOROUGH' in df.columns:
+        for borough, count in df['BOROUGH'].value_counts().items():
+            print(f"   {borough}: {count:,}")
+
+    print("\n3. DATA QUALITY:")
+    print(f"   Rows with complete coordinates: {(df['LATITUDE'].notna() & df['LONGITUDE'].notna()).sum():,}")
+    print(f"   Rows with SEVERITY_SCORE > 0: {(df['SEVERITY_SCORE'] > 0).sum():,}")
+    print(f"   Vulnerable user crashes: {(df['VULNERABILITY_FLAG'] == 1).sum():,}")
+
+    print("\n4. TEMPORAL COVERAGE:")
+    if 'CRASH DATE' in df.columns:
+        date_col = pd.to_datetime(df['CRASH DATE'], errors='coerce')
+        print(f"   Earliest crash: {date_col.min()}")
+        print(f"   Latest crash: {date_col.max()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GRIDLOCK phase 2 sanitization")
+    parser.add_argument('--csv', action='store_true', help="also export the final table as CSV (Power BI import)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes for the per-column steps 1-3 (default 1 = serial)")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("ADVANCED DATA SANITIZATION - PHASE 2")
+    print("="*70)
+
+    report = RunReport('sanitize')
+
+    # Load the dataset
+    print(f"\nLoading: {table_path(POWERBI_TABLE)}")
+    with report.stage('load') as stage:
+        df = read_table(POWERBI_TABLE)
+        stage['rows_out'] = len(df)
+
+    print(f"Initial shape: {df.shape}")
+    print(f"Initial rows: {len(df):,}")
+
+    dedup = Deduplicator()
+    df = sanitize(df, workers=args.workers, report=report, dedup=dedup)
+
+    # ========================================================================
+    # STEP 7: EXPORT CLEANED DATASET
+    # ========================================================================
+    with report.stage('step_7_export', len(df)):
+        output_files = write_table(df, FINAL_TABLE, FINAL_SCHEMA, csv=args.csv, store=True)
+    output_file = ', '.join(output_files)
+
+    print("\n" + "="*70)
+    print("SANITIZATION COMPLETE")
+    print("="*70)
+    print(f"\nFinal shape: {df.shape}")
+    print(f"Final rows: {len(df):,}")
+    print(f"Total columns: {len(df.columns)}")
+    print(f"\nOutput file: {output_file}")
+    print(f"Duplicate report: {dedup.write_report()}")
+    print_memory_report(df, FINAL_TABLE)
+
+    print_summary(df)
+    report.print_summary()
+    print(f"Run report: {report.write()}")
+
+    print("\n✓ Dataset ready for Power BI import!")
+    print("="*70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Project GRIDLOCK - Stage Benchmark Suite
+Times every pipeline stage (audit, reorganize, sanitize, rollup cube, web data, verification)
+on synthetic corrupted exports of fixed sizes
+Purpose: One repeatable baseline that optimizations are measured against
+
+Each size gets its own work directory (.gridlock_bench/<rows>-seed<seed>/) holding the
+generated export, so the stage scripts find their usual relative file names.
+Inputs are generated once per size and seed and reused by later runs.
+--save also records, per size, the input's row count and size on disk and the commit
+the timings were taken at, so the baseline says what it was measured against.
+
+Usage:
+    python benchmark_stages.py                          # 60k and 1M rows, compare with the baseline
+    python benchmark_stages.py 60000 1000000 10000000   # chosen sizes
+    python benchmark_stages.py --save                   # record these timings as the baseline
+    python benchmark_stages.py --repeat 3 --workers 4   # best of 3, parallel sanitization
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+
+import numpy as np
+import pandas as pd
+
+import generate_synthetic_collisions as generator
+import gridlock_pipeline as pipeline
+
+BENCH_DIR = '.gridlock_bench'
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+DEFAULT_SIZES = [60000, 1000000]
+
+
+def prepare_input(rows, seed):
+    """Work directory for one size, with its synthetic export generated on first use"""
+    workdir = os.path.abspath(os.path.join(BENCH_DIR, f"{rows}-seed{seed}"))
+    os.makedirs(os.path.join(workdir, os.path.dirname(pipeline.web.output_file)), exist_ok=True)
+    path = os.path.join(workdir, pipeline.audit.input_file)
+    if not os.path.exists(path):
+        print(f"   generating {rows:,} rows -> {path}")
+        start = time.perf_counter()
+        generator.generate(rows, path, seed=seed)
+        print(f"   generated in {time.perf_counter() - start:.1f}s")
+    return workdir
+
+
+def time_stages(workdir, workers):
+    """One forced pipeline run inside workdir; stage output is captured, only timings are kept"""
+    args = argparse.Namespace(force=True, csv=False, compact=False, workers=workers,
+                              input=pipeline.audit.input_file, rebuild=False)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            timings = pipeline.run_pipeline(args)
+    finally:
+        os.chdir(cwd)
+    return {name: elapsed for name, _, elapsed in timings}
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_FILE):
+        return None
+    with open(BASELINE_FILE) as f:
+        return json.load(f)
+
+
+def current_commit():
+    """Short hash of the checked-out commit ('-dirty' with local changes), None outside git"""
+    try:
+        result = subprocess.run(['git', 'describe', '--always', '--dirty'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def save_baseline(results, workers, seed):
+    baseline = load_baseline() or {}
+    baseline.setdefault('sizes', {}).update(results)
+    commit = current_commit()
+    recorded = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
+    inputs = baseline.setdefault('inputs', {})
+    for rows in results:
+        path = os.path.join(BENCH_DIR, f"{rows}-seed{seed}", pipeline.audit.input_file)
+        inputs[rows] = {
+            'rows': int(rows),
+            'input_mb': round(os.path.getsize(path) / 1e6, 1),
+            'commit': commit,
+            'recorded': recorded,
+        }
+    baseline['environment'] = {
+        'recorded': recorded,
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'cpus': os.cpu_count(),
+        'workers': workers,
+        'seed': seed,
+    }
+    with open(BASELINE_FILE, 'w') as f:
+        json.dump(baseline, f, indent=2)
+    print(f"\n✓ Baseline saved: {BASELINE_FILE}")
+
+
+def print_results(rows, timings, baseline):
+    reference = (baseline or {}).get('sizes', {}).get(str(rows), {})
+    print(f"\n{rows:,} rows")
+    print(f"   {'stage':<14} {'seconds':>9} {'baseline':>9} {'speedup':>8} {'rows/s':>12}")
+    for name, elapsed in [*timings.items(), ('total', sum(timings.values()))]:
+        base = reference.get(name) if name != 'total' else sum(reference.values()) or None
+        base_text = f"{base:>9.2f}" if base else f"{'-':>9}"
+        speedup = f"{base / elapsed:>7.2f}x" if base and elapsed else f"{'-':>8}"
+        rate = f"{rows / elapsed:>12,.0f}" if elapsed else f"{'-':>12}"
+        print(f"   {name:<14} {elapsed:>9.2f} {base_text} {speedup} {rate}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the GRIDLOCK stages on synthetic exports")
+    parser.add_argument('sizes', type=int, nargs='*', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=1, help="runs per size; the best time per stage is kept")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', action='store_true', help=f"record the timings in {os.path.basename(BASELINE_FILE)}")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("PROJECT GRIDLOCK - STAGE BENCHMARK")
+    print("="*70)
+
+    baseline = load_baseline()
+    results = {}
+    for rows in args.sizes:
+        workdir = prepare_input(rows, args.seed)
+        runs = [time_stages(workdir, args.workers) for _ in range(args.repeat)]
+        timings = {name: min(run[name] for run in runs) for name in runs[0]}
+        results[str(rows)] = timings
+        print_results(rows, timings, baseline)
+
+    if args.save:
+        save_baseline(results, args.workers, args.seed)
+
+
+if __name__ == '__main__':
+    main()
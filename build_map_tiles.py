@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Project GRIDLOCK - Map Tile Builder
+Pre-tiled crash points for the InteractiveMap (every cleaned point, not a top 1500)
+Purpose: Bounded payload per map view, whatever the size of the dataset
+
+Tiles follow the web-map (slippy) scheme Leaflet uses, so tile z/x/y is the
+same square the base map draws, and the tiles form a quadtree: tile (z, x, y)
+splits into (z+1, 2x..2x+1, 2y..2y+1). Every point gets integer pixel
+coordinates once; a point's tile at any zoom is a bit shift of those.
+
+Per zoom, a tile holding at most TILE_POINT_BUDGET points lists them all.
+A denser tile below MAX_ZOOM is sent as clusters instead: its points are
+merged per 8x8 sub-square into one weighted point (count, severity, recovered
+count, centroid). At MAX_ZOOM a dense tile keeps its most severe points and
+reports the full count.
+
+Output (gridlock-report/public/tiles/):
+    index.json           zoom range, budget and the x/y of every tile written
+    {z}/{x}/{y}.json     columnar arrays: points (id, lat, lng, severity, rec)
+                         or clusters (lat, lng, count, severity, rec)
+
+Usage: python build_map_tiles.py
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from gridlock_io import FINAL_TABLE, read_table, table_path
+from gridlock_metrics import RunReport
+
+tiles_dir = 'gridlock-report/public/tiles'
+
+MIN_ZOOM = 10
+MAX_ZOOM = 16
+TILE_POINT_BUDGET = 1000
+CLUSTER_DEPTH = 3               # clusters per tile side = 2**CLUSTER_DEPTH
+PIXEL_ZOOM = MAX_ZOOM + CLUSTER_DEPTH
+
+tile_columns = ['COLLISION_ID', 'LATITUDE', 'LONGITUDE', 'SEVERITY_SCORE', 'coord_recovery_flag']
+
+
+# ========================================================================
+# QUADTREE KEYS
+# ========================================================================
+
+def pixel_coordinates(lat, lon, zoom=PIXEL_ZOOM):
+    """Web Mercator tile coordinates at `zoom` (int64); coarser tiles are right shifts"""
+    n = 2 ** zoom
+    lat_rad = np.radians(lat)
+    x = (lon + 180.0) / 360.0 * n
+    y = (1.0 - np.log(np.tan(lat_rad) + 1.0 / np.cos(lat_rad)) / np.pi) / 2.0 * n
+    return np.floor(x).astype(np.int64), np.floor(y).astype(np.int64)
+
+
+def load_points(df):
+    """Mappable points, most severe first, with their pixel coordinates"""
+    lat = pd.to_numeric(df['LATITUDE'], errors='coerce')
+    lon = pd.to_numeric(df['LONGITUDE'], errors='coerce')
+    keep = (lat.notna() & lon.notna() & (lat != 0) & (lon != 0)).to_numpy()
+    points = pd.DataFrame({
+        'id': pd.to_numeric(df['COLLISION_ID'], errors='coerce').fillna(0).astype(np.int64).to_numpy()[keep],
+        'lat': lat.to_numpy(dtype=float)[keep],
+        'lng': lon.to_numpy(dtype=float)[keep],
+        'severity': pd.to_numeric(df['SEVERITY_SCORE'], errors='coerce').fillna(0).to_numpy(dtype=float)[keep],
+        'rec': pd.to_numeric(df['coord_recovery_flag'], errors='coerce').fillna(0).astype(np.int8).to_numpy()[keep],
+    })
+    points['px'], points['py'] = pixel_coordinates(points['lat'].to_numpy(), points['lng'].to_numpy())
+    return points.sort_values('severity', ascending=False, kind='stable').reset_index(drop=True)
+
+
+# ========================================================================
+# TILE PAYLOADS
+# ========================================================================
+
+def _point_payload(points, end=None):
+    return {"points": {
+        "id": points['id'][:end].tolist(),
+        "lat": points['lat'][:end].round(5).tolist(),
+        "lng": points['lng'][:end].round(5).tolist(),
+        "severity": points['severity'][:end].tolist(),
+        "rec": points['rec'][:end].tolist(),
+    }}
+
+
+def _cluster_payload(points, shift):
+    """Merge points per sub-square (pixel coordinates >> shift) into weighted centroids"""
+    keys = (points['px'] >> shift) * (2 ** 31) + (points['py'] >> shift)
+    clusters = pd.DataFrame({name: points[name] for name in ('id', 'lat', 'lng', 'severity', 'rec')}).groupby(
+        keys, sort=True).agg(
+        lat=('lat', 'mean'), lng=('lng', 'mean'), count=('id', 'size'),
+        severity=('severity', 'sum'), rec=('rec', 'sum'),
+    )
+    return {"clusters": {
+        "lat": clusters['lat'].round(5).tolist(),
+        "lng": clusters['lng'].round(5).tolist(),
+        "count": clusters['count'].tolist(),
+        "severity": clusters['severity'].round(2).tolist(),
+        "rec": clusters['rec'].astype(int).tolist(),
+    }}
+
+
+def zoom_tiles(points, zoom):
+    """Yield (x, y, payload) for every non-empty tile at one zoom level"""
+    shift = PIXEL_ZOOM - zoom
+    tx = points['px'].to_numpy() >> shift
+    ty = points['py'].to_numpy() >> shift
+    # Group rows by tile; the stable sort keeps each tile's points most-severe-first
+    order = np.lexsort((ty, tx))
+    tx, ty = tx[order], ty[order]
+    columns = {name: points[name].to_numpy()[order] for name in points.columns}
+    starts = np.flatnonzero(np.r_[True, (tx[1:] != tx[:-1]) | (ty[1:] != ty[:-1])])
+    ends = np.r_[starts[1:], len(order)]
+
+    for start, end in zip(starts, ends):
+        tile = {name: values[start:end] for name, values in columns.items()}
+        count = end - start
+        if count <= TILE_POINT_BUDGET:
+            payload = _point_payload(tile)
+        elif zoom < MAX_ZOOM:
+            payload = _cluster_payload(tile, shift - CLUSTER_DEPTH)
+        else:
+            payload = _point_payload(tile, TILE_POINT_BUDGET)
+        x, y = int(tx[start]), int(ty[start])
+        yield x, y, {"z": zoom, "x": x, "y": y, "total": int(count), **payload}
+
+
+def write_tiles(df, out_dir=tiles_dir, report=None):
+    """Write every tile from MIN_ZOOM to MAX_ZOOM plus index.json; returns the index"""
+    report = report or RunReport('tiles')
+    with report.stage('quadtree_keys', len(df)) as stage:
+        points = load_points(df)
+        stage['rows_out'] = len(points)
+
+    # Stale tiles from an earlier build would otherwise stay reachable
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+
+    index = {"min_zoom": MIN_ZOOM, "max_zoom": MAX_ZOOM, "budget": TILE_POINT_BUDGET,
+             "points": len(points), "tiles": {}}
+    for zoom in range(MIN_ZOOM, MAX_ZOOM + 1):
+        with report.stage(f'zoom_{zoom}', len(points)) as stage:
+            written = []
+            for x, y, payload in zoom_tiles(points, zoom):
+                path = os.path.join(out_dir, str(zoom), str(x))
+                os.makedirs(path, exist_ok=True)
+                with open(os.path.join(path, f"{y}.json"), 'w', encoding='utf-8') as f:
+                    json.dump(payload, f, separators=(',', ':'))
+                written.append(f"{x}/{y}")
+            index["tiles"][str(zoom)] = written
+            stage['rows_out'] = len(written)
+        print(f"   zoom {zoom}: {len(written):,} tiles")
+
+    with open(os.path.join(out_dir, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    return index
+
+
+def main():
+    print("="*70)
+    print("MAP TILE BUILDER - Project GRIDLOCK")
+    print("="*70)
+
+    report = RunReport('tiles')
+    print(f"Loading CLEAN dataset: {table_path(FINAL_TABLE)}")
+    with report.stage('load') as stage:
+        df = read_table(FINAL_TABLE, columns=tile_columns)
+        stage['rows_out'] = len(df)
+
+    index = write_tiles(df, tiles_dir, report)
+    tiles = sum(len(written) for written in index["tiles"].values())
+    print(f"\n✓ {index['points']:,} points in {tiles:,} tiles (zoom {MIN_ZOOM}-{MAX_ZOOM}) -> {tiles_dir}/")
+    report.print_summary()
+    print(f"Run report: {report.write()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Project GRIDLOCK - Synthetic Collision Generator
+NYC-shaped Motor Vehicle Collisions exports with the corruption the pipeline remediates
+Purpose: Reproducible test and benchmark inputs at any size (60k, 1M, 10M rows)
+
+Injected corruption (rates are fractions of rows, all configurable):
+    --ghost-rate           CRASH DATE in 2026 (ghost rows)
+    --location-only-rate   LATITUDE/LONGITUDE blank, coordinates only in LOCATION
+    --dirty-numeric-rate   counts as 'approx 2' / '2?', ZIP CODE as '11,201'
+    --null-token-rate      mixed-case null tokens ('Null', 'UNKNOWN', 'unspecified', ' nan ')
+    --vehicle-variant-rate vehicle types as spelling variants ('4 DR SEDAN', 'Station Wagon/SUV')
+    --duplicate-rate       rows repeating an earlier COLLISION_ID (half exact copies)
+
+Rows are generated in chunks, so memory stays flat whatever the size.
+
+Usage:
+    python generate_synthetic_collisions.py --rows 60000
+    python generate_synthetic_collisions.py --rows 10000000 --output big.csv --seed 7
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from gridlock_io import FACTOR_COLUMNS, VEHICLE_COLUMNS, file_size_mb
+
+DEFAULT_OUTPUT = 'refined_Motor_Vehicle_Collisions_-_Crashes_20260107.csv'
+CHUNK_ROWS = 500_000
+FIRST_COLLISION_ID = 4_400_000
+
+BOROUGHS = ['BROOKLYN', 'QUEENS', 'BRONX', 'MANHATTAN', 'STATEN ISLAND']
+BOROUGH_VARIANTS = ['Brooklyn', 'queens', 'Bronx', 'manhattan ', ' STATEN ISLAND']
+STREETS = ['BROADWAY', 'ATLANTIC AVENUE', 'BELT PARKWAY', '3 AVENUE', 'FLATBUSH AVENUE',
+           'QUEENS BOULEVARD', 'GRAND CONCOURSE', 'HYLAN BOULEVARD', 'LINDEN BOULEVARD',
+           'NOSTRAND AVENUE', 'NORTHERN BOULEVARD', 'JAMAICA AVENUE']
+FACTORS = ['Driver Inattention/Distraction', 'Failure to Yield Right-of-Way', 'Following Too Closely',
+           'Backing Unsafely', 'Passing or Lane Usage Improper', 'Unsafe Speed', 'Unspecified']
+VEHICLES = ['Sedan', 'Station Wagon/Sport Utility Vehicle', 'Taxi', 'Pick-up Truck', 'Box Truck',
+            'Bus', 'Bike', 'E-Bike', 'Motorcycle', 'Ambulance', 'Moped', 'Van']
+VEHICLE_VARIANTS = ['SEDAN', '4 dr sedan', '4 DR SEDAN', 'pk', 'suv', 'Station Wagon/SUV', 'TAXI',
+                    ' van ', 'PICK-UP TRUCK', 'E Bike', 'bike', 'Ambulence', 'Motorcyle', 'School Bus']
+NULL_TOKENS = ['Null', 'NULL', 'Unknown', 'UNKNOWN', 'unspecified', 'N/A', ' nan ']
+
+# Average casualties per crash (Poisson means)
+COUNT_MEANS = {
+    'NUMBER OF PERSONS INJURED': 0.4,
+    'NUMBER OF PERSONS KILLED': 0.01,
+    'NUMBER OF PEDESTRIANS INJURED': 0.1,
+    'NUMBER OF PEDESTRIANS KILLED': 0.003,
+    'NUMBER OF CYCLIST INJURED': 0.05,
+    'NUMBER OF CYCLIST KILLED': 0.001,
+    'NUMBER OF MOTORIST INJURED': 0.3,
+    'NUMBER OF MOTORIST KILLED': 0.005,
+}
+
+# Share of rows receiving each corruption
+DEFAULT_RATES = {
+    'ghost': 0.05,
+    'location_only': 0.35,
+    'dirty_numeric': 0.02,
+    'null_token': 0.03,
+    'vehicle_variant': 0.3,
+    'duplicate': 0.005,
+}
+
+
+COLUMNS = ['CRASH DATE', 'CRASH TIME', 'BOROUGH', 'ZIP CODE', 'LATITUDE', 'LONGITUDE', 'LOCATION',
+           'ON STREET NAME', 'CROSS STREET NAME', 'OFF STREET NAME', *COUNT_MEANS, *FACTOR_COLUMNS,
+           'COLLISION_ID', *VEHICLE_COLUMNS]
+
+
+def _pick(rng, values, n):
+    return np.asarray(values, dtype=object)[rng.integers(0, len(values), n)]
+
+
+def _corrupt(rng, values, rate, replacements):
+    """Overwrite a `rate` share of values with random picks from replacements"""
+    hit = rng.random(len(values)) < rate
+    values[hit] = _pick(rng, replacements, int(hit.sum()))
+    return values
+
+
+def _text(values):
+    return np.asarray(values, dtype=object)
+
+
+def make_chunk(rng, rows, first_id, rates):
+    """One chunk of raw export rows (text columns, as Socrata writes them)"""
+    # CRASH DATE: ISO, Socrata ISO with time, or MM/DD/YYYY; ghosts dated 2026
+    days = pd.Series(pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 1826, rows), unit='D'))
+    iso = days.dt.strftime('%Y-%m-%d')
+    style = rng.random(rows)
+    dates = np.where(style < 0.2, days.dt.strftime('%m/%d/%Y'),
+                     np.where(style < 0.4, iso + 'T00:00:00.000', iso)).astype(object)
+    ghost = rng.random(rows) < rates['ghost']
+    ghost_days = pd.Series(pd.Timestamp('2026-01-01') + pd.to_timedelta(rng.integers(0, 365, int(ghost.sum())), unit='D'))
+    dates[ghost] = _text(ghost_days.dt.strftime('%Y-%m-%d'))
+
+    # CRASH TIME: H:MM, a fifth as HH:MM:SS
+    hours = pd.Series(rng.integers(0, 24, rows)).astype(str)
+    minutes = pd.Series(rng.integers(0, 60, rows)).astype(str).str.zfill(2)
+    with_seconds = rng.random(rows) < 0.2
+    times = _text(np.where(with_seconds, hours.str.zfill(2) + ':' + minutes + ':00', hours + ':' + minutes))
+
+    # Coordinates inside the NYC box; LOCATION carries the same pair
+    lat = pd.Series(40.5 + rng.random(rows) * 0.4).round(6)
+    lon = pd.Series(-74.25 + rng.random(rows) * 0.5).round(6)
+    location = _text('(' + lat.astype(str) + ', ' + lon.astype(str) + ')')
+    latitude, longitude = _text(lat.astype(str)), _text(lon.astype(str))
+
+    void = rng.random(rows)
+    location_only = void < rates['location_only']
+    latitude[location_only] = None
+    longitude[location_only] = None
+    no_coords = (void >= rates['location_only']) & (void < rates['location_only'] + 0.03)
+    latitude[no_coords] = None
+    longitude[no_coords] = None
+    location[no_coords] = None
+    location[rng.random(rows) < 0.005] = '(0.0, 0.0)'
+
+    borough = _pick(rng, BOROUGHS, rows)
+    borough = _corrupt(rng, borough, 0.1, BOROUGH_VARIANTS)
+    borough[rng.random(rows) < 0.1] = None
+
+    zip_codes = pd.Series(rng.integers(10001, 11698, rows)).astype(str)
+    zip_code = _text(zip_codes)
+    dirty_zip = rng.random(rows) < rates['dirty_numeric'] / 2
+    zip_code[dirty_zip] = _text(zip_codes[dirty_zip].str[:2] + ',' + zip_codes[dirty_zip].str[2:])
+
+    chunk = {
+        'CRASH DATE': dates,
+        'CRASH TIME': times,
+        'BOROUGH': borough,
+        'ZIP CODE': zip_code,
+        'LATITUDE': latitude,
+        'LONGITUDE': longitude,
+        'LOCATION': location,
+        'ON STREET NAME': _pick(rng, STREETS, rows),
+        'CROSS STREET NAME': _pick(rng, STREETS, rows),
+        'OFF STREET NAME': np.where(rng.random(rows) < 0.1, '100 MAIN STREET', None).astype(object),
+    }
+
+    # Casualty counts: Poisson, some written as 'approx N' / 'N?'
+    for col, mean in COUNT_MEANS.items():
+        counts = pd.Series(rng.poisson(mean, rows)).astype(str)
+        values = _text(counts)
+        dirty = rng.random(rows)
+        approx = dirty < rates['dirty_numeric'] / 2
+        question = (dirty >= rates['dirty_numeric'] / 2) & (dirty < rates['dirty_numeric'])
+        values[approx] = _text('approx ' + counts[approx])
+        values[question] = _text(counts[question] + '?')
+        chunk[col] = values
+
+    for col in FACTOR_COLUMNS:
+        factors = _pick(rng, FACTORS, rows)
+        factors[rng.random(rows) < 0.3] = None
+        chunk[col] = factors
+
+    chunk['COLLISION_ID'] = np.arange(first_id, first_id + rows)
+
+    for col in VEHICLE_COLUMNS:
+        vehicles = _corrupt(rng, _pick(rng, VEHICLES, rows), rates['vehicle_variant'], VEHICLE_VARIANTS)
+        vehicles[rng.random(rows) < 0.2] = None
+        chunk[col] = vehicles
+
+    # Mixed-case null tokens across the text columns
+    for col in ['BOROUGH', 'ON STREET NAME', 'CROSS STREET NAME', *COUNT_MEANS, *FACTOR_COLUMNS, *VEHICLE_COLUMNS]:
+        chunk[col] = _corrupt(rng, chunk[col], rates['null_token'], NULL_TOKENS)
+
+    df = pd.DataFrame(chunk, columns=COLUMNS)
+
+    # Duplicate COLLISION_IDs: rows re-using an earlier ID in the chunk, half exact copies
+    dupes = rng.random(rows) < rates['duplicate']
+    dupes[0] = False
+    sources = (rng.random(rows) * np.arange(rows)).astype(np.int64)
+    exact = dupes & (rng.random(rows) < 0.5)
+    df.loc[dupes, 'COLLISION_ID'] = df['COLLISION_ID'].to_numpy()[sources[dupes]]
+    df.loc[exact] = df.iloc[sources[exact]].to_numpy()
+    return df
+
+
+def generate(rows, output, seed=0, rates=None, chunk_rows=CHUNK_ROWS):
+    """Write `rows` synthetic rows to output; chunk i is seeded with (seed, i) so output is reproducible"""
+    rates = {**DEFAULT_RATES, **(rates or {})}
+    written = 0
+    for i, start in enumerate(range(0, rows, chunk_rows)):
+        rng = np.random.default_rng([seed, i])
+        size = min(chunk_rows, rows - start)
+        chunk = make_chunk(rng, size, FIRST_COLLISION_ID + start, rates)
+        chunk.to_csv(output, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        written += size
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic NYC collisions export")
+    parser.add_argument('--rows', type=int, default=60000)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--seed', type=int, default=0)
+    for name, rate in DEFAULT_RATES.items():
+        parser.add_argument(f"--{name.replace('_', '-')}-rate", type=float, default=rate, dest=name,
+                            help=f"share of rows (default {rate})")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("PROJECT GRIDLOCK - SYNTHETIC COLLISION GENERATOR")
+    print("="*70)
+    rates = {name: getattr(args, name) for name in DEFAULT_RATES}
+    for name, rate in rates.items():
+        print(f"   {name:<16} {rate:.3f}")
+
+    start = time.perf_counter()
+    rows = generate(args.rows, args.output, seed=args.seed, rates=rates)
+    print(f"\n✓ {rows:,} rows written to {args.output} ({file_size_mb(args.output):.1f} MB) "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,7 @@ import { Timeline } from "./components/Timeline";
 import { DashboardSlide } from "./components/DashboardSlide";
 import { PredictionSection } from "./components/PredictionSection";
 import { DeliverablesSection } from "./components/DeliverablesSection";
+import { fetchWebData, WEB_DATA_URL } from "./lib/webData";
 
 function App() {
   const [data, setData] = useState(null);
@@ -23,15 +24,10 @@ function App() {
   });
 
   useEffect(() => {
-    // Use Vite's BASE_URL for correct path on GitHub Pages
-    const dataUrl = `${import.meta.env.BASE_URL}web_data_v2.json`;
-    console.log(`App: Fetching data from ${dataUrl}...`);
-
-    fetch(dataUrl)
-      .then(res => {
-        if (!res.ok) throw new Error(`HTTP error! status: ${res.status}`);
-        return res.json();
-      })
+    // Compact payload first, web_data_v2.json if it is not published (BASE_URL for GitHub Pages)
+    console.log(`App: Fetching data from ${WEB_DATA_URL}...`);
+
+    fetchWebData()
       .then(data => {
         console.log("App: Data loaded", data);
         setData(data);
@@ -50,7 +46,7 @@ function App() {
         <div className="text-center">
           <div className="text-2xl font-bold mb-2">INITIALIZING...</div>
           <div className="text-sm opacity-50">LOADING FORENSIC DATASET</div>
-          <div className="text-xs text-gridlock-muted mt-4">Target: {import.meta.env.BASE_URL}web_data_v2.json</div>
+          <div className="text-xs text-gridlock-muted mt-4">Target: {WEB_DATA_URL}</div>
         </div>
       </div>
     );
@@ -1,5 +1,5 @@
-import { MapContainer, TileLayer, CircleMarker, Popup, useMap } from "react-leaflet";
-import { useState, useEffect } from "react";
+import { MapContainer, TileLayer, CircleMarker, Popup, useMap, useMapEvents } from "react-leaflet";
+import { useState, useEffect, useMemo, useRef, useCallback } from "react";
 import { motion } from "framer-motion";
 import "leaflet/dist/leaflet.css";
 
@@ -11,10 +11,103 @@ const MapController = ({ center, zoom }) => {
     return null;
 };
 
+// Pre-tiled crash points written by build_map_tiles.py (slippy z/x/y, like the base map)
+const TILE_ROOT = `${import.meta.env.BASE_URL}tiles/`;
+
+const lngToTileX = (lng, z) => Math.floor(((lng + 180) / 360) * 2 ** z);
+const latToTileY = (lat, z) => {
+    const rad = (lat * Math.PI) / 180;
+    return Math.floor(((1 - Math.log(Math.tan(rad) + 1 / Math.cos(rad)) / Math.PI) / 2) * 2 ** z);
+};
+
+// Tiles (in the index) covering the current view, at the zoom clamped to the tiled range
+const visibleTiles = (map, index) => {
+    const z = Math.min(index.max_zoom, Math.max(index.min_zoom, Math.round(map.getZoom())));
+    const available = index.available[z] || new Set();
+    const bounds = map.getBounds();
+    const keys = [];
+    for (let x = lngToTileX(bounds.getWest(), z); x <= lngToTileX(bounds.getEast(), z); x++) {
+        for (let y = latToTileY(bounds.getNorth(), z); y <= latToTileY(bounds.getSouth(), z); y++) {
+            if (available.has(`${x}/${y}`)) keys.push(`${z}/${x}/${y}`);
+        }
+    }
+    return keys;
+};
+
+// Fetches the tiles in view after every pan/zoom; each tile is downloaded once
+const TileLoader = ({ index, onTiles }) => {
+    const map = useMap();
+    const cache = useRef(new Map());
+    const latest = useRef(0);
+
+    const load = useCallback(() => {
+        const request = ++latest.current;
+        const keys = visibleTiles(map, index);
+        Promise.all(keys.map((key) => {
+            if (!cache.current.has(key)) {
+                cache.current.set(key, fetch(`${TILE_ROOT}${key}.json`)
+                    .then((res) => res.json())
+                    .catch(() => {
+                        cache.current.delete(key);
+                        return null;
+                    }));
+            }
+            return cache.current.get(key);
+        })).then((tiles) => {
+            // A later pan may have finished first; only the newest view is shown
+            if (request === latest.current) onTiles(tiles.filter(Boolean));
+        });
+    }, [map, index, onTiles]);
+
+    useMapEvents({ moveend: load });
+    useEffect(() => {
+        load();
+    }, [load]);
+    return null;
+};
+
 export const InteractiveMap = ({ data }) => {
-    if (!data) return null;
     const [sliderVal, setSliderVal] = useState(50); // 0 = Raw, 100 = Full Recovery
     const [center] = useState([40.7128, -74.0060]);
+    const [tileIndex, setTileIndex] = useState(null);
+    const [tiles, setTiles] = useState([]);
+
+    useEffect(() => {
+        fetch(`${TILE_ROOT}index.json`)
+            .then((res) => {
+                if (!res.ok) throw new Error(`HTTP ${res.status}`);
+                return res.json();
+            })
+            .then((index) => {
+                const available = {};
+                Object.entries(index.tiles).forEach(([z, keys]) => {
+                    available[z] = new Set(keys);
+                });
+                setTileIndex({ ...index, available });
+            })
+            // No tiles published: fall back to the map_points sample in web_data_v2.json
+            .catch(() => setTileIndex(null));
+    }, []);
+
+    // Columnar tile arrays -> one marker list (points, or clusters at low zoom)
+    const { points, clusters } = useMemo(() => {
+        if (!tileIndex) return { points: data || [], clusters: [] };
+        const points = [];
+        const clusters = [];
+        tiles.forEach((tile) => {
+            if (tile.points) {
+                const p = tile.points;
+                p.lat.forEach((lat, i) => points.push({ id: p.id[i], lat, lng: p.lng[i], severity: p.severity[i], rec: p.rec[i] }));
+            }
+            if (tile.clusters) {
+                const c = tile.clusters;
+                c.lat.forEach((lat, i) => clusters.push({ lat, lng: c.lng[i], count: c.count[i], severity: c.severity[i], rec: c.rec[i] }));
+            }
+        });
+        return { points, clusters };
+    }, [tileIndex, tiles, data]);
+
+    if (!data && !tileIndex) return null;
 
     // CartoDB Dark Matter Tiles (Free, no API key needed)
     const tileUrl = "https://{s}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}{r}.png";
@@ -28,15 +121,48 @@ export const InteractiveMap = ({ data }) => {
                     zoom={11}
                     style={{ height: "100%", width: "100%", background: "#050505" }}
                     zoomControl={false}
+                    preferCanvas={true}
                 >
                     <TileLayer
                         url="https://{s}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}{r}.png"
                         attribution='&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors &copy; <a href="https://carto.com/attributions">CARTO</a>'
                     />
                     <MapController center={center} zoom={11} />
+                    {tileIndex && <TileLoader index={tileIndex} onTiles={setTiles} />}
+
+                    {/* RENDER CLUSTERS (dense tiles at low zoom) */}
+                    {clusters.map((cluster) => {
+                        const recoveredShare = cluster.rec / cluster.count;
+                        const opacity = 1 - recoveredShare + recoveredShare * (sliderVal / 100);
+                        const color = recoveredShare > 0.5 ? "#ff003c" : "#00f3ff";
+
+                        return (
+                            <CircleMarker
+                                key={`c${cluster.lat},${cluster.lng}`}
+                                center={[cluster.lat, cluster.lng]}
+                                radius={4 + 2 * Math.log10(cluster.count)}
+                                pathOptions={{
+                                    color: color,
+                                    fillColor: color,
+                                    fillOpacity: opacity * 0.5,
+                                    weight: 0
+                                }}
+                            >
+                                <Popup className="custom-popup">
+                                    <div className="p-2 bg-black text-white font-mono text-xs">
+                                        <div className="font-bold text-gridlock-cyan border-b border-white/20 mb-1 pb-1">
+                                            {cluster.count.toLocaleString()} CRASHES
+                                        </div>
+                                        <div>Total severity: {cluster.severity}</div>
+                                        <div>Forensic recoveries: {cluster.rec.toLocaleString()}</div>
+                                    </div>
+                                </Popup>
+                            </CircleMarker>
+                        );
+                    })}
 
                     {/* RENDER CRASH POINTS */}
-                    {data.map((point, idx) => {
+                    {points.map((point, idx) => {
                         const isRecovered = point.rec === 1; // Assuming 'rec' field exists
                         const opacity = isRecovered ? (sliderVal / 100) : 1;
                         const color = isRecovered ? "#ff003c" : "#00f3ff";
@@ -45,7 +171,7 @@ export const InteractiveMap = ({ data }) => {
 
                         return (
                             <CircleMarker
-                                key={idx}
+                                key={point.id ?? idx}
                                 center={[point.lat, point.lng || point.lon]} // Handle potential key diff
                                 radius={point.severity > 5 ? 5 : 2}
                                 pathOptions={{
@@ -0,0 +1,51 @@
+// Loads the report data written by web_data_processor.py.
+// Prefers the compact payload (web_data_v2.compact.json, written with --compact)
+// and falls back to the pretty-printed web_data_v2.json.
+// With VITE_GRIDLOCK_API set (e.g. http://127.0.0.1:8765, see gridlock_api.py)
+// the data comes from the local query API instead, filtered on request.
+
+const COMPACT_FORMAT = "gridlock-compact/1";
+
+export const WEB_DATA_URL = `${import.meta.env.BASE_URL}web_data_v2.json`;
+export const COMPACT_DATA_URL = `${import.meta.env.BASE_URL}web_data_v2.compact.json`;
+export const API_URL = import.meta.env.VITE_GRIDLOCK_API;
+
+// Columnar map_points -> the list of point objects the components expect
+export const decodeWebData = (payload) => {
+    if (payload.format !== COMPACT_FORMAT) return payload;
+
+    const { format, map_points: columns, ...rest } = payload;
+    const { count, constants, scale, origin } = columns;
+    const map_points = new Array(count);
+    for (let i = 0; i < count; i++) {
+        map_points[i] = {
+            id: String(columns.id[i]),
+            lat: Math.round((origin[0] + columns.lat[i] / scale) * 1e5) / 1e5,
+            lng: Math.round((origin[1] + columns.lng[i] / scale) * 1e5) / 1e5,
+            severity: columns.severity[i],
+            ...constants,
+            rec: columns.rec[i],
+        };
+    }
+    return { ...rest, map_points };
+};
+
+const fetchJson = (url) => fetch(url).then((res) => {
+    if (!res.ok) throw new Error(`HTTP error! status: ${res.status}`);
+    return res.json();
+});
+
+const fetchStaticData = () => fetchJson(COMPACT_DATA_URL)
+    .catch(() => fetchJson(WEB_DATA_URL))
+    .then(decodeWebData);
+
+// One API endpoint (stats, charts, timeline, danger_zones, hotspots, map_points, web_data)
+// with filters such as { borough: "QUEENS", start: "2024-01-01", vulnerable: 1 }
+export const queryApi = (endpoint, filters = {}) => {
+    const params = new URLSearchParams(filters).toString();
+    return fetchJson(`${API_URL}/${endpoint}${params ? `?${params}` : ""}`);
+};
+
+export const fetchWebData = (filters = {}) => (API_URL
+    ? queryApi("web_data", filters).catch(fetchStaticData)
+    : fetchStaticData());
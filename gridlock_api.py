@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Project GRIDLOCK - Local Query API
+The web_data_processor.py sections (stats, map points, charts, timeline,
+danger zones, hotspots) answered over HTTP for any filter
+Purpose: A new view (one borough, a date range, vulnerable-only) without
+regenerating web_data_v2.json
+
+The sanitized table is loaded once into the frame the web sections work on
+(convert_types: numeric columns, categorical text, the cube's crash hour and
+month precomputed; the time strings and unused columns dropped), and the
+intersection keys for the danger zones and the rollup cube (gridlock_cube.py)
+are built once for all rows. A query selects its rows with one boolean mask
+and runs the same section functions as web_data_processor.py, so an
+unfiltered query returns exactly what web_data_v2.json holds. Charts and the
+timeline filtered only by borough, factor or vulnerability slice the cube
+instead of touching the rows. Encoded responses are kept in an LRU cache keyed by
+endpoint and normalized parameters; a repeated query is a dictionary lookup.
+
+Standard library only (http.server), bound to localhost: it runs offline.
+
+Endpoints (GET, JSON):
+    /stats  /map_points  /charts  /timeline  /danger_zones  /hotspots
+    /web_data       every section, in the shape of web_data_v2.json
+    /health         rows loaded, cache entries and hit rate
+Filters (any combination, on any endpoint):
+    borough=QUEENS,BRONX    start=2024-01-01    end=2024-06-30 (inclusive)
+    vulnerable=1|0    recovered=1|0    min_severity=5    factor=Unsafe Speed
+    limit=500 (map points, default 1500)
+
+Usage:
+    python gridlock_api.py                          # http://127.0.0.1:8765
+    python gridlock_api.py --port 9000 --cache 512
+    curl 'http://127.0.0.1:8765/charts?borough=QUEENS&vulnerable=1'
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import web_data_processor as web
+from gridlock_cube import build_cube, cube_dimensions, slice_cube
+from gridlock_engine import intersections
+from gridlock_io import FINAL_TABLE, print_memory_report, read_table, table_path
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+CACHE_ENTRIES = 256
+MAX_POINT_LIMIT = 50_000
+
+FILTERS = ['borough', 'start', 'end', 'vulnerable', 'recovered', 'min_severity', 'factor']
+PARAMETERS = FILTERS + ['limit']
+# Filters that are cube dimensions: charts and timeline answered by slicing the cube
+CUBE_FILTERS = {'borough': 'BOROUGH', 'factor': 'CONTRIBUTING FACTOR VEHICLE 1', 'vulnerable': 'VULNERABILITY_FLAG'}
+
+
+class QueryError(ValueError):
+    """A request the API cannot answer (HTTP status attached)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+# ========================================================================
+# RESPONSE CACHE
+# ========================================================================
+
+class LRUCache:
+    """Encoded responses by key; the least recently used entry is evicted first"""
+
+    def __init__(self, maxsize=CACHE_ENTRIES):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def info(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits,
+                'misses': self.misses, 'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+# ========================================================================
+# PARAMETERS
+# ========================================================================
+
+def _flag(name, value):
+    if value not in ('0', '1'):
+        raise QueryError(f"{name} must be 0 or 1, not {value!r}")
+    return int(value)
+
+
+def _date(name, value):
+    try:
+        date = pd.Timestamp(value)
+    except ValueError:
+        date = pd.NaT
+    # A blank value parses to NaT rather than failing
+    if pd.isna(date):
+        raise QueryError(f"{name} is not a date: {value!r}")
+    return date.normalize()
+
+
+def parse_params(query):
+    """
+    Query string -> normalized, hashable parameters (sorted (name, value)
+    pairs), so equivalent requests share one cache entry
+    """
+    params = {}
+    for name, values in parse_qs(query, keep_blank_values=True).items():
+        if name not in PARAMETERS:
+            raise QueryError(f"unknown parameter {name!r} (expected one of: {', '.join(PARAMETERS)})")
+        value = values[-1].strip()
+        if name == 'borough':
+            params[name] = tuple(sorted({part.strip().upper() for part in value.split(',') if part.strip()}))
+        elif name == 'factor':
+            params[name] = tuple(sorted({part.strip() for part in value.split(',') if part.strip()}))
+        elif name in ('start', 'end'):
+            params[name] = _date(name, value).strftime('%Y-%m-%d')
+        elif name in ('vulnerable', 'recovered'):
+            params[name] = _flag(name, value)
+        elif name == 'min_severity':
+            try:
+                params[name] = float(value)
+            except ValueError:
+                raise QueryError(f"min_severity is not a number: {value!r}") from None
+        elif name == 'limit':
+            if not value.isdigit() or not 0 < int(value) <= MAX_POINT_LIMIT:
+                raise QueryError(f"limit must be 1-{MAX_POINT_LIMIT:,}, not {value!r}")
+            params[name] = int(value)
+    return tuple(sorted(params.items()))
+
+
+# ========================================================================
+# DATASET
+# ========================================================================
+
+def load_frame(df):
+    """The sanitized rows in the form every query runs on"""
+    dims = cube_dimensions(df)
+    df = web.convert_types(df).drop(columns=['CRASH TIME'])
+    df['CRASH HOUR'] = dims['CRASH HOUR']
+    df['CRASH MONTH'] = dims['CRASH MONTH'].array
+    # Built once for every row; a filtered view keeps the same (sorted) categories
+    df['intersection'] = intersections(df['ON STREET NAME'], df['CROSS STREET NAME'])
+    return df
+
+
+class QueryService:
+    """The loaded rows, their rollup cube, the section functions and the response cache"""
+
+    def __init__(self, df, old_stats, cache_entries=CACHE_ENTRIES):
+        self.df = load_frame(df)
+        self.cube = build_cube(self.df)
+        self.old_stats = old_stats
+        self.cache = LRUCache(cache_entries)
+        self.sections = {
+            'stats': lambda rows, cube, limit: web.comparative_stats(rows, self.old_stats),
+            'map_points': lambda rows, cube, limit: web.select_map_points(rows, limit),
+            'charts': lambda rows, cube, limit: web.build_charts(cube),
+            'timeline': lambda rows, cube, limit: web.build_timeline(cube),
+            'danger_zones': lambda rows, cube, limit: web.find_danger_zones(rows),
+            'hotspots': lambda rows, cube, limit: web.top_hotspots(rows),
+        }
+
+    def select(self, filters):
+        """Rows matching every filter (the whole frame when there are none)"""
+        df = self.df
+        mask = np.ones(len(df), dtype=bool)
+        if 'borough' in filters:
+            mask &= df['BOROUGH'].isin(filters['borough']).to_numpy()
+        if 'factor' in filters:
+            mask &= df['CONTRIBUTING FACTOR VEHICLE 1'].isin(filters['factor']).to_numpy()
+        if 'start' in filters:
+            mask &= (df['CRASH DATE'] >= pd.Timestamp(filters['start'])).to_numpy()
+        if 'end' in filters:
+            mask &= (df['CRASH DATE'] < pd.Timestamp(filters['end']) + pd.Timedelta(days=1)).to_numpy()
+        if 'vulnerable' in filters:
+            mask &= (df['VULNERABILITY_FLAG'] > 0).to_numpy() == bool(filters['vulnerable'])
+        if 'recovered' in filters:
+            mask &= (df['coord_recovery_flag'] > 0).to_numpy() == bool(filters['recovered'])
+        if 'min_severity' in filters:
+            mask &= (df['SEVERITY_SCORE'] >= filters['min_severity']).to_numpy()
+        return df if mask.all() else df[mask]
+
+    def select_cube(self, filters, rows):
+        """The cube cells for the filters: a slice when every filter is a dimension, else built from rows"""
+        if not set(filters) <= set(CUBE_FILTERS):
+            return build_cube(rows)
+        where = {CUBE_FILTERS[name]: value for name, value in filters.items() if name != 'vulnerable'}
+        if 'vulnerable' in filters:
+            flags = self.cube['VULNERABILITY_FLAG'].unique()
+            where['VULNERABILITY_FLAG'] = [flag for flag in flags if (flag > 0) == bool(filters['vulnerable'])]
+        return slice_cube(self.cube, where)
+
+    def answer(self, endpoint, params):
+        """JSON-ready result for one endpoint and normalized parameters"""
+        options = dict(params)
+        limit = options.pop('limit', web.map_point_limit)
+        rows = self.select(options)
+        cube = self.select_cube(options, rows) if endpoint in ('charts', 'timeline', 'web_data') else None
+        if endpoint == 'web_data':
+            result = {
+                'meta': {
+                    'title': "Project GRIDLOCK", 'team': web.TEAM_INFO,
+                    'generated': pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"), 'filters': options,
+                },
+                **{name: section(rows, cube, limit) for name, section in self.sections.items()},
+                'stories': web.DATA_STORIES,
+            }
+            # Same key order as web_data_v2.json
+            order = ['meta', 'stats', 'map_points', 'danger_zones', 'hotspots', 'timeline', 'charts', 'stories']
+            return {key: result[key] for key in order}
+        return self.sections[endpoint](rows, cube, limit)
+
+    def warm(self):
+        """Answer every unfiltered endpoint once, so the default view starts cached"""
+        for endpoint in [*self.sections, 'web_data']:
+            self.query(endpoint, '')
+
+    def query(self, endpoint, query_string):
+        """(encoded JSON, served from cache) for one request"""
+        if endpoint == 'health':
+            body = {'rows': len(self.df), 'cube_cells': len(self.cube), 'table': table_path(FINAL_TABLE), 'cache': self.cache.info()}
+            return json.dumps(body).encode(), False
+        if endpoint not in self.sections and endpoint != 'web_data':
+            raise QueryError(f"unknown endpoint /{endpoint}", status=404)
+        key = (endpoint, parse_params(query_string))
+        body = self.cache.get(key)
+        if body is not None:
+            return body, True
+        body = json.dumps(self.answer(*key), separators=(',', ':')).encode()
+        self.cache.put(key, body)
+        return body, False
+
+
+# ========================================================================
+# HTTP
+# ========================================================================
+
+class QueryHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def do_GET(self):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        endpoint = url.path.strip('/') or 'health'
+        try:
+            body, cached = self.service.query(endpoint, url.query)
+            status = 200
+        except QueryError as e:
+            body, cached, status = json.dumps({'error': str(e)}).encode(), False, e.status
+        except Exception as e:
+            body, cached, status = json.dumps({'error': f"{type(e).__name__}: {e}"}).encode(), False, 500
+        elapsed = (time.perf_counter() - start) * 1000
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        # The Vite dev server runs on another port
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('X-Cache', 'HIT' if cached else 'MISS')
+        self.send_header('Server-Timing', f'query;dur={elapsed:.2f}')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        print(f"   {self.address_string()} {format % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve filtered GRIDLOCK web data over local HTTP")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache', type=int, default=CACHE_ENTRIES, help="responses kept in the LRU cache")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("PROJECT GRIDLOCK - LOCAL QUERY API")
+    print("="*70)
+
+    print(f"Loading CLEAN dataset: {table_path(FINAL_TABLE)}")
+    start = time.perf_counter()
+    df = read_table(FINAL_TABLE, columns=web.web_columns)
+    service = QueryService(df, web.load_old_stats(web.old_file), args.cache)
+    service.warm()
+    print(f"Ready in {time.perf_counter() - start:.2f}s (unfiltered responses cached)")
+    print_memory_report(service.df, 'query frame')
+
+    QueryHandler.service = service
+    server = ThreadingHTTPServer((args.host, args.port), QueryHandler)
+    print(f"\nServing on http://{args.host}:{args.port}/ (Ctrl+C to stop)")
+    print(f"Endpoints: /{', /'.join([*service.sections, 'web_data', 'health'])}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Project GRIDLOCK - Memory-Mapped Column Store
+The sanitized table as one fixed-width binary file per column, written next to
+its Parquet file
+Purpose: Downstream scripts open the table in milliseconds and page in only
+the columns they touch, instead of decoding Parquet column chunks
+
+Layout of <name>.columns/:
+    manifest.json       rows, per column its file, NumPy dtype and encoding,
+                        and the size/mtime of the Parquet files it mirrors
+    NN_<column>.bin     raw little-endian values (np.memmap); integer columns
+                        with nulls are float64 (NaN), as read_parquet gives them
+    NN_<column>.json    the dictionary of a text column, whose .bin holds
+                        int32 codes (-1 = missing)
+
+Categorical columns come back as categoricals, plain text columns as strings,
+numbers and timestamps as read-only memory-mapped arrays (pandas copies on
+write). Appended rows (gridlock_io.append_table) extend every file in place;
+new text values are added to the end of a dictionary, so existing codes stay
+valid. The store is only used while its manifest matches the Parquet files,
+so a table rewritten or appended without it falls back to Parquet.
+"""
+
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+MANIFEST = 'manifest.json'
+CODE_DTYPE = np.dtype('<i4')
+
+
+def store_dir(name):
+    return f'{name}.columns'
+
+
+def manifest_path(name):
+    return os.path.join(store_dir(name), MANIFEST)
+
+
+def _file_name(index, col):
+    return f"{index:02d}_{re.sub(r'[^A-Za-z0-9]+', '_', col).strip('_')}"
+
+
+# ========================================================================
+# WRITER
+# ========================================================================
+
+class ColumnStoreWriter:
+    """
+    Write a table's store from the Arrow tables its Parquet file is written
+    from, one chunk at a time. append=True continues an existing store.
+    """
+
+    def __init__(self, name, append=False):
+        self.name = name
+        self.dir = store_dir(name)
+        self.dictionaries = {}
+        self._codes = {}
+        if append:
+            with open(manifest_path(name), encoding='utf-8') as f:
+                self.manifest = json.load(f)
+            for col, entry in self.manifest['columns'].items():
+                if entry['encoding'] == 'dictionary':
+                    with open(os.path.join(self.dir, entry['dictionary']), encoding='utf-8') as f:
+                        self.dictionaries[col] = json.load(f)
+        else:
+            shutil.rmtree(self.dir, ignore_errors=True)
+            os.makedirs(self.dir)
+            self.manifest = {'rows': 0, 'columns': {}, 'sources': {}}
+
+    def _entry(self, col, encoding, dtype, categorical=False):
+        columns = self.manifest['columns']
+        if col not in columns:
+            if self.manifest['rows']:
+                raise ValueError(f"column {col!r} is not in the column store of {self.name}")
+            base = _file_name(len(columns), col)
+            columns[col] = {'file': f'{base}.bin', 'dtype': dtype.str, 'encoding': encoding}
+            if encoding == 'dictionary':
+                columns[col].update(dictionary=f'{base}.json', categorical=categorical)
+                self.dictionaries[col] = []
+        return columns[col]
+
+    def _encode(self, col, array, categorical):
+        """Text -> int32 codes into the column's running dictionary"""
+        if not pa.types.is_dictionary(array.type):
+            array = array.dictionary_encode()
+        self._entry(col, 'dictionary', CODE_DTYPE, categorical)
+        dictionary = self.dictionaries[col]
+        values = array.dictionary.to_pylist()
+        if dictionary:
+            # value -> code, built only once a second chunk (or an append) needs it
+            codes = self._codes.get(col)
+            if codes is None:
+                codes = self._codes[col] = {value: code for code, value in enumerate(dictionary)}
+            lookup = []
+            for value in values:
+                if value not in codes:
+                    codes[value] = len(dictionary)
+                    dictionary.append(value)
+                lookup.append(codes[value])
+            lookup = np.array(lookup + [-1], dtype=CODE_DTYPE)
+        else:
+            # First chunk: the chunk's own dictionary is the column's
+            dictionary.extend(values)
+            lookup = np.append(np.arange(len(values), dtype=CODE_DTYPE), CODE_DTYPE.type(-1))
+        indices = pc.fill_null(array.indices, -1).to_numpy(zero_copy_only=False)
+        return lookup.take(indices)
+
+    def _widen(self, entry, dtype):
+        """Rewrite a column in a wider dtype (an integer column that met its first null)"""
+        path = os.path.join(self.dir, entry['file'])
+        values = np.fromfile(path, dtype=entry['dtype']).astype(dtype)
+        values.tofile(path)
+        entry['dtype'] = dtype.str
+
+    def write(self, table):
+        for col, column in zip(table.column_names, table.columns):
+            array = column.combine_chunks()
+            if pa.types.is_dictionary(array.type) or pa.types.is_string(array.type):
+                values = self._encode(col, array, categorical=pa.types.is_dictionary(array.type))
+            else:
+                values = array.to_numpy(zero_copy_only=False)
+                entry = self._entry(col, 'plain', values.dtype.newbyteorder('<'))
+                dtype = np.result_type(np.dtype(entry['dtype']), values.dtype)
+                if dtype != np.dtype(entry['dtype']):
+                    self._widen(entry, dtype)
+                values = values.astype(dtype, copy=False)
+            with open(os.path.join(self.dir, self.manifest['columns'][col]['file']), 'ab') as f:
+                values.tofile(f)
+        self.manifest['rows'] += table.num_rows
+
+    def close(self, sources):
+        """Save the dictionaries and the manifest; sources = Parquet file states it mirrors"""
+        for col, dictionary in self.dictionaries.items():
+            with open(os.path.join(self.dir, self.manifest['columns'][col]['dictionary']), 'w', encoding='utf-8') as f:
+                # One dumps call runs the C encoder; dump() streams piece by piece
+                f.write(json.dumps(dictionary, separators=(',', ':')))
+        self.manifest['sources'] = sources
+        with open(manifest_path(self.name), 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=1)
+        return manifest_path(self.name)
+
+
+# ========================================================================
+# READER
+# ========================================================================
+
+class ColumnStore:
+    """An opened store: the manifest only, columns are mapped when asked for"""
+
+    def __init__(self, name):
+        self.name = name
+        self.dir = store_dir(name)
+        with open(manifest_path(name), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.rows = self.manifest['rows']
+        self.columns = list(self.manifest['columns'])
+
+    def array(self, col):
+        """The raw values (dictionary codes for text) as a read-only memory map"""
+        entry = self.manifest['columns'][col]
+        if self.rows == 0:
+            return np.empty(0, dtype=entry['dtype'])
+        return np.memmap(os.path.join(self.dir, entry['file']), dtype=entry['dtype'], mode='r', shape=(self.rows,))
+
+    def column(self, col):
+        entry = self.manifest['columns'][col]
+        values = self.array(col)
+        if entry['encoding'] == 'plain':
+            return pd.Series(values, name=col, copy=False)
+        with open(os.path.join(self.dir, entry['dictionary']), encoding='utf-8') as f:
+            dictionary = json.load(f)
+        if entry['categorical']:
+            return pd.Series(pd.Categorical.from_codes(values, categories=dictionary), name=col)
+        codes = np.asarray(values)
+        text = pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0), pa.array(dictionary, type=pa.string()))
+        return pd.Series(text.dictionary_decode().to_pandas(), name=col)
+
+    def frame(self, columns=None):
+        """The requested columns (all by default; ones the store lacks are skipped)"""
+        columns = self.columns if columns is None else [col for col in columns if col in self.manifest['columns']]
+        return pd.DataFrame({col: self.column(col) for col in columns}, index=pd.RangeIndex(self.rows))
+
+
+def open_store(name, sources):
+    """The table's store, or None when there is none or it does not mirror sources"""
+    if not os.path.exists(manifest_path(name)):
+        return None
+    store = ColumnStore(name)
+    return store if store.manifest['sources'] == sources else None
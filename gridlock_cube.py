@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Project GRIDLOCK - Rollup Cube
+Crash totals pre-aggregated over borough x hour x month x vehicle type x
+contributing factor x vulnerability, built once from the sanitized table
+Purpose: Charts, drill-downs and Power BI read a few thousand cells instead
+of re-aggregating every row
+
+Each cube row is one occupied combination of the dimensions with its summed
+measures (crashes, collisions with an ID, severity, killed, injured). Missing
+dimension values are kept as their own cell (null text, hour -1), so the
+cells always add up to the whole table. Because every measure is a sum,
+rollup() answers any coarser view (per borough, per hour, per month and
+factor, ...) and any slice (one borough, vulnerable-only) from the cube
+alone; a mean is a summed measure over CRASHES.
+
+Appended rows (gridlock_pipeline.py --append) add a cube of their own as a
+part file; load_cube() sums the parts back into one cell per combination.
+
+Output: Motor_Vehicle_Collisions_ROLLUP.parquet (--csv: also .csv for Power BI)
+
+Usage: python gridlock_cube.py [--csv]
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from gridlock_io import (
+    CUBE_SCHEMA, CUBE_TABLE, FINAL_TABLE, HAVE_ARROW, apply_schema, read_table, table_files, table_path,
+    write_table
+)
+from gridlock_metrics import RunReport
+
+CUBE_DIMENSIONS = [
+    'BOROUGH', 'CRASH HOUR', 'CRASH MONTH', 'VEHICLE TYPE CODE 1', 'CONTRIBUTING FACTOR VEHICLE 1',
+    'VULNERABILITY_FLAG',
+]
+CUBE_MEASURES = ['CRASHES', 'COLLISIONS', 'SEVERITY_SCORE', 'NUMBER OF PERSONS KILLED', 'NUMBER OF PERSONS INJURED']
+
+# Columns of the sanitized table the cube is built from
+cube_columns = [
+    'COLLISION_ID', 'CRASH DATE', 'CRASH TIME', 'BOROUGH', 'VEHICLE TYPE CODE 1', 'CONTRIBUTING FACTOR VEHICLE 1',
+    'VULNERABILITY_FLAG', 'SEVERITY_SCORE', 'NUMBER OF PERSONS KILLED', 'NUMBER OF PERSONS INJURED',
+]
+
+
+# ========================================================================
+# DIMENSIONS
+# ========================================================================
+
+def crash_hours(times):
+    """Hour of each 'HH:MM:SS' CRASH TIME, -1 where missing or unparsed (each distinct time parsed once)"""
+    codes, uniques = pd.factorize(times)
+    hours = pd.to_datetime(pd.Series(uniques, dtype=object), format='%H:%M:%S', errors='coerce').dt.hour
+    return np.append(hours.fillna(-1).to_numpy(dtype=np.int8), np.int8(-1))[codes]
+
+
+def month_labels(dates):
+    """'YYYY-MM' of each CRASH DATE as a categorical (months sort like their labels)"""
+    months = pd.to_datetime(dates, errors='coerce').dt.to_period('M').astype('category')
+    return months.cat.rename_categories(months.cat.categories.astype(str))
+
+
+def cube_dimensions(df):
+    """The cube's dimension columns for a frame of sanitized rows"""
+    return {
+        'BOROUGH': df['BOROUGH'].astype('category'),
+        'CRASH HOUR': crash_hours(df['CRASH TIME']),
+        'CRASH MONTH': month_labels(df['CRASH DATE']),
+        'VEHICLE TYPE CODE 1': df['VEHICLE TYPE CODE 1'].astype('category'),
+        'CONTRIBUTING FACTOR VEHICLE 1': df['CONTRIBUTING FACTOR VEHICLE 1'].astype('category'),
+        'VULNERABILITY_FLAG': pd.to_numeric(df['VULNERABILITY_FLAG'], errors='coerce').fillna(0).to_numpy(dtype=np.int8),
+    }
+
+
+# ========================================================================
+# BUILD & ROLLUP
+# ========================================================================
+
+def build_cube(df):
+    """
+    One row per occupied dimension cell with the summed measures. Dimension
+    columns already on df (gridlock_api.py's frame) are used as they are.
+    """
+    derived = cube_dimensions(df) if any(dim not in df.columns for dim in CUBE_DIMENSIONS) else {}
+    dims = {dim: df[dim] if dim in df.columns else derived[dim] for dim in CUBE_DIMENSIONS}
+    rows = pd.DataFrame({
+        # Positional arrays (categoricals stay categorical), whatever df's index
+        **{dim: values.array if isinstance(values, pd.Series) else values for dim, values in dims.items()},
+        'CRASHES': np.ones(len(df), dtype=np.int64),
+        'COLLISIONS': df['COLLISION_ID'].notna().to_numpy(dtype=np.int64),
+        'SEVERITY_SCORE': pd.to_numeric(df['SEVERITY_SCORE'], errors='coerce').fillna(0).to_numpy(dtype=float),
+        'NUMBER OF PERSONS KILLED': pd.to_numeric(df['NUMBER OF PERSONS KILLED'], errors='coerce').fillna(0).to_numpy(dtype=np.int64),
+        'NUMBER OF PERSONS INJURED': pd.to_numeric(df['NUMBER OF PERSONS INJURED'], errors='coerce').fillna(0).to_numpy(dtype=np.int64),
+    })
+    return rollup(rows, CUBE_DIMENSIONS)
+
+
+def slice_cube(cube, where):
+    """The cells matching every {dimension: value or list} in where"""
+    mask = np.ones(len(cube), dtype=bool)
+    for dim, values in where.items():
+        values = list(values) if isinstance(values, (list, tuple, set)) else [values]
+        mask &= cube[dim].isin(values).to_numpy()
+    return cube if mask.all() else cube[mask]
+
+
+def rollup(cube, dims=(), where=None):
+    """
+    Cube cells summed up to the dimensions in dims (none: one grand-total row),
+    keeping only the cells that match where ({dimension: value or list})
+    """
+    if where:
+        cube = slice_cube(cube, where)
+    if not dims:
+        return cube[CUBE_MEASURES].sum().to_frame().T.astype(cube[CUBE_MEASURES].dtypes)
+    return cube.groupby(list(dims), observed=True, dropna=False, sort=True)[CUBE_MEASURES].sum().reset_index()
+
+
+# ========================================================================
+# TABLE
+# ========================================================================
+
+def write_cube(cube, csv=False):
+    return write_table(cube, CUBE_TABLE, CUBE_SCHEMA, csv=csv)
+
+
+def _modified(name):
+    """Latest modification time over a table's files (appended parts included)"""
+    return max(os.path.getmtime(path) for path in table_files(name) if os.path.exists(path))
+
+
+def load_cube(check_age=True):
+    """
+    The stored cube with appended parts summed in, or None when there is none
+    or it is older than the sanitized table (rebuild it from the rows then).
+    The pipeline, whose manifest already tracks staleness, skips the age check.
+    """
+    if not HAVE_ARROW or not os.path.exists(table_path(CUBE_TABLE)):
+        return None
+    if check_age and os.path.exists(table_path(FINAL_TABLE)) and _modified(CUBE_TABLE) < _modified(FINAL_TABLE):
+        return None
+    cube = read_table(CUBE_TABLE)
+    if len(table_files(CUBE_TABLE)) > 1:
+        cube = apply_schema(rollup(cube, CUBE_DIMENSIONS), CUBE_SCHEMA)
+    return cube
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the GRIDLOCK rollup cube from the sanitized table")
+    parser.add_argument('--csv', action='store_true', help="also export the cube as CSV (Power BI import)")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("ROLLUP CUBE - Project GRIDLOCK")
+    print("="*70)
+
+    report = RunReport('cube')
+    print(f"Loading CLEAN dataset: {table_path(FINAL_TABLE)}")
+    with report.stage('load') as stage:
+        df = read_table(FINAL_TABLE, columns=cube_columns)
+        stage['rows_out'] = len(df)
+
+    with report.stage('build', len(df)) as stage:
+        cube = build_cube(df)
+        stage['rows_out'] = len(cube)
+    with report.stage('export', len(cube)):
+        paths = write_cube(cube, csv=args.csv)
+
+    print(f"\n✓ {len(df):,} rows -> {len(cube):,} cells ({len(df) / max(len(cube), 1):.1f} rows per cell)")
+    for dim in CUBE_DIMENSIONS:
+        print(f"   {dim:<32} {cube[dim].nunique(dropna=False):>6,} values")
+    print(f"Output file: {', '.join(paths)}")
+    report.print_summary()
+    print(f"Run report: {report.write()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Project GRIDLOCK - Duplicate Detection
+Full-row and COLLISION_ID deduplication that works chunk by chunk and run to run
+Purpose: Step 5 of the sanitization without holding every row for drop_duplicates()
+
+Each row is reduced to a 64-bit digest combining one hash per column (text
+columns are hashed straight from their Arrow buffers when pyarrow is
+installed, everything else with pandas' hash_pandas_object); the digests of
+the rows seen so far and the kept COLLISION_IDs are held as two sorted NumPy
+arrays, 16 bytes per row. A chunk is checked against both with binary
+search, so the same Deduplicator handles one frame, a stream of chunks, or
+(saved to .gridlock_cache/) the rows of a later --append run. Two different
+rows share a digest with probability about n**2 / 2**65 (1e-5 at 10M rows).
+
+Rules are those of the original Step 5, in order:
+    1. a row identical to an earlier row is dropped
+    2. of the remaining rows, a row whose COLLISION_ID was seen before is
+       dropped (keep first); null IDs count as one ID, as in duplicated()
+
+Every COLLISION_ID involved in rule 2 is kept for the report, so the
+collisions can be looked up in the raw export.
+
+    dedup = Deduplicator()
+    for chunk in chunks:
+        chunk, stats = dedup.drop_duplicates(chunk)
+    dedup.write_report()                 # -> dedup_report.json
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from gridlock_io import CACHE_DIR, HAVE_ARROW
+
+if HAVE_ARROW:
+    import pyarrow as pa
+
+DEDUP_STATE = os.path.join(CACHE_DIR, 'dedup_state.npz')
+DEDUP_REPORT = 'dedup_report.json'
+
+# Null COLLISION_IDs share one key, like duplicated() treats NaN
+NULL_ID = np.iinfo(np.int64).min
+
+
+# ========================================================================
+# KEYS
+# ========================================================================
+
+_PRIME = np.uint64(0x100000001b3)
+_GOLDEN = np.uint64(0x9e3779b97f4a7c15)
+_NULL_TEXT = np.uint64(0x5bd1e9955bd1e995)
+
+
+def _mix(h):
+    """64-bit finalizer (MurmurHash3 fmix64): spreads every input bit over the digest"""
+    h = h ^ (h >> np.uint64(33))
+    h = h * np.uint64(0xff51afd7ed558ccd)
+    h = h ^ (h >> np.uint64(33))
+    h = h * np.uint64(0xc4ceb9fe1a85ec53)
+    return h ^ (h >> np.uint64(33))
+
+
+def text_digests(series):
+    """
+    One uint64 per string, computed on the UTF-8 bytes in Arrow's buffers
+    (polynomial over the bytes, then mixed) instead of per Python object
+    """
+    arr = pa.array(series.array, type=pa.large_string(), from_pandas=True)
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    offsets = np.frombuffer(arr.buffers()[1], dtype=np.int64)[arr.offset:arr.offset + len(arr) + 1]
+    data = arr.buffers()[2]
+    data = np.frombuffer(data, dtype=np.uint8)[offsets[0]:offsets[-1]] if data is not None else np.empty(0, np.uint8)
+    starts, lengths = offsets[:-1] - offsets[0], np.diff(offsets)
+
+    with np.errstate(over='ignore'):
+        powers = np.full(max(int(lengths.max(initial=0)), 1), _PRIME, dtype=np.uint64)
+        powers[0] = 1
+        powers = np.cumprod(powers)
+        # Byte i of a string weighs PRIME**i; +1 so NUL bytes still count
+        position = np.arange(len(data)) - np.repeat(starts, lengths)
+        weighted = (data.astype(np.uint64) + np.uint64(1)) * powers[position]
+        sums = np.zeros(len(arr), dtype=np.uint64)
+        filled = lengths > 0
+        sums[filled] = np.add.reduceat(weighted, starts[filled]) if filled.any() else sums[filled]
+        digests = _mix(sums ^ (lengths.astype(np.uint64) * _GOLDEN))
+    if arr.null_count:
+        digests[arr.is_null().to_numpy(zero_copy_only=False)] = _NULL_TEXT
+    return digests
+
+
+def column_digests(series):
+    if HAVE_ARROW and isinstance(series.dtype, pd.StringDtype):
+        return text_digests(series)
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+
+def row_digests(df):
+    """One uint64 per row over every column (equal rows -> equal digests)"""
+    digests = np.full(len(df), _GOLDEN, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for col in df.columns:
+            digests = (digests ^ column_digests(df[col])) * _PRIME
+        return _mix(digests)
+
+
+def id_keys(ids):
+    """COLLISION_IDs as int64 keys, nulls as NULL_ID"""
+    ids = pd.to_numeric(pd.Series(ids), errors='coerce')
+    return ids.astype('Int64').fillna(NULL_ID).to_numpy(dtype=np.int64)
+
+
+def _member(known, keys):
+    """Which keys are in the sorted array known"""
+    if len(known) == 0:
+        return np.zeros(len(keys), dtype=bool)
+    pos = np.minimum(np.searchsorted(known, keys), len(known) - 1)
+    return known[pos] == keys
+
+
+def _repeats(keys):
+    """Which keys repeat an earlier key in the same array"""
+    order = np.argsort(keys, kind='stable')
+    ordered = keys[order]
+    repeat = np.empty(len(keys), dtype=bool)
+    repeat[order] = np.r_[False, ordered[1:] == ordered[:-1]]
+    return repeat
+
+
+def _sorted_unique(keys):
+    keys = np.sort(keys)
+    return keys[np.r_[True, keys[1:] != keys[:-1]]] if len(keys) else keys
+
+
+def _merge(known, keys):
+    """Sorted union of the sorted array known and keys not in it yet"""
+    # Two sorted runs: the stable sort (timsort) merges them in linear time
+    return np.sort(np.concatenate([known, _sorted_unique(keys)]), kind='stable')
+
+
+# ========================================================================
+# DEDUPLICATOR
+# ========================================================================
+
+class Deduplicator:
+    """Seen row digests and COLLISION_IDs, as sorted arrays"""
+
+    def __init__(self, digests=None, ids=None):
+        self.digests = _sorted_unique(np.asarray(digests if digests is not None else [], dtype=np.uint64))
+        self.ids = _sorted_unique(id_keys(ids) if ids is not None else np.empty(0, dtype=np.int64))
+        self.rows_kept = len(self.ids)
+        self.duplicate_rows = 0
+        self.duplicate_row_ids = []
+        self.collided_ids = []
+
+    @classmethod
+    def load(cls, path=DEDUP_STATE):
+        """State saved by an earlier run; None when there is none"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as state:
+            return cls(state['digests'], state['ids'])
+
+    def save(self, path=DEDUP_STATE):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # np.savez appends .npz to names without it, so write through a handle
+        with open(path, 'wb') as f:
+            np.savez(f, digests=self.digests, ids=self.ids)
+        return path
+
+    def seen_ids(self, ids):
+        """Mask of the COLLISION_IDs already kept (by this run or the saved state)"""
+        return _member(self.ids, id_keys(ids))
+
+    def drop_duplicates(self, df, id_column='COLLISION_ID'):
+        """
+        Drop the rows of df that duplicate a row or a COLLISION_ID seen
+        before (in df or in earlier chunks) and remember the rest.
+        Returns (df, stats) with the counts of this call.
+        """
+        digests = row_digests(df)
+        copies = _member(self.digests, digests) | _repeats(digests)
+        stats = {'duplicate_rows': int(copies.sum()), 'id_nulls': 0, 'duplicate_ids': 0, 'collided_ids': []}
+
+        if id_column in df.columns:
+            ids = id_keys(df[id_column])
+            self.duplicate_row_ids.append(_sorted_unique(ids[copies]))
+            kept = ~copies
+            clash = np.zeros(len(df), dtype=bool)
+            clash[kept] = _member(self.ids, ids[kept]) | _repeats(ids[kept])
+            collided = _sorted_unique(ids[clash])
+            self.collided_ids.append(collided)
+            stats.update(id_nulls=int((ids[kept] == NULL_ID).sum()), duplicate_ids=int(clash.sum()),
+                         collided_ids=_id_list(collided))
+            keep = kept & ~clash
+            self.ids = _merge(self.ids, ids[keep])
+        else:
+            keep = ~copies
+
+        # Rows dropped for their ID still count for rule 1: a later exact copy
+        # of one is a duplicate row, as in a single drop_duplicates() pass
+        self.digests = _merge(self.digests, digests[~copies])
+        self.rows_kept += int(keep.sum())
+        self.duplicate_rows += stats['duplicate_rows']
+        if keep.all():
+            return df, stats
+        return df[keep], stats
+
+    def report(self):
+        collided = _id_list(_sorted_unique(np.concatenate(self.collided_ids or [np.empty(0, np.int64)])))
+        copies = _id_list(_sorted_unique(np.concatenate(self.duplicate_row_ids or [np.empty(0, np.int64)])))
+        return {
+            'rows_kept': self.rows_kept,
+            'duplicate_rows': self.duplicate_rows,
+            'duplicate_row_ids': copies,
+            'collided_ids': collided,
+        }
+
+    def write_report(self, path=DEDUP_REPORT):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+
+def first_seen(key_arrays):
+    """
+    Per array of COLLISION_ID keys (one per input file, in order), the mask
+    of rows whose ID no earlier array holds. Null IDs are always kept;
+    repeats within one array are left to drop_duplicates.
+    """
+    seen = np.empty(0, dtype=np.int64)
+    masks = []
+    for keys in key_arrays:
+        masks.append(~_member(seen, keys) | (keys == NULL_ID))
+        seen = _merge(seen, keys[keys != NULL_ID])
+    return masks
+
+
+def _id_list(keys):
+    return [None if key == NULL_ID else int(key) for key in keys]
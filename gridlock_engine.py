@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""
+Project GRIDLOCK - Vectorized Cleaning Engine
+Shared column-wise transforms used by the audit and sanitization scripts
+Purpose: Replace per-row loops with bulk pandas/NumPy operations
+"""
+
+import difflib
+import hashlib
+import json
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+# ========================================================================
+# SPATIAL RECOVERY
+# ========================================================================
+
+COORD_PATTERN = r'\(([0-9.-]+),\s*([0-9.-]+)\)'
+NYC_LAT_MIN, NYC_LAT_MAX = 40.4, 41.0
+NYC_LON_MIN, NYC_LON_MAX = -74.3, -73.7
+
+
+COORD_REGEX = re.compile(COORD_PATTERN)
+
+
+def _coordinate(text):
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+def parse_location(location):
+    """(lat, lon) from a LOCATION string like '(40.71, -73.99)'; NaN where it does not parse"""
+    match = COORD_REGEX.search(location)
+    if match is None:
+        return np.nan, np.nan
+    return _coordinate(match[1]), _coordinate(match[2])
+
+
+class LocationParser:
+    """
+    Parse LOCATION strings into (lat, lon), once per distinct string.
+
+    Parsed pairs (NaN for a string the pattern does not match) are kept in
+    memory across chunks and saved to cache_file, so later runs and --append
+    deltas skip strings already seen; the cache is discarded when
+    COORD_PATTERN changes. Strings are stored UTF-8 encoded in an .npz, read
+    on the first parse (not when the parser is created).
+    """
+
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file
+        self.digest = hashlib.blake2b(COORD_PATTERN.encode(), digest_size=16).hexdigest()
+        self.parsed = {}
+        self.dirty = False
+        self.loaded = False
+
+    def _load(self):
+        self.loaded = True
+        if self.cache_file and os.path.exists(self.cache_file):
+            with np.load(self.cache_file) as cached:
+                if str(cached['pattern']) == self.digest:
+                    locations = [location.decode() for location in cached['locations'].tolist()]
+                    self.parsed.update(zip(locations, zip(cached['lat'].tolist(), cached['lon'].tolist())))
+
+    def parse(self, location):
+        """
+        (lat, lon) float arrays for a LOCATION series, plus counts of the
+        distinct strings parsed now and those served from the cache
+        """
+        if not self.loaded:
+            self._load()
+        codes, uniques = pd.factorize(location)
+        keys = pd.Series(uniques, dtype=object).astype(str).tolist()
+        pairs = [self.parsed.get(key) for key in keys]
+        missing = [i for i, pair in enumerate(pairs) if pair is None]
+        for i in missing:
+            self.parsed[keys[i]] = pairs[i] = parse_location(keys[i])
+        self.dirty = self.dirty or bool(missing)
+        values = np.array(pairs + [(np.nan, np.nan)], dtype=float).reshape(-1, 2)
+        stats = {'rows': len(location), 'parsed': len(missing), 'cached': len(keys) - len(missing)}
+        return values[codes, 0], values[codes, 1], stats
+
+    def save(self):
+        if not (self.cache_file and self.dirty):
+            return
+        os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+        pairs = np.array(list(self.parsed.values()), dtype=float).reshape(-1, 2)
+        # np.savez appends .npz to names without it, so write through a handle
+        # (renamed into place: audit workers may save the same cache at once)
+        tmp = f'{self.cache_file}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez(f, pattern=np.array(self.digest),
+                     locations=np.array([location.encode() for location in self.parsed], dtype=bytes),
+                     lat=pairs[:, 0], lon=pairs[:, 1])
+        os.replace(tmp, self.cache_file)
+        self.dirty = False
+
+
+def recover_coordinates(df, parser=None):
+    """
+    Fill missing LATITUDE/LONGITUDE from the LOCATION column in bulk.
+
+    Only rows with a void coordinate are parsed, each distinct LOCATION once
+    (through parser, a LocationParser, when given), and only pairs inside the
+    NYC bounding box are written back. Sets coord_recovery_flag = 1 on every
+    recovered row and returns (recovered, elapsed seconds, parse counts).
+    """
+    start = time.perf_counter()
+    parser = parser or LocationParser()
+    if 'coord_recovery_flag' not in df.columns:
+        df['coord_recovery_flag'] = 0
+
+    void = (df['LATITUDE'].isna() | df['LONGITUDE'].isna()).to_numpy()
+    rows = np.flatnonzero(void)
+    recovered = 0
+    stats = {'rows': 0, 'parsed': 0, 'cached': 0}
+
+    if len(rows) > 0:
+        lat, lon, stats = parser.parse(df['LOCATION'].iloc[rows])
+        parser.save()
+        # NaN compares False, so unparseable pairs drop out here
+        in_bounds = (
+            (lat >= NYC_LAT_MIN) & (lat <= NYC_LAT_MAX) &
+            (lon >= NYC_LON_MIN) & (lon <= NYC_LON_MAX)
+        )
+        hits = rows[in_bounds]
+        recovered = len(hits)
+
+        if recovered > 0:
+            for col, values in (('LATITUDE', lat[in_bounds]), ('LONGITUDE', lon[in_bounds])):
+                # Columns read as text take the shortest repr, the text to_csv writes for a float
+                if isinstance(df[col].dtype, pd.StringDtype):
+                    values = values.astype(str)
+                df.iloc[hits, df.columns.get_loc(col)] = values
+            df.iloc[hits, df.columns.get_loc('coord_recovery_flag')] = 1
+
+    return recovered, time.perf_counter() - start, stats
+
+
+# Spatial grid: the NYC box split into 2**level x 2**level cells, numbered
+# row-major from the south-west corner (y * 2**level + x). Level 6 cells are
+# about 1 km, level 8 about 250 m, level 10 about 65 m; -1 means no usable
+# coordinate (missing or outside the box).
+GRID_LEVELS = [6, 8, 10]
+
+
+def grid_column(level):
+    return f'GRID_CELL_L{level}'
+
+
+GRID_COLUMNS = [grid_column(level) for level in GRID_LEVELS]
+
+
+def grid_cells(lat, lon, level):
+    """Integer grid cell id per row at one level (int32, -1 = no cell)"""
+    size = 2 ** level
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    inside = (lat >= NYC_LAT_MIN) & (lat <= NYC_LAT_MAX) & (lon >= NYC_LON_MIN) & (lon <= NYC_LON_MAX)
+    with np.errstate(invalid='ignore'):
+        y = np.clip(((lat - NYC_LAT_MIN) / (NYC_LAT_MAX - NYC_LAT_MIN) * size).astype(np.int64), 0, size - 1)
+        x = np.clip(((lon - NYC_LON_MIN) / (NYC_LON_MAX - NYC_LON_MIN) * size).astype(np.int64), 0, size - 1)
+    return np.where(inside, y * size + x, -1).astype(np.int32)
+
+
+def add_grid_cells(df, levels=GRID_LEVELS):
+    """GRID_CELL_L<level> columns from LATITUDE/LONGITUDE (unparseable text counts as missing)"""
+    lat = pd.to_numeric(df['LATITUDE'], errors='coerce').to_numpy(dtype=float)
+    lon = pd.to_numeric(df['LONGITUDE'], errors='coerce').to_numpy(dtype=float)
+    for level in levels:
+        df[grid_column(level)] = grid_cells(lat, lon, level)
+    return df
+
+
+def cell_centers(cells, level):
+    """(lat, lon) of the centre of each cell id"""
+    size = 2 ** level
+    y, x = np.divmod(np.asarray(cells, dtype=np.int64), size)
+    lat = NYC_LAT_MIN + (y + 0.5) * (NYC_LAT_MAX - NYC_LAT_MIN) / size
+    lon = NYC_LON_MIN + (x + 0.5) * (NYC_LON_MAX - NYC_LON_MIN) / size
+    return lat, lon
+
+
+# ========================================================================
+# DATE / TIME PARSING (distinct values only)
+# ========================================================================
+
+ISO_DATE_PATTERN = r'(\d{4})-(\d{2})-(\d{2})'
+US_DATE_PATTERN = r'(\d{2})/(\d{2})/(\d{4})'
+TIME_PATTERN = r'(\d{1,2}):(\d{2})(?::(\d{2}))?'
+
+
+def _distinct(series):
+    """Factorize a column into (codes, stripped unique strings, rows per unique)"""
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    return codes, uniques, counts
+
+
+def _expand(values, codes, missing, index, name):
+    """Map per-unique results back onto every row (code -1 = missing)"""
+    values = np.append(values, np.array([missing], dtype=values.dtype))
+    return pd.Series(values.take(codes), index=index, name=name)
+
+
+def parse_dates(series):
+    """
+    Parse a mixed ISO (YYYY-MM-DD) / US (MM/DD/YYYY) date column.
+
+    Each distinct string is parsed once: ISO and US candidates are pulled out
+    with one regex pass each and converted with one pd.to_datetime call per
+    format group. Invalid ISO dates fall back to the US pattern, anything else
+    becomes NaT. Returns (datetime Series, {format: rows}).
+    """
+    codes, uniques, counts = _distinct(series)
+
+    iso = uniques.str.extract(ISO_DATE_PATTERN)
+    us = uniques.str.extract(US_DATE_PATTERN)
+
+    parsed = pd.to_datetime(iso[0] + '-' + iso[1] + '-' + iso[2],
+                            format='%Y-%m-%d', errors='coerce')
+    is_iso = parsed.notna().to_numpy()
+
+    fallback = ~is_iso & us[0].notna().to_numpy()
+    if fallback.any():
+        parsed[fallback] = pd.to_datetime(
+            us[2][fallback] + '-' + us[0][fallback] + '-' + us[1][fallback],
+            format='%Y-%m-%d', errors='coerce'
+        )
+    is_us = fallback & parsed.notna().to_numpy()
+
+    formats = {
+        'ISO': int(counts[is_iso].sum()),
+        'MM/DD/YYYY': int(counts[is_us].sum()),
+        'unparsed': int((codes < 0).sum() + counts[~(is_iso | is_us)].sum()),
+        'distinct': len(uniques),
+    }
+    values = parsed.to_numpy(dtype='datetime64[ns]')
+    return _expand(values, codes, np.datetime64('NaT'), series.index, series.name), formats
+
+
+def parse_times(series, keep_seconds=True):
+    """
+    Normalize a CRASH TIME column (H:MM, HH:MM, HH:MM:SS) to 'HH:MM:SS' strings.
+
+    Works on distinct values only. With keep_seconds=False the seconds are
+    zeroed, matching the audit's minute-resolution times. Unparseable values
+    become NaN. Returns (Series, {format: rows}).
+    """
+    codes, uniques, counts = _distinct(series)
+
+    parts = uniques.str.extract(TIME_PATTERN)
+    matched = parts[0].notna().to_numpy()
+    has_seconds = parts[2].notna().to_numpy()
+
+    seconds = parts[2].fillna('00') if keep_seconds else '00'
+    normalized = parts[0].str.zfill(2) + ':' + parts[1] + ':' + seconds
+
+    formats = {
+        'HH:MM:SS': int(counts[matched & has_seconds].sum()),
+        'HH:MM': int(counts[matched & ~has_seconds].sum()),
+        'unparsed': int((codes < 0).sum() + counts[~matched].sum()),
+        'distinct': len(uniques),
+    }
+    values = normalized.to_numpy(dtype=object)
+    return _expand(values, codes, np.nan, series.index, series.name), formats
+
+
+# ========================================================================
+# VEHICLE TYPE NORMALIZATION (distinct strings, categorical recoding)
+# ========================================================================
+
+FUZZY_CUTOFF = 0.85
+
+
+def recode(series, func):
+    """
+    Apply func once per distinct value and rebuild the column as a categorical
+    with sorted categories. func returns the new label, or None for missing.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    labels = [func(value) for value in uniques]
+    categories = sorted({label for label in labels if label is not None})
+    position = {label: i for i, label in enumerate(categories)}
+    lookup = np.array([position[label] if label is not None else -1 for label in labels] + [-1], dtype=np.int64)
+    return pd.Series(pd.Categorical.from_codes(lookup.take(codes), categories=categories),
+                     index=series.index, name=series.name)
+
+
+def _normalize_key(text):
+    """'Station Wagon/SUV ' -> 'station wagon suv' (lowercase words, punctuation as spaces)"""
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', text.lower()).split())
+
+
+class VehicleNormalizer:
+    """
+    Resolve raw vehicle type strings to standard labels, once per distinct string.
+
+    A string is looked up in the mapping (lowercase, stripped), then by its
+    punctuation-free form, then by tokens (the longest mapping key whose words
+    all appear in the string, if only one is that long), then by difflib fuzzy
+    match. Anything left unmatched keeps its own text. Resolved strings are
+    kept in memory across chunks and saved to cache_file, so later runs skip
+    the matching; the cache is discarded when the mapping changes, and read
+    on the first normalize() (not when the normalizer is created).
+    """
+
+    METHODS = ['exact', 'token', 'fuzzy', 'unmatched']
+
+    def __init__(self, mapping, cache_file=None):
+        self.mapping = mapping
+        self.cache_file = cache_file
+        self.keys = {_normalize_key(key): label for key, label in mapping.items()}
+        self.tokens = {key: set(key.split()) for key in self.keys}
+        self.digest = hashlib.blake2b(
+            json.dumps([mapping, FUZZY_CUTOFF], sort_keys=True).encode(), digest_size=16
+        ).hexdigest()
+        self.resolved = {}
+        self.dirty = False
+        self.loaded = False
+
+    def _load(self):
+        self.loaded = True
+        if self.cache_file and os.path.exists(self.cache_file):
+            with open(self.cache_file, encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('mapping') == self.digest:
+                self.resolved.update(cached['resolved'])
+
+    def match(self, key):
+        """(label, method) for a lowercase, stripped raw string"""
+        if key in self.mapping:
+            return self.mapping[key], 'exact'
+        normalized = _normalize_key(key)
+        if normalized in self.keys:
+            return self.keys[normalized], 'exact'
+
+        words = set(normalized.split())
+        candidates = [k for k, tokens in self.tokens.items() if tokens <= words]
+        if candidates:
+            longest = max(len(self.tokens[k]) for k in candidates)
+            best = [k for k in candidates if len(self.tokens[k]) == longest]
+            if len(best) == 1:
+                return self.keys[best[0]], 'token'
+
+        close = difflib.get_close_matches(normalized, list(self.keys), n=1, cutoff=FUZZY_CUTOFF)
+        if close:
+            return self.keys[close[0]], 'fuzzy'
+        return key, 'unmatched'
+
+    def label(self, raw, stats):
+        key = str(raw).strip().lower()
+        if key in self.resolved:
+            stats['cached'] += 1
+        else:
+            label, method = self.match(key)
+            self.resolved[key] = [label.title(), method]
+            self.dirty = True
+            stats[method] += 1
+        return self.resolved[key][0]
+
+    def normalize(self, df, columns):
+        """
+        Recode the given columns in place (as categoricals). Returns the distinct
+        raw strings seen, the distinct labels produced and per-method counts of
+        distinct strings (cached = already resolved earlier or in a previous run).
+        """
+        if not self.loaded:
+            self._load()
+        stats = dict.fromkeys(self.METHODS + ['cached'], 0)
+        raw_types, new_types = set(), set()
+        for col in columns:
+            if col not in df.columns:
+                continue
+            series = df[col]
+            raw_types.update(series.dropna().unique())
+            df[col] = recode(series, lambda raw: None if pd.isna(raw) else self.label(raw, stats))
+            new_types.update(df[col].cat.categories)
+        self.save()
+        return raw_types, new_types, stats
+
+    def save(self):
+        if not (self.cache_file and self.dirty):
+            return
+        os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+        # Renamed into place: audit workers may save the same cache at once
+        tmp = f'{self.cache_file}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'mapping': self.digest, 'resolved': self.resolved}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.cache_file)
+        self.dirty = False
+
+
+# ========================================================================
+# NULL TOKENS (shared by the audit, sanitization and verification)
+# ========================================================================
+
+# Placeholder spellings that mean "no value". Matching ignores case and
+# surrounding whitespace, so 'Unknown', 'UNKNOWN ' and 'unknown' all count, in
+# every stage alike. The original scripts each had their own list and rule:
+# against them, the audit's DATA_INTEGRITY_SCORE and DATA_QUALITY_FLAGS (and
+# its severity inputs) also treat 'UNKNOWN', 'unspecified' or ' nan ' as
+# missing, and FINAL_CLEAN also loses 'Unspecified' and ' nan '.
+NULL_VARIANTS = ['nan', 'na', 'n/a', 'null', 'unknown', 'unspecified', 'approx 0', '']
+
+
+def _is_text(series):
+    return series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+
+
+def token_set(null_tokens):
+    """The tokens as null_token_mask compares them: stripped, lower case"""
+    return {token.strip().lower() for token in null_tokens}
+
+
+def null_token_mask(series, null_tokens=NULL_VARIANTS):
+    """True where a text value is a null token; each distinct value is checked once"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = pd.Series(series.cat.categories, dtype=object).astype(str).str.strip()
+        is_token = categories.str.lower().isin(token_set(null_tokens)).to_numpy()
+        return np.append(is_token, False).take(series.cat.codes.to_numpy())
+    if not _is_text(series):
+        return np.zeros(len(series), dtype=bool)
+    codes, uniques, _ = _distinct(series)
+    is_token = uniques.str.lower().isin(token_set(null_tokens)).to_numpy()
+    return np.append(is_token, False).take(codes)
+
+
+def standardize_nulls(series, null_tokens=NULL_VARIANTS):
+    """
+    Replace null tokens with NaN. Text columns are decided per distinct value and
+    mapped back in one step; categoricals just drop the null-token categories.
+    Numeric and datetime columns are returned unchanged.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        is_token = pd.Series(categories, dtype=object).astype(str).str.strip().str.lower()
+        return series.cat.remove_categories(categories[is_token.isin(token_set(null_tokens)).to_numpy()])
+    mask = null_token_mask(series, null_tokens)
+    return series.mask(mask) if mask.any() else series
+
+
+# ========================================================================
+# FEATURE ENGINEERING (column-wise masks)
+# ========================================================================
+
+CRITICAL_FIELDS = ['CRASH DATE', 'CRASH TIME', 'LATITUDE', 'LONGITUDE', 'BOROUGH']
+QUALITY_FLAGS = ['FUTURE_DATE', 'NULL_COORDS', 'NULL_BOROUGH']
+
+
+def _is_null_token(series, null_tokens):
+    """True where a value is missing or one of the null tokens"""
+    return series.isna().to_numpy() | null_token_mask(series, null_tokens)
+
+
+def _mentions_2026(series):
+    """True where the value's text contains '2026' (ghost rows)"""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return (series.dt.year == 2026).to_numpy()
+    return series.astype(str).str.contains('2026', regex=False, na=False).to_numpy()
+
+
+def integrity_scores(df, null_tokens, critical_fields=CRITICAL_FIELDS):
+    """DATA_INTEGRITY_SCORE: share of critical fields that hold a real value"""
+    valid_count = np.zeros(len(df), dtype=np.int64)
+    for field in critical_fields:
+        if field in df.columns:
+            valid_count += ~_is_null_token(df[field], null_tokens)
+    return pd.Series(valid_count / len(critical_fields), index=df.index)
+
+
+def quality_flags(df, null_tokens):
+    """
+    DATA_QUALITY_FLAGS: pipe-joined FUTURE_DATE / NULL_COORDS / NULL_BOROUGH,
+    or 'CLEAN'. The three masks are packed into a 3-bit code and looked up in
+    a table of the 8 possible labels.
+    """
+    future = np.zeros(len(df), dtype=bool)
+    for field in ['CRASH DATE', 'CRASH TIME']:
+        if field in df.columns:
+            future |= _mentions_2026(df[field])
+
+    null_coords = (df['LATITUDE'].isna() | df['LONGITUDE'].isna()).to_numpy()
+
+    if 'BOROUGH' in df.columns:
+        borough = df['BOROUGH']
+        null_borough = _is_null_token(borough, null_tokens)
+    else:
+        null_borough = np.full(len(df), '' in null_tokens)
+
+    code = future.astype(np.int8) | (null_coords.astype(np.int8) << 1) | (null_borough.astype(np.int8) << 2)
+    labels = np.array([
+        '|'.join(flag for bit, flag in enumerate(QUALITY_FLAGS) if combo >> bit & 1) or 'CLEAN'
+        for combo in range(2 ** len(QUALITY_FLAGS))
+    ], dtype=object)
+    return pd.Series(labels[code], index=df.index)
+
+
+# ========================================================================
+# STREET INTERSECTIONS (distinct streets, integer pair keys)
+# ========================================================================
+
+def _street_label(value):
+    # Same rule as the old row-wise key: blanks and 'nan'/'None' text are no street
+    text = str(value).strip()
+    return None if text in ('nan', 'None', '') else text
+
+
+def intersections(on_street, cross_street):
+    """
+    Canonical 'A & B' intersection per row (the two streets in sorted order),
+    as a categorical; missing where either street is missing.
+    Both columns are recoded onto one sorted street list, so each row's key is
+    the integer pair (min code, max code) and only distinct pairs get a label.
+    """
+    on_street = recode(on_street, _street_label)
+    cross_street = recode(cross_street, _street_label)
+    streets = sorted(set(on_street.cat.categories) | set(cross_street.cat.categories))
+    a = on_street.cat.set_categories(streets).cat.codes.to_numpy().astype(np.int64)
+    b = cross_street.cat.set_categories(streets).cat.codes.to_numpy().astype(np.int64)
+
+    valid = (a >= 0) & (b >= 0)
+    pair = (np.minimum(a, b) * len(streets) + np.maximum(a, b))[valid]
+    pairs, pair_index = np.unique(pair, return_inverse=True)
+    labels = np.array([f"{streets[p // len(streets)]} & {streets[p % len(streets)]}" for p in pairs], dtype=object)
+    # Sorted labels; pairs that spell the same label share a category
+    categories, label_index = np.unique(labels, return_inverse=True)
+    codes = np.full(len(valid), -1, dtype=np.int64)
+    codes[valid] = label_index[pair_index]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories),
+                     index=on_street.index, name='intersection')
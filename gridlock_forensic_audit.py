@@ -3,133 +3,51 @@
 Project GRIDLOCK - Forensic Data Audit Script
 Federal Transportation Safety Auditor for NHTSA
 Purpose: Remediate systemic entropy in NYC Motor Vehicle Collisions dataset
+
+Input: one export, or several (a directory of .csv files or a glob pattern,
+e.g. the monthly OpenData extracts). Several files are read and audited
+concurrently, each whole in one worker of a process pool; header spellings
+are reconciled by gridlock_loader, and a row whose COLLISION_ID an earlier
+file (in name order) already holds is dropped before the audit, so the
+totals count every collision once. Repeats within one file are left to
+sanitization Step 5, as for a single export.
+
+Usage:
+    python gridlock_forensic_audit.py                      # whole file in memory
+    python gridlock_forensic_audit.py --chunksize 250000   # bounded-memory streaming (files one after another)
+    python gridlock_forensic_audit.py --csv                # also export CSV for Power BI
+    python gridlock_forensic_audit.py --input exports/     # every .csv in a directory
+    python gridlock_forensic_audit.py --input 'exports/crashes_2025-*.csv' --workers 8
 """
 
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
-import re
 from datetime import datetime
+from advanced_data_sanitization import sanitize_numeric
+from gridlock_dedup import first_seen, id_keys
+from gridlock_engine import (
+    GRID_COLUMNS, GRID_LEVELS, NULL_VARIANTS, LocationParser, VehicleNormalizer, add_grid_cells, recover_coordinates, parse_dates,
+    parse_times, integrity_scores, quality_flags, standardize_nulls
+)
+from gridlock_io import (
+    AUDIT_SCHEMA, CACHE_DIR, CLEAN_TABLE, VEHICLE_COLUMNS, TableWriter, apply_schema, file_size_mb,
+    print_memory_report
+)
+from gridlock_loader import read_raw
+from gridlock_metrics import RunReport
 import warnings
 warnings.filterwarnings('ignore')
 
-print("="*70)
-print("PROJECT GRIDLOCK - FORENSIC DATA AUDIT")
-print("Federal Transportation Safety Auditor - NHTSA")
-print("="*70)
-
 # Input/Output files
 input_file = 'refined_Motor_Vehicle_Collisions_-_Crashes_20260107.csv'
-output_file = 'Motor_Vehicle_Collisions_CLEAN.csv'
-
-# Load dataset
-print("\n[1/7] LOADING DATASET...")
-df = pd.read_csv(input_file, low_memory=False)
-print(f"Loaded {len(df):,} rows with {len(df.columns)} columns")
-
-# PHASE 1: CORRUPTION DETECTION
-print("\n[2/7] DETECTING CORRUPTION...")
-print("="*70)
-
-# Detect Ghost Rows
-ghost_in_date = df['CRASH DATE'].astype(str).str.contains('2026', na=False).sum()
-ghost_in_time = df['CRASH TIME'].astype(str).str.contains('2026', na=False).sum()
-total_ghost = max(ghost_in_date, ghost_in_time)
-print(f"Ghost rows (future dates 2026): {total_ghost:,}")
-
-# Coordinate voids
-lat_nulls = df['LATITUDE'].isna().sum()
-lon_nulls = df['LONGITUDE'].isna().sum()
-recoverable = df[df['LATITUDE'].isna() & df['LOCATION'].notna()]['LOCATION'].count()
-print(f"Coordinate voids - LAT nulls: {lat_nulls:,}, LON nulls: {lon_nulls:,}")
-print(f"Recoverable from LOCATION: {recoverable:,}")
-
-# PHASE 2: SPATIAL RECOVERY
-print("\n[3/7] SPATIAL RECOVERY (Regex extraction)...")
-print("="*70)
-
-coord_pattern = r'\(([0-9.-]+),\s*([0-9.-]+)\)'
-NYC_LAT_MIN, NYC_LAT_MAX = 40.4, 41.0
-NYC_LON_MIN, NYC_LON_MAX = -74.3, -73.7
-
-recovered = 0
-df['coord_recovery_flag'] = 0
-
-print("Extracting coordinates from LOCATION column...")
-for idx, row in df.iterrows():
-    if idx % 10000 == 0:
-        print(f"  Processing row {idx:,}...")
-    
-    if pd.isna(row['LATITUDE']) or pd.isna(row['LONGITUDE']):
-        location_str = str(row['LOCATION'])
-        match = re.search(coord_pattern, location_str)
-        
-        if match:
-            try:
-                lat = float(match.group(1))
-                lon = float(match.group(2))
-                
-                if (NYC_LAT_MIN <= lat <= NYC_LAT_MAX and NYC_LON_MIN <= lon <= NYC_LON_MAX):
-                    df.at[idx, 'LATITUDE'] = lat
-                    df.at[idx, 'LONGITUDE'] = lon
-                    df.at[idx, 'coord_recovery_flag'] = 1
-                    recovered += 1
-            except:
-                pass
-
-recovery_rate = (recovered / recoverable * 100) if recoverable > 0 else 0
-print(f"Successfully recovered: {recovered:,} coordinate pairs ({recovery_rate:.1f}%)")
-
-# PHASE 3: DATE NORMALIZATION
-print("\n[4/7] DATE NORMALIZATION...")
-print("="*70)
-
-NULL_VARIANTS = ['nan', 'NA', 'Null', 'Unknown', 'NA ', 'nan ', 'Null ', 'Unknown ', 'approx 0', '']
-
-def parse_date(date_str):
-    if pd.isna(date_str) or str(date_str).strip() in NULL_VARIANTS:
-        return pd.NaT
-    
-    date_str =  str(date_str).strip()
-    
-    # ISO format (YYYY-MM-DD)
-    match = re.search(r'(\d{4})-(\d{2})-(\d{2})', date_str)
-    if match:
-        try:
-            return pd.to_datetime(f"{match.group(1)}-{match.group(2)}-{match.group(3)}")
-        except:
-            pass
-    
-    # US format (MM/DD/YYYY)
-    match = re.search(r'(\d{2})/(\d{2})/(\d{4})', date_str)
-    if match:
-        try:
-            return pd.to_datetime(f"{match.group(3)}-{match.group(1)}-{match.group(2)}")
-        except:
-            pass
-    
-    return pd.NaT
-
-print("Standardizing CRASH DATE to ISO 8601...")
-df['CRASH DATE'] = df['CRASH DATE'].apply(parse_date)
-
-print("Cleaning CRASH TIME...")
-def clean_time(time_str):
-    if pd.isna(time_str) or str(time_str).strip() in NULL_VARIANTS:
-        return pd.NaT
-    
-    time_str = str(time_str).strip()
-    time_match = re.search(r'(\d{1,2}):(\d{2})', time_str)
-    if time_match:
-        return f"{time_match.group(1).zfill(2)}:{time_match.group(2)}:00"
-    
-    return pd.NaT
-
-df['CRASH TIME'] = df['CRASH TIME'].apply(clean_time)
-print("Date normalization complete")
-
-# PHASE 4: VEHICLE TYPE NORMALIZATION
-print("\n[5/7] VEHICLE TYPE NORMALIZATION...")
-print("="*70)
+output_table = CLEAN_TABLE
 
 vehicle_mapping = {
     'sedan': 'Sedan',
@@ -160,98 +78,394 @@ vehicle_mapping = {
     'unknown': 'Unknown',
 }
 
-original_types = df['VEHICLE TYPE CODE 1'].nunique()
-df['VEHICLE TYPE CODE 1'] = df['VEHICLE TYPE CODE 1'].astype(str).str.lower().str.strip()
-df['VEHICLE TYPE CODE 1'] = df['VEHICLE TYPE CODE 1'].replace(vehicle_mapping)
-df['VEHICLE TYPE CODE 1'] = df['VEHICLE TYPE CODE 1'].str.title()
-new_types = df['VEHICLE TYPE CODE 1'].nunique()
+# Distinct raw strings resolved against vehicle_mapping, reused across chunks and runs
+# (both caches are read from disk on first use, not on import)
+vehicle_types = VehicleNormalizer(vehicle_mapping, os.path.join(CACHE_DIR, 'vehicle_types.json'))
+# Distinct LOCATION strings parsed to coordinates, reused across chunks and runs
+locations = LocationParser(os.path.join(CACHE_DIR, 'locations.npz'))
+
+
+def new_totals():
+    """Global counters carried across chunks (all additive, or sets of distinct values)"""
+    return {
+        'rows': 0,
+        'ghost_in_date': 0,
+        'ghost_in_time': 0,
+        'lat_nulls': 0,
+        'lon_nulls': 0,
+        'recoverable': 0,
+        'recovered': 0,
+        'recovery_seconds': 0.0,
+        'location_parses': {'rows': 0, 'parsed': 0, 'cached': 0},
+        'gridded': 0,
+        'date_formats': {'ISO': 0, 'MM/DD/YYYY': 0, 'unparsed': 0},
+        'time_formats': {'HH:MM': 0, 'HH:MM:SS': 0, 'unparsed': 0},
+        'original_types': set(),
+        'new_types': set(),
+        'vehicle_matches': dict.fromkeys(VehicleNormalizer.METHODS + ['cached'], 0),
+        'severity_sum': 0.0,
+        'severity_max': 0.0,
+        'vulnerable': 0,
+        'integrity_sum': 0.0,
+    }
+
+
+def merge_totals(totals, other):
+    """Fold another set of totals (e.g. from an appended delta) into totals"""
+    for key, value in other.items():
+        if key == 'severity_max':
+            totals[key] = max(totals[key], value)
+        elif isinstance(value, set):
+            totals[key] |= value
+        elif isinstance(value, dict):
+            for fmt, count in value.items():
+                totals[key][fmt] += count
+        else:
+            totals[key] += value
+    return totals
 
-print(f"Vehicle types: {original_types} -> {new_types} (reduced by {original_types - new_types})")
-
-# PHASE 5: FEATURE ENGINEERING
-print("\n[6/7] FEATURE ENGINEERING...")
-print("="*70)
 
 def safe_numeric(series):
-    series = series.replace(NULL_VARIANTS, np.nan)
+    series = standardize_nulls(series, NULL_VARIANTS)
     return pd.to_numeric(series, errors='coerce').fillna(0)
 
-# Severity Score
-killed = safe_numeric(df['NUMBER OF PERSONS KILLED'])
-injured = safe_numeric(df['NUMBER OF PERSONS INJURED'])
-df['SEVERITY_SCORE'] = (killed * 5) + (injured * 1)
-print(f"Severity Score - Avg: {df['SEVERITY_SCORE'].mean():.2f}, Max: {df['SEVERITY_SCORE'].max():.0f}")
-
-# Vulnerability Flag
-ped_injured = safe_numeric(df['NUMBER OF PEDESTRIANS INJURED'])
-ped_killed = safe_numeric(df['NUMBER OF PEDESTRIANS KILLED'])
-cyc_injured = safe_numeric(df['NUMBER OF CYCLIST INJURED'])
-cyc_killed = safe_numeric(df['NUMBER OF CYCLIST KILLED'])
-
-df['VULNERABILITY_FLAG'] = (
-    (ped_injured > 0) | (ped_killed > 0) | 
-    (cyc_injured > 0) | (cyc_killed > 0)
-).astype(int)
-
-vulnerable_count = df['VULNERABILITY_FLAG'].sum()
-print(f"Vulnerable road users involved: {vulnerable_count:,} crashes ({vulnerable_count/len(df)*100:.1f}%)")
-
-# Data Integrity Score
-critical_fields = ['CRASH DATE', 'CRASH TIME', 'LATITUDE', 'LONGITUDE', 'BOROUGH']
-
-def calc_integrity(row):
-    valid_count = 0
-    for field in critical_fields:
-        if field in row.index:
-            val = str(row[field])
-            if pd.notna(row[field]) and val not in NULL_VARIANTS and val != 'nan':
-                valid_count += 1
-    return valid_count / len(critical_fields)
-
-df['DATA_INTEGRITY_SCORE'] = df.apply(calc_integrity, axis=1)
-avg_integrity = df['DATA_INTEGRITY_SCORE'].mean()
-print(f"Average row integrity: {avg_integrity*100:.1f}%")
-
-# Data Quality Flags
-def flag_issues(row):
-    flags = []
-    if '2026' in str(row.get('CRASH DATE', '')) or '2026' in str(row.get('CRASH TIME', '')):
-        flags.append('FUTURE_DATE')
-    if pd.isna(row['LATITUDE']) or pd.isna(row['LONGITUDE']):
-        flags.append('NULL_COORDS')
-    if str(row.get('BOROUGH', '')).strip() in NULL_VARIANTS:
-        flags.append('NULL_BOROUGH')
-    return '|'.join(flags) if flags else 'CLEAN'
-
-df['DATA_QUALITY_FLAGS'] = df.apply(flag_issues, axis=1)
-
-# GLOBAL INTEGRITY
-total_rows = len(df)
-clean_rows = total_rows - total_ghost
-global_integrity = (clean_rows / total_rows) * 100
-
-print("\n" + "="*70)
-print("CITY DATA INTEGRITY ASSESSMENT")
-print("="*70)
-print(f"Global Integrity Score: {global_integrity:.2f}%")
-print(f"Total records: {total_rows:,}")
-print(f"Ghost rows: {total_ghost:,}")
-print(f"Average row integrity: {avg_integrity*100:.1f}%")
-
-# EXPORT
-print("\n[7/7] EXPORTING CLEANED DATASET...")
-print("="*70)
-
-df.to_csv(output_file, index=False, encoding='utf-8')
-print(f"Cleaned dataset exported to: {output_file}")
-print(f"Total rows: {len(df):,}, Total columns: {len(df.columns)}")
-
-print("\n" + "="*70)
-print("FORENSIC AUDIT COMPLETE")
-print("="*70)
-print("\nGenerated files:")
-print(f"1. {output_file} - Clean dataset for Power BI")
-print("\nNext steps:")
-print("1. Import cleaned CSV into Power BI")
-print("2. Review audit statistics above")
-print("3. Analyze high-risk intersections with SEVERITY_SCORE")
+
+def audit_chunk(df, totals, report=None):
+    """Run phases 1-5 on one frame (a chunk or the whole file) and update totals"""
+    report = report or RunReport('audit')
+    rows = len(df)
+    totals['rows'] += rows
+
+    # PHASE 1: CORRUPTION DETECTION
+    with report.stage('phase_1_corruption_detection', rows):
+        # Ghost Rows
+        totals['ghost_in_date'] += int(df['CRASH DATE'].astype(str).str.contains('2026', na=False).sum())
+        totals['ghost_in_time'] += int(df['CRASH TIME'].astype(str).str.contains('2026', na=False).sum())
+
+        # Coordinate voids
+        totals['lat_nulls'] += int(df['LATITUDE'].isna().sum())
+        totals['lon_nulls'] += int(df['LONGITUDE'].isna().sum())
+        totals['recoverable'] += int(df[df['LATITUDE'].isna() & df['LOCATION'].notna()]['LOCATION'].count())
+
+    # PHASE 2: SPATIAL RECOVERY
+    with report.stage('phase_2_spatial_recovery', rows):
+        recovered, elapsed, parses = recover_coordinates(df, locations)
+        totals['recovered'] += recovered
+        totals['recovery_seconds'] += elapsed
+        for key, count in parses.items():
+            totals['location_parses'][key] += count
+
+        # Grid cell ids at every level, from the recovered coordinates
+        add_grid_cells(df)
+        totals['gridded'] += int((df[GRID_COLUMNS[0]] >= 0).sum())
+
+    # PHASE 3: DATE NORMALIZATION
+    with report.stage('phase_3_date_normalization', rows):
+        df['CRASH DATE'], date_formats = parse_dates(df['CRASH DATE'])
+        df['CRASH TIME'], time_formats = parse_times(df['CRASH TIME'], keep_seconds=False)
+        for fmt in totals['date_formats']:
+            totals['date_formats'][fmt] += date_formats[fmt]
+        for fmt in totals['time_formats']:
+            totals['time_formats'][fmt] += time_formats[fmt]
+
+    # PHASE 4: VEHICLE TYPE NORMALIZATION (all five columns, each distinct string resolved once)
+    with report.stage('phase_4_vehicle_normalization', rows):
+        original_types, new_types, matches = vehicle_types.normalize(df, VEHICLE_COLUMNS)
+        totals['original_types'].update(original_types)
+        totals['new_types'].update(new_types)
+        for method, count in matches.items():
+            totals['vehicle_matches'][method] += count
+
+    # PHASE 5: FEATURE ENGINEERING
+    with report.stage('phase_5_feature_engineering', rows):
+        # Severity Score
+        killed = safe_numeric(df['NUMBER OF PERSONS KILLED'])
+        injured = safe_numeric(df['NUMBER OF PERSONS INJURED'])
+        df['SEVERITY_SCORE'] = (killed * 5) + (injured * 1)
+        totals['severity_sum'] += float(df['SEVERITY_SCORE'].sum())
+        totals['severity_max'] = max(totals['severity_max'], float(df['SEVERITY_SCORE'].max()))
+
+        # Vulnerability Flag
+        ped_injured = safe_numeric(df['NUMBER OF PEDESTRIANS INJURED'])
+        ped_killed = safe_numeric(df['NUMBER OF PEDESTRIANS KILLED'])
+        cyc_injured = safe_numeric(df['NUMBER OF CYCLIST INJURED'])
+        cyc_killed = safe_numeric(df['NUMBER OF CYCLIST KILLED'])
+
+        df['VULNERABILITY_FLAG'] = (
+            (ped_injured > 0) | (ped_killed > 0) |
+            (cyc_injured > 0) | (cyc_killed > 0)
+        ).astype(int)
+        totals['vulnerable'] += int(df['VULNERABILITY_FLAG'].sum())
+
+        # Data Integrity Score
+        df['DATA_INTEGRITY_SCORE'] = integrity_scores(df, NULL_VARIANTS)
+        totals['integrity_sum'] += float(df['DATA_INTEGRITY_SCORE'].sum())
+
+        # Data Quality Flags
+        df['DATA_QUALITY_FLAGS'] = quality_flags(df, NULL_VARIANTS)
+
+        df = apply_schema(df, AUDIT_SCHEMA)
+    return df
+
+
+# ========================================================================
+# INPUT FILES
+# ========================================================================
+
+def input_files(spec):
+    """Raw exports named by a file, a directory (its .csv files) or a glob pattern, in name order"""
+    if os.path.isdir(spec):
+        return sorted(glob.glob(os.path.join(spec, '*.csv')))
+    if glob.has_magic(spec):
+        return sorted(glob.glob(spec))
+    return [spec] if os.path.isfile(spec) else []
+
+
+def _pool(workers, tasks):
+    """A process pool of at most one worker per task; forked where possible, so workers inherit the caches"""
+    fork = 'fork' in multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if fork else None)
+    return ProcessPoolExecutor(max_workers=max(1, min(workers, tasks)), mp_context=context)
+
+
+def _file_ids(path, whole=True):
+    """
+    COLLISION_ID keys of one export. whole=True reads every column, which
+    leaves the parsed file in the loader cache for _audit_file
+    """
+    df = read_raw(path) if whole else read_raw(path, columns=['COLLISION_ID'])
+    return id_keys(sanitize_numeric(df['COLLISION_ID'], 'int'))
+
+
+def _audit_file(path, keep):
+    """Phases 1-5 on the rows of one export in keep; returns (frame, totals, report stages)"""
+    report = RunReport('audit')
+    totals = new_totals()
+    with report.stage('load') as stage:
+        df = read_raw(path)
+        if not keep.all():
+            df = df[keep].reset_index(drop=True)
+        stage['rows_out'] = len(df)
+    df = audit_chunk(df, totals, report)
+    return df, totals, report.stages
+
+
+def collision_masks(files, workers=1, whole=True):
+    """Per file, the rows whose COLLISION_ID no earlier file holds (files read concurrently)"""
+    if workers <= 1 or len(files) == 1:
+        return first_seen([_file_ids(path, whole) for path in files])
+    with _pool(workers, len(files)) as pool:
+        return first_seen(list(pool.map(_file_ids, files, [whole] * len(files))))
+
+
+def audit_files(files, masks, totals, report, workers=1):
+    """
+    Audit several exports, each whole in one worker; yields (path, audited
+    frame) in file order while later files are still being audited. Each
+    worker's totals and stage timings are merged into totals and report
+    (so stage times are summed over workers).
+    """
+    if workers <= 1:
+        results = map(_audit_file, files, masks)
+        pool = None
+    else:
+        pool = _pool(workers, len(files))
+        results = pool.map(_audit_file, files, masks)
+    try:
+        for path, (df, file_totals, stages) in zip(files, results):
+            merge_totals(totals, file_totals)
+            report.merge(stages)
+            yield path, df
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def file_chunks(files, masks, chunksize, report):
+    """Stream every export in turn as chunks, without the rows masks drop"""
+    for path, keep in zip(files, masks):
+        offset = 0
+        for chunk in timed_chunks(read_raw(path, chunksize=chunksize), report):
+            rows = keep[offset:offset + len(chunk)]
+            offset += len(chunk)
+            yield chunk if rows.all() else chunk[rows].reset_index(drop=True)
+
+
+def timed_chunks(chunks, report):
+    """Yield from a chunked reader, timing each (lazy) read as a 'load' stage"""
+    chunks = iter(chunks)
+    while True:
+        with report.stage('load') as stage:
+            chunk = next(chunks, None)
+            stage['rows_out'] = 0 if chunk is None else len(chunk)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def print_report(totals):
+    """Print the phase-by-phase audit statistics from the accumulated totals"""
+    total_rows = totals['rows']
+    total_ghost = max(totals['ghost_in_date'], totals['ghost_in_time'])
+
+    print("\n[2/7] DETECTING CORRUPTION...")
+    print("="*70)
+    print(f"Ghost rows (future dates 2026): {total_ghost:,}")
+    print(f"Coordinate voids - LAT nulls: {totals['lat_nulls']:,}, LON nulls: {totals['lon_nulls']:,}")
+    print(f"Recoverable from LOCATION: {totals['recoverable']:,}")
+
+    print("\n[3/7] SPATIAL RECOVERY (Regex extraction)...")
+    print("="*70)
+    rows_per_sec = total_rows / totals['recovery_seconds'] if totals['recovery_seconds'] > 0 else 0
+    print(f"Scanned {total_rows:,} LOCATION rows ({rows_per_sec:,.0f} rows/sec)")
+    parses = totals['location_parses']
+    lookups = parses['parsed'] + parses['cached']
+    hit_rate = parses['cached'] / lookups * 100 if lookups > 0 else 0
+    print(f"Parsed {parses['parsed']:,} distinct LOCATION strings for {parses['rows']:,} void rows "
+          f"({parses['cached']:,} served from the parse cache, {hit_rate:.1f}% hit rate)")
+    recoverable = totals['recoverable']
+    recovery_rate = (totals['recovered'] / recoverable * 100) if recoverable > 0 else 0
+    print(f"Successfully recovered: {totals['recovered']:,} coordinate pairs ({recovery_rate:.1f}%)")
+    levels = '/'.join(str(level) for level in GRID_LEVELS)
+    print(f"Grid cells (levels {levels}) assigned to {totals['gridded']:,} rows with NYC coordinates")
+
+    print("\n[4/7] DATE NORMALIZATION...")
+    print("="*70)
+    dates = totals['date_formats']
+    times = totals['time_formats']
+    print(f"CRASH DATE formats: ISO {dates['ISO']:,}, MM/DD/YYYY {dates['MM/DD/YYYY']:,}, unparsed {dates['unparsed']:,}")
+    print(f"CRASH TIME formats: HH:MM {times['HH:MM']:,}, HH:MM:SS {times['HH:MM:SS']:,}, unparsed {times['unparsed']:,}")
+    print("Date normalization complete")
+
+    print("\n[5/7] VEHICLE TYPE NORMALIZATION...")
+    print("="*70)
+    original_types = len(totals['original_types'])
+    new_types = len(totals['new_types'])
+    print(f"Vehicle types (codes 1-5): {original_types} -> {new_types} (reduced by {original_types - new_types})")
+    matches = totals['vehicle_matches']
+    print(f"Resolved strings: exact {matches['exact']:,}, token {matches['token']:,}, fuzzy {matches['fuzzy']:,}, "
+          f"unmatched {matches['unmatched']:,} ({matches['cached']:,} lookups served from cache)")
+
+    print("\n[6/7] FEATURE ENGINEERING...")
+    print("="*70)
+    # Averages over no rows print as 0
+    rows = max(total_rows, 1)
+    print(f"Severity Score - Avg: {totals['severity_sum'] / rows:.2f}, Max: {totals['severity_max']:.0f}")
+    vulnerable_count = totals['vulnerable']
+    print(f"Vulnerable road users involved: {vulnerable_count:,} crashes ({vulnerable_count/rows*100:.1f}%)")
+    avg_integrity = totals['integrity_sum'] / rows
+    print(f"Average row integrity: {avg_integrity*100:.1f}%")
+
+    # GLOBAL INTEGRITY
+    clean_rows = total_rows - total_ghost
+    global_integrity = (clean_rows / rows) * 100
+
+    print("\n" + "="*70)
+    print("CITY DATA INTEGRITY ASSESSMENT")
+    print("="*70)
+    print(f"Global Integrity Score: {global_integrity:.2f}%")
+    print(f"Total records: {total_rows:,}")
+    print(f"Ghost rows: {total_ghost:,}")
+    print(f"Average row integrity: {avg_integrity*100:.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GRIDLOCK forensic audit")
+    parser.add_argument('--input', default=input_file,
+                        help="raw export: a CSV file, a directory of CSV files or a glob pattern")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="processes reading and auditing input files concurrently (several files only)")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="stream the input in chunks of this many rows (bounded memory)")
+    parser.add_argument('--csv', action='store_true',
+                        help="also export the cleaned table as CSV (Power BI import)")
+    args = parser.parse_args()
+    files = input_files(args.input)
+    if not files:
+        parser.error(f"no CSV files match {args.input!r}")
+
+    print("="*70)
+    print("PROJECT GRIDLOCK - FORENSIC DATA AUDIT")
+    print("Federal Transportation Safety Auditor - NHTSA")
+    print("="*70)
+
+    report = RunReport('audit')
+    totals = new_totals()
+
+    # Load dataset
+    print("\n[1/7] LOADING DATASET...")
+    masks = None
+    if len(files) > 1:
+        print(f"{len(files)} input files ({args.input}), up to {min(args.workers, len(files))} at a time")
+        with report.stage('collision_ids') as stage:
+            masks = collision_masks(files, args.workers, whole=not args.chunksize)
+            stage['rows_out'] = sum(len(keep) for keep in masks)
+        repeated = sum(int((~keep).sum()) for keep in masks)
+        print(f"Rows whose COLLISION_ID an earlier file holds: {repeated:,} (dropped)")
+
+    if args.chunksize:
+        # Declared dtypes (gridlock_loader), so a column has the same dtype in every chunk
+        print(f"Streaming {args.input} in chunks of {args.chunksize:,} rows")
+        if masks is None:
+            chunks = timed_chunks(read_raw(files[0], chunksize=args.chunksize), report)
+        else:
+            chunks = file_chunks(files, masks, args.chunksize, report)
+        audited = (audit_chunk(chunk, totals, report) for chunk in chunks)
+    elif masks is None:
+        with report.stage('load') as stage:
+            df = read_raw(files[0])
+            stage['rows_out'] = len(df)
+        print(f"Loaded {len(df):,} rows with {len(df.columns)} columns")
+        audited = [audit_chunk(df, totals, report)]
+    else:
+        audited = (df for _, df in audit_files(files, masks, totals, report, args.workers))
+
+    # PHASES 1-5, chunk by chunk (or file by file), appending to the output as we go
+    columns = 0
+    with TableWriter(output_table, AUDIT_SCHEMA, csv=args.csv) as writer:
+        for i, chunk in enumerate(audited):
+            if i > 0 and list(chunk.columns) != list(first_chunk.columns):
+                # Another export's column order (names are already reconciled)
+                chunk = chunk.reindex(columns=first_chunk.columns)
+            with report.stage('export', len(chunk)):
+                writer.write(chunk)
+            columns = len(chunk.columns)
+            if i == 0:
+                first_chunk = chunk
+            if args.chunksize or masks is not None:
+                elapsed = report.elapsed()
+                label = f"Chunk {i + 1}" if args.chunksize else os.path.basename(files[i])
+                print(f"  {label}: {totals['rows']:,} rows audited "
+                      f"({elapsed:.1f}s, {totals['rows'] / elapsed:,.0f} rows/s)")
+
+    if totals['rows'] == 0:
+        sys.exit(f"\nNo rows read from {args.input} - nothing to audit")
+
+    print_report(totals)
+    print_memory_report(first_chunk, 'audit output, first chunk' if args.chunksize else 'audit output')
+
+    # EXPORT
+    print("\n[7/7] EXPORTING CLEANED DATASET...")
+    print("="*70)
+
+    for path in writer.paths:
+        print(f"Cleaned dataset exported to: {path} ({file_size_mb(path):.1f} MB)")
+    print(f"Total rows: {totals['rows']:,}, Total columns: {columns}")
+
+    report.print_summary()
+    print(f"Run report: {report.write()}")
+
+    print("\n" + "="*70)
+    print("FORENSIC AUDIT COMPLETE")
+    print("="*70)
+    print("\nGenerated files:")
+    for i, path in enumerate(writer.paths, 1):
+        print(f"{i}. {path} - Clean dataset for the next pipeline stage")
+    print("\nNext steps:")
+    print("1. Run reorganize_for_powerbi.py (or import the --csv export into Power BI)")
+    print("2. Review audit statistics above")
+    print("3. Analyze high-risk intersections with SEVERITY_SCORE")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Project GRIDLOCK - Stage Interchange (Parquet)
+Typed columnar files passed between the audit, reorganize, sanitization and web stages
+Purpose: Stop every hop from re-inferring dtypes and re-parsing CSV text
+
+Each stage table is written as <name>.parquet with an explicit schema and read
+back with column projection. CSV is only written when a stage is asked for a
+Power BI export (--csv), or when pyarrow is not installed (fallback).
+
+Low-cardinality text (borough, vehicle types, contributing factors, street
+names, quality flags) is held as pandas categoricals with sorted categories and
+stored as Parquet dictionary columns; counts and flags use small integer types.
+
+Incremental refreshes add rows as extra files under <name>.parts/ instead of
+rewriting the table; read_table returns the base file and its parts together.
+A full write_table of the same name discards old parts.
+
+A table written with store=True (the sanitized table) also gets a
+memory-mapped column store under <name>.columns/ (gridlock_colstore.py);
+read_table maps its columns instead of decoding Parquet while it is current.
+"""
+
+import glob
+import os
+import shutil
+
+import pandas as pd
+
+from gridlock_engine import GRID_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from gridlock_colstore import ColumnStoreWriter, open_store, store_dir
+    HAVE_ARROW = True
+except ImportError:
+    HAVE_ARROW = False
+
+# Run-to-run caches (pipeline manifest, resolved lookups)
+CACHE_DIR = '.gridlock_cache'
+
+# Stage tables
+CLEAN_TABLE = 'Motor_Vehicle_Collisions_CLEAN'
+POWERBI_TABLE = 'Motor_Vehicle_Collisions_POWERBI_READY'
+FINAL_TABLE = 'Motor_Vehicle_Collisions_FINAL_CLEAN'
+CUBE_TABLE = 'Motor_Vehicle_Collisions_ROLLUP'
+
+# ========================================================================
+# SCHEMAS
+# ========================================================================
+
+COUNT_COLUMNS = [
+    'NUMBER OF PERSONS INJURED',
+    'NUMBER OF PERSONS KILLED',
+    'NUMBER OF PEDESTRIANS INJURED',
+    'NUMBER OF PEDESTRIANS KILLED',
+    'NUMBER OF CYCLIST INJURED',
+    'NUMBER OF CYCLIST KILLED',
+    'NUMBER OF MOTORIST INJURED',
+    'NUMBER OF MOTORIST KILLED',
+]
+VEHICLE_COLUMNS = [f'VEHICLE TYPE CODE {i}' for i in range(1, 6)]
+FACTOR_COLUMNS = [f'CONTRIBUTING FACTOR VEHICLE {i}' for i in range(1, 6)]
+STREET_COLUMNS = ['ON STREET NAME', 'CROSS STREET NAME', 'OFF STREET NAME']
+CATEGORY_COLUMNS = ['BOROUGH'] + STREET_COLUMNS + FACTOR_COLUMNS + VEHICLE_COLUMNS + ['DATA_QUALITY_FLAGS']
+
+# Raw export (read_csv dtypes): low-cardinality text straight into categoricals
+RAW_DTYPES = {col: 'category' for col in CATEGORY_COLUMNS if col != 'DATA_QUALITY_FLAGS'}
+
+# Audit output (CLEAN / POWERBI_READY). Source columns the audit passes through
+# untouched stay as text: they can still hold 'approx 2', '1,204' or '?' and
+# are only converted by sanitization Step 2.
+AUDIT_SCHEMA = {
+    'CRASH DATE': 'timestamp',
+    'CRASH TIME': 'string',
+    'BOROUGH': 'category',
+    'ZIP CODE': 'string',
+    'LATITUDE': 'string',
+    'LONGITUDE': 'string',
+    'LOCATION': 'string',
+    **{col: 'category' for col in STREET_COLUMNS},
+    **{col: 'string' for col in COUNT_COLUMNS},
+    **{col: 'category' for col in FACTOR_COLUMNS},
+    'COLLISION_ID': 'string',
+    **{col: 'category' for col in VEHICLE_COLUMNS},
+    'coord_recovery_flag': 'int8',
+    'SEVERITY_SCORE': 'float64',
+    'VULNERABILITY_FLAG': 'int8',
+    'DATA_INTEGRITY_SCORE': 'float64',
+    'DATA_QUALITY_FLAGS': 'category',
+    **{col: 'int32' for col in GRID_COLUMNS},
+}
+
+# Sanitization output (FINAL_CLEAN): every column has its final type
+FINAL_SCHEMA = {
+    **AUDIT_SCHEMA,
+    'ZIP CODE': 'int32',
+    'LATITUDE': 'float64',
+    'LONGITUDE': 'float64',
+    **{col: 'int16' for col in COUNT_COLUMNS},
+    'COLLISION_ID': 'int64',
+}
+
+# Rollup cube (gridlock_cube.py): one row per occupied dimension cell, summed measures
+CUBE_SCHEMA = {
+    'BOROUGH': 'category',
+    'CRASH HOUR': 'int8',
+    'CRASH MONTH': 'category',
+    'VEHICLE TYPE CODE 1': 'category',
+    'CONTRIBUTING FACTOR VEHICLE 1': 'category',
+    'VULNERABILITY_FLAG': 'int8',
+    'CRASHES': 'int64',
+    'COLLISIONS': 'int64',
+    'SEVERITY_SCORE': 'float64',
+    'NUMBER OF PERSONS KILLED': 'int64',
+    'NUMBER OF PERSONS INJURED': 'int64',
+}
+
+TABLE_SCHEMAS = {
+    CLEAN_TABLE: AUDIT_SCHEMA,
+    POWERBI_TABLE: AUDIT_SCHEMA,
+    FINAL_TABLE: FINAL_SCHEMA,
+    CUBE_TABLE: CUBE_SCHEMA,
+}
+
+SMALL_INTS = ('int8', 'int16', 'int32')
+
+
+def _arrow_type(name):
+    return {
+        'string': pa.string(),
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'int8': pa.int8(),
+        'int16': pa.int16(),
+        'int32': pa.int32(),
+        'int64': pa.int64(),
+        'float64': pa.float64(),
+        'timestamp': pa.timestamp('ns'),
+    }[name]
+
+
+def _as_text(series):
+    """Render values the way to_csv would, keeping missing values missing"""
+    return series.astype(str).where(series.notna(), None).astype(object)
+
+
+def _dictionary_array(series):
+    """Categorical -> Arrow dictionary array straight from its codes (other dtypes are encoded first)"""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return pa.array(_as_text(series), type=pa.string()).dictionary_encode()
+    codes = series.cat.codes.to_numpy().astype('int32')
+    categories = pa.array(series.cat.categories.astype(str).tolist(), type=pa.string())
+    return pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0), categories)
+
+
+def to_arrow(df, schema):
+    """Convert a frame to a pyarrow Table using the declared schema (unknown columns -> string)"""
+    fields, arrays = [], []
+    for col in df.columns:
+        kind = schema.get(col, 'string')
+        series = df[col]
+        arrow_type = _arrow_type(kind)
+        if kind == 'category':
+            arrays.append(_dictionary_array(series))
+        else:
+            if kind == 'string':
+                series = _as_text(series)
+            elif kind == 'timestamp':
+                series = pd.to_datetime(series, errors='coerce')
+            arrays.append(pa.Array.from_pandas(series, type=arrow_type))
+        fields.append(pa.field(col, arrow_type))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def apply_schema(df, schema):
+    """
+    Cast a frame in place to the schema's in-memory types: categoricals with
+    sorted categories (unused ones dropped) and small integer types for counts
+    and flags. Integer columns that still hold NaN are left alone.
+    """
+    for col in df.columns:
+        kind = schema.get(col)
+        series = df[col]
+        if kind == 'category':
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.cat.remove_unused_categories()
+                df[col] = series.cat.reorder_categories(series.cat.categories.sort_values())
+            else:
+                df[col] = series.astype('category')
+        elif kind in SMALL_INTS and pd.api.types.is_numeric_dtype(series.dtype) and not series.isna().any():
+            df[col] = series.astype(kind)
+    return df
+
+
+def print_memory_report(df, label):
+    """In-memory size of a stage frame (deep), with the five largest columns"""
+    usage = df.memory_usage(deep=True, index=False)
+    print(f"\nMEMORY [{label}]: {usage.sum() / 1024 / 1024:.1f} MB "
+          f"({len(df):,} rows x {len(df.columns)} columns)")
+    for col, size in usage.sort_values(ascending=False).head(5).items():
+        print(f"   {col:<32} {str(df[col].dtype):<14} {size / 1024 / 1024:>7.1f} MB")
+
+
+# ========================================================================
+# READ / WRITE
+# ========================================================================
+
+def table_path(name):
+    return f'{name}.parquet' if HAVE_ARROW else f'{name}.csv'
+
+
+def parts_dir(name):
+    return f'{name}.parts'
+
+
+def table_files(name):
+    """Parquet files that make up a table: the base file, then appended parts in order"""
+    return [f'{name}.parquet'] + sorted(glob.glob(os.path.join(parts_dir(name), 'part-*.parquet')))
+
+
+def file_states(name):
+    """Size and mtime of each Parquet file of a table (what a column store mirrors)"""
+    return {path: [os.stat(path).st_size, os.stat(path).st_mtime_ns] for path in table_files(name)}
+
+
+def column_store(name):
+    """The table's column store while it matches the Parquet files, else None"""
+    if not HAVE_ARROW or not os.path.exists(f'{name}.parquet'):
+        return None
+    return open_store(name, file_states(name))
+
+
+class TableWriter:
+    """
+    Write a stage table in one or more chunks.
+
+    Parquet chunks become row groups of a single file; the optional CSV export
+    is appended chunk by chunk alongside it, and with store=True so is the
+    memory-mapped column store.
+    """
+
+    def __init__(self, name, schema, csv=False, store=False):
+        self.name = name
+        self.schema = schema
+        self.csv = csv or not HAVE_ARROW
+        self.rows = 0
+        self.paths = []
+        self._parquet = None
+        self._store = None
+
+        if HAVE_ARROW:
+            self.paths.append(f'{name}.parquet')
+            # A full rewrite replaces any rows appended since the last one
+            shutil.rmtree(parts_dir(name), ignore_errors=True)
+            shutil.rmtree(store_dir(name), ignore_errors=True)
+            if store:
+                self._store = ColumnStoreWriter(name)
+        if self.csv:
+            self.paths.append(f'{name}.csv')
+
+    def write(self, df):
+        if HAVE_ARROW:
+            table = to_arrow(df, self.schema)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(f'{self.name}.parquet', table.schema, compression='zstd')
+            self._parquet.write_table(table)
+            if self._store is not None:
+                self._store.write(table)
+        if self.csv:
+            df.to_csv(f'{self.name}.csv', mode='w' if self.rows == 0 else 'a',
+                      header=(self.rows == 0), index=False, encoding='utf-8')
+        self.rows += len(df)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+        if self._store is not None:
+            self.paths.append(self._store.close(file_states(self.name)))
+            self._store = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_table(df, name, schema, csv=False, store=False):
+    """Write a whole frame as a stage table; returns the paths written"""
+    with TableWriter(name, schema, csv=csv, store=store) as writer:
+        writer.write(df)
+    return writer.paths
+
+
+def append_table(df, name, schema, csv=False):
+    """
+    Add rows to an existing stage table without rewriting it: a new Parquet part
+    file, the rows added to its column store if it has a current one, and
+    appended to the CSV export if the table has one (csv=True).
+    Returns the paths written.
+    """
+    paths = []
+    if HAVE_ARROW:
+        current = column_store(name) is not None
+        os.makedirs(parts_dir(name), exist_ok=True)
+        path = os.path.join(parts_dir(name), f'part-{len(table_files(name)):05d}.parquet')
+        table = to_arrow(df, schema)
+        pq.write_table(table, path, compression='zstd')
+        paths.append(path)
+        if current:
+            store = ColumnStoreWriter(name, append=True)
+            store.write(table)
+            paths.append(store.close(file_states(name)))
+    if csv or not HAVE_ARROW:
+        header = pd.read_csv(f'{name}.csv', nrows=0).columns
+        df.reindex(columns=header).to_csv(f'{name}.csv', mode='a', header=False, index=False, encoding='utf-8')
+        paths.append(f'{name}.csv')
+    return paths
+
+
+def table_columns(name):
+    """Column names of a stage table without loading any data"""
+    if HAVE_ARROW:
+        return pq.read_schema(f'{name}.parquet').names
+    return list(pd.read_csv(f'{name}.csv', nrows=0).columns)
+
+
+def read_table(name, columns=None):
+    """
+    Load a stage table. Only the requested columns are read; columns the table
+    does not have are skipped so callers can keep their own 'if col in df' checks.
+    A current column store is mapped instead of reading the Parquet files.
+    """
+    store = column_store(name)
+    if store is not None:
+        return apply_schema(store.frame(columns), TABLE_SCHEMAS.get(name, {}))
+    if columns is not None:
+        available = set(table_columns(name))
+        columns = [col for col in columns if col in available]
+    if HAVE_ARROW:
+        files = table_files(name)
+        if len(files) == 1:
+            df = pd.read_parquet(files[0], columns=columns)
+        else:
+            df = pd.concat([pd.read_parquet(path, columns=columns) for path in files], ignore_index=True)
+    else:
+        df = pd.read_csv(f'{name}.csv', usecols=columns, low_memory=False)
+    return apply_schema(df, TABLE_SCHEMAS.get(name, {}))
+
+
+def file_size_mb(path):
+    return os.path.getsize(path) / 1024 / 1024
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Project GRIDLOCK - Raw Export Loader
+One reader for the raw Motor Vehicle Collisions exports (audit input, --append
+exports, the before-audit comparison stats)
+Purpose: Explicit dtypes, only the columns asked for, the fastest parser, and
+each version of a file parsed once
+
+Schema: the low-cardinality text columns (RAW_DTYPES) are read straight into
+categoricals and every other column as text. Nothing is inferred, so a column
+has the same dtype in every file and every chunk; the numeric conversion is
+sanitization Step 2's job.
+
+Column names: exports from different years and portals spell the headers
+differently ('LATITUDE' / 'Latitude', 'CRASH DATE' / 'crash_date'). Every
+header is matched to RAW_COLUMNS ignoring case, spaces and punctuation and
+renamed to that spelling, so callers only ever see the canonical names.
+
+Parser: pyarrow's CSV reader when pyarrow is installed (about 1.5x pandas' C
+parser on the raw export), the C parser otherwise. Both treat the same tokens
+as missing.
+
+Cache: a parsed file is kept as Parquet under .gridlock_cache/loads/, keyed by
+its path, size and modification time plus a hash of the declared dtypes and
+this module's code. A later load of the same file version (the web stats after
+the audit, a re-run) reads the Parquet copy instead of parsing the CSV; a
+changed file, schema or loader gets a new key and the old copy is removed.
+Streaming reads use the copy when it holds the columns, but never write one.
+
+    df = read_raw('export.csv')                                     # every column
+    df = read_raw('export.csv', columns=['COLLISION_ID', 'LATITUDE'])
+    for chunk in read_raw('export.csv', chunksize=250_000): ...     # bounded memory
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+
+import pandas as pd
+
+from gridlock_io import CACHE_DIR, HAVE_ARROW, RAW_DTYPES
+
+if HAVE_ARROW:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+
+LOAD_CACHE_DIR = os.path.join(CACHE_DIR, 'loads')
+
+# pandas' default missing-value tokens, given to pyarrow's streaming reader too
+RAW_NULL_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+
+STREAM_BLOCK_BYTES = 16 << 20
+
+# Canonical raw column names (the NYC OpenData CSV export header)
+RAW_COLUMNS = [
+    'CRASH DATE', 'CRASH TIME', 'BOROUGH', 'ZIP CODE', 'LATITUDE', 'LONGITUDE', 'LOCATION',
+    'ON STREET NAME', 'CROSS STREET NAME', 'OFF STREET NAME',
+    'NUMBER OF PERSONS INJURED', 'NUMBER OF PERSONS KILLED', 'NUMBER OF PEDESTRIANS INJURED',
+    'NUMBER OF PEDESTRIANS KILLED', 'NUMBER OF CYCLIST INJURED', 'NUMBER OF CYCLIST KILLED',
+    'NUMBER OF MOTORIST INJURED', 'NUMBER OF MOTORIST KILLED',
+    *[f'CONTRIBUTING FACTOR VEHICLE {i}' for i in range(1, 6)],
+    'COLLISION_ID',
+    *[f'VEHICLE TYPE CODE {i}' for i in range(1, 6)],
+]
+
+
+# ========================================================================
+# SCHEMA
+# ========================================================================
+
+def _column_key(name):
+    """'Latitude', 'crash_date', 'VEHICLE TYPE CODE 1' -> 'LATITUDE', 'CRASHDATE', 'VEHICLETYPECODE1'"""
+    return re.sub(r'[^A-Z0-9]', '', str(name).upper())
+
+
+_CANONICAL = {_column_key(col): col for col in RAW_COLUMNS}
+
+
+def canonical_names(header):
+    """
+    File column -> canonical name. Columns RAW_COLUMNS does not know keep
+    their own name, as does a second spelling of a column already mapped.
+    """
+    names, taken = {}, set()
+    # Exact spellings claim their name first
+    for col in sorted(header, key=lambda col: col not in RAW_COLUMNS):
+        name = _CANONICAL.get(_column_key(col), col)
+        names[col] = name if name not in taken else col
+        taken.add(names[col])
+    return {col: names[col] for col in header}
+
+
+def raw_header(path):
+    """A raw export's column names, canonical spelling"""
+    return list(canonical_names(pd.read_csv(path, nrows=0).columns).values())
+
+
+def raw_dtypes(columns):
+    """Declared dtype per raw column: categoricals from RAW_DTYPES, text for the rest"""
+    return {col: RAW_DTYPES.get(col, 'str') for col in columns}
+
+
+def _select(header, columns):
+    """Requested columns in file order; names the file does not have are skipped"""
+    if columns is None:
+        return header
+    wanted = set(columns)
+    return [col for col in header if col in wanted]
+
+
+# ========================================================================
+# PARQUET CACHE
+# ========================================================================
+
+def _loader_digest():
+    """Hash of what shapes a parsed copy: the declared dtypes, null tokens and this module's code"""
+    h = hashlib.blake2b(digest_size=8)
+    h.update(json.dumps([RAW_DTYPES, RAW_NULL_VALUES, RAW_COLUMNS], sort_keys=True).encode())
+    with open(os.path.abspath(__file__), 'rb') as f:
+        h.update(f.read())
+    return h.hexdigest()
+
+
+_LOADER_DIGEST = _loader_digest()
+
+
+def _cache_file(path):
+    stat = os.stat(path)
+    name = hashlib.blake2b(os.path.abspath(path).encode(), digest_size=8).hexdigest()
+    version = hashlib.blake2b(f"{stat.st_size}:{stat.st_mtime_ns}:{_LOADER_DIGEST}".encode(), digest_size=8).hexdigest()
+    return os.path.join(LOAD_CACHE_DIR, f"{name}-{version}.parquet")
+
+
+def _cached_columns(cache_file):
+    if not HAVE_ARROW or not cache_file or not os.path.exists(cache_file):
+        return set()
+    return set(pq.read_schema(cache_file).names)
+
+
+def _store(df, cache_file):
+    os.makedirs(LOAD_CACHE_DIR, exist_ok=True)
+    # Older versions of the same file are dead weight
+    for stale in glob.glob(cache_file.rsplit('-', 1)[0] + '-*.parquet'):
+        os.remove(stale)
+    tmp = f"{cache_file}.tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, cache_file)
+
+
+# ========================================================================
+# READERS
+# ========================================================================
+
+def _file_columns(path, columns):
+    """{file column: canonical name} for the canonical columns to read"""
+    names = canonical_names(pd.read_csv(path, nrows=0).columns)
+    wanted = set(columns)
+    return {col: name for col, name in names.items() if name in wanted}
+
+
+def _parse(path, columns):
+    names = _file_columns(path, columns)
+    dtypes = {col: RAW_DTYPES.get(name, 'str') for col, name in names.items()}
+    if HAVE_ARROW:
+        df = pd.read_csv(path, usecols=list(names), dtype=dtypes, engine='pyarrow')
+    else:
+        df = pd.read_csv(path, usecols=list(names), dtype=dtypes, low_memory=False)
+    return df.rename(columns=names)
+
+
+def _rechunk(batches, chunksize, dtypes, names):
+    """Arrow record batches -> DataFrames of exactly chunksize rows (the last may be shorter)"""
+    pending, rows = [], 0
+    for batch in batches:
+        pending.append(batch)
+        rows += batch.num_rows
+        while rows >= chunksize:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, chunksize).to_pandas().rename(columns=names).astype(dtypes)
+            pending = table.slice(chunksize).to_batches()
+            rows -= chunksize
+    if rows:
+        yield pa.Table.from_batches(pending).to_pandas().rename(columns=names).astype(dtypes)
+
+
+def _stream(path, columns, chunksize, cache_file):
+    dtypes = raw_dtypes(columns)
+    names = _file_columns(path, columns)
+    if not HAVE_ARROW:
+        file_dtypes = {col: dtypes[name] for col, name in names.items()}
+        for chunk in pd.read_csv(path, usecols=list(names), dtype=file_dtypes, chunksize=chunksize):
+            yield chunk.rename(columns=names)
+        return
+    if set(columns) <= _cached_columns(cache_file):
+        batches = pq.ParquetFile(cache_file).iter_batches(batch_size=chunksize, columns=columns)
+        names = {}
+    else:
+        convert = pacsv.ConvertOptions(
+            column_types={col: pa.string() for col in names}, include_columns=list(names),
+            null_values=RAW_NULL_VALUES, strings_can_be_null=True,
+        )
+        batches = pacsv.open_csv(path, read_options=pacsv.ReadOptions(block_size=STREAM_BLOCK_BYTES),
+                                 convert_options=convert)
+    yield from _rechunk(batches, chunksize, dtypes, names)
+
+
+def read_raw(path, columns=None, chunksize=None, cache=True):
+    """
+    A raw export with its declared dtypes: the whole file (or the listed
+    columns) as one DataFrame, or an iterator of chunksize-row DataFrames
+    """
+    columns = _select(raw_header(path), columns)
+    cache_file = _cache_file(path) if cache else None
+    if chunksize:
+        return _stream(path, columns, chunksize, cache_file)
+
+    cached = _cached_columns(cache_file) if cache else set()
+    if cached and set(columns) <= cached:
+        return pd.read_parquet(cache_file, columns=columns)
+
+    df = _parse(path, columns)
+    # A read covering every cached column replaces the copy; a narrower one leaves it
+    if cache and HAVE_ARROW and set(columns) >= cached:
+        _store(df, cache_file)
+    return df
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Project GRIDLOCK - Run Reports
+Wall time, CPU time, peak RSS and row throughput for every numbered stage
+Purpose: Machine-readable cost per stage, so a nightly job can catch regressions
+
+    report = RunReport('audit')
+    with report.stage('phase_2_spatial_recovery', rows_in=len(df)) as stage:
+        ...
+        stage['rows_out'] = len(df)      # optional, defaults to rows_in
+    report.write()                       # -> audit_run_report.json
+
+A stage entered repeatedly (one per chunk) accumulates into one entry.
+Stages opened inside another stage are recorded as 'outer/inner'. Stages
+timed in worker processes are folded in with merge(), summed like chunks.
+
+Peak RSS is per stage on Linux (the kernel high-water mark is reset when a
+stage starts); elsewhere it is the process peak so far. CPU time includes
+worker processes that finished inside the stage.
+"""
+
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_SUFFIX = '_run_report.json'
+
+
+# ========================================================================
+# PROCESS COUNTERS
+# ========================================================================
+
+def cpu_seconds():
+    """User + system CPU of this process and of its reaped children"""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _reset_peak_rss():
+    """Reset the kernel's RSS high-water mark (Linux); False where unsupported"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb():
+    """Peak resident set size in MB (since the last reset on Linux)"""
+    try:
+        with open('/proc/self/status') as f:
+            return int(re.search(r'VmHWM:\s+(\d+)', f.read()).group(1)) / 1024
+    except (OSError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, KB elsewhere
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+# ========================================================================
+# RUN REPORT
+# ========================================================================
+
+def report_path(name):
+    return f"{name}{REPORT_SUFFIX}"
+
+
+class RunReport:
+    """Per-stage cost of one script run, written as <name>_run_report.json"""
+
+    def __init__(self, name):
+        self.name = name
+        self.stages = {}
+        self.started = time.strftime("%Y-%m-%d %H:%M:%S")
+        self._wall = time.perf_counter()
+        self._cpu = cpu_seconds()
+        self._peak = peak_rss_mb()
+        # Open stages: [name, peak of the stages already closed inside it]
+        self._open = []
+
+    @contextlib.contextmanager
+    def stage(self, name, rows_in=None):
+        record = {'rows_in': rows_in, 'rows_out': None}
+        path = '/'.join([entry[0] for entry in self._open] + [name])
+        self._open.append([name, None])
+        _reset_peak_rss()
+        wall, cpu = time.perf_counter(), cpu_seconds()
+        try:
+            yield record
+        finally:
+            wall, cpu = time.perf_counter() - wall, cpu_seconds() - cpu
+            peak = _max(peak_rss_mb(), self._open.pop()[1])
+            # A nested reset hides earlier peaks from the enclosing stages, so pass ours up
+            if self._open:
+                self._open[-1][1] = _max(self._open[-1][1], peak)
+            self._peak = _max(self._peak, peak)
+            rows_out = record['rows_out'] if record['rows_out'] is not None else record['rows_in']
+            self._add(path, wall, cpu, peak, record['rows_in'], rows_out)
+
+    def _add(self, path, wall, cpu, peak, rows_in, rows_out):
+        entry = self.stages.setdefault(path, {
+            'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'peak_rss_mb': None,
+            'rows_in': None, 'rows_out': None,
+        })
+        entry['calls'] += 1
+        entry['wall_seconds'] += wall
+        entry['cpu_seconds'] += cpu
+        entry['peak_rss_mb'] = _max(entry['peak_rss_mb'], peak)
+        if rows_in is not None:
+            entry['rows_in'] = (entry['rows_in'] or 0) + rows_in
+        if rows_out is not None:
+            entry['rows_out'] = (entry['rows_out'] or 0) + rows_out
+
+    def merge(self, stages, prefix=None):
+        """Add the stages of another report (e.g. a worker's report.stages), under prefix/"""
+        for path, entry in stages.items():
+            path = f"{prefix}/{path}" if prefix else path
+            self._add(path, entry['wall_seconds'], entry['cpu_seconds'], entry['peak_rss_mb'],
+                      entry['rows_in'], entry['rows_out'])
+            self.stages[path]['calls'] += entry['calls'] - 1
+
+    def elapsed(self):
+        return time.perf_counter() - self._wall
+
+    def to_dict(self):
+        stages = []
+        for path, entry in self.stages.items():
+            rows = entry['rows_in'] if entry['rows_in'] is not None else entry['rows_out']
+            seconds = entry['wall_seconds']
+            stages.append({
+                'stage': path,
+                **entry,
+                'wall_seconds': round(seconds, 4),
+                'cpu_seconds': round(entry['cpu_seconds'], 4),
+                'peak_rss_mb': round(entry['peak_rss_mb'], 1) if entry['peak_rss_mb'] is not None else None,
+                'rows_per_second': round(rows / seconds, 1) if rows and seconds > 0 else None,
+            })
+        peak = _max(self._peak, peak_rss_mb())
+        return {
+            'run': self.name,
+            'started': self.started,
+            'wall_seconds': round(self.elapsed(), 4),
+            'cpu_seconds': round(cpu_seconds() - self._cpu, 4),
+            'peak_rss_mb': round(peak, 1) if peak is not None else None,
+            'stages': stages,
+        }
+
+    def write(self, path=None):
+        path = path or report_path(self.name)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    def print_summary(self):
+        report = self.to_dict()
+        print(f"\nRUN REPORT [{self.name}]: {report['wall_seconds']:.2f}s wall, "
+              f"{report['cpu_seconds']:.2f}s CPU, peak RSS {_mb(report['peak_rss_mb'])}")
+        print(f"   {'stage':<40} {'wall':>8} {'cpu':>8} {'peak':>10} {'rows/s':>12}")
+        for stage in report['stages']:
+            rate = f"{stage['rows_per_second']:>12,.0f}" if stage['rows_per_second'] else f"{'-':>12}"
+            print(f"   {stage['stage']:<40} {stage['wall_seconds']:>7.2f}s {stage['cpu_seconds']:>7.2f}s "
+                  f"{_mb(stage['peak_rss_mb']):>10} {rate}")
+
+
+def _max(a, b):
+    return b if a is None else a if b is None else max(a, b)
+
+
+def _mb(value):
+    return f"{value:.0f} MB" if value is not None else '-'
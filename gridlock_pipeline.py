@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Project GRIDLOCK - Pipeline Runner
+Runs audit -> reorganize -> sanitize -> rollup cube -> web data / map tiles -> verification in one process
+Purpose: Pass DataFrames between stages in memory and skip stages whose cached output is still valid
+
+Every stage gets a key: a content hash of its code, its raw input files and the
+keys of the stages it reads from. A stage is skipped when the manifest holds the
+same key and its output files are untouched since that run; a downstream stage
+that does need to run then loads the cached table instead of recomputing it.
+
+Incremental mode (--append) takes a newer export, keeps only the rows whose
+COLLISION_ID is not in the cleaned store yet, runs the audit, reorganize and
+sanitization rules on those rows alone and appends them to each stage table.
+The audit totals are kept in the manifest and merged with the delta's, so the
+report updates without rescanning the history. Once rows have been appended, a
+full run that would have to rerun the audit (changed code, input or options)
+stops instead of rebuilding the tables without them, unless --rebuild is given.
+
+Usage:
+    python gridlock_pipeline.py                        # run, reusing cached stages
+    python gridlock_pipeline.py --force                # ignore the cache and run everything
+    python gridlock_pipeline.py --csv                  # also export CSVs for Power BI
+    python gridlock_pipeline.py --append new_rows.csv  # add only unseen collisions
+    python gridlock_pipeline.py --rebuild              # rebuild from --input, dropping appended rows
+    python gridlock_pipeline.py --input exports/       # audit every .csv in a directory (or a glob)
+    python gridlock_pipeline.py --workers 8            # parallel file audit and per-column sanitization
+    python gridlock_pipeline.py --compact              # also the columnar, precompressed web payload
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+import advanced_data_sanitization as sanitization
+import build_map_tiles as tiles
+import gridlock_cube as cube
+import gridlock_forensic_audit as audit
+import reorganize_for_powerbi as reorganize
+import verify_tables
+import web_data_processor as web
+from gridlock_dedup import Deduplicator
+from gridlock_io import (
+    AUDIT_SCHEMA, CACHE_DIR, CLEAN_TABLE, CUBE_SCHEMA, CUBE_TABLE, FINAL_SCHEMA, FINAL_TABLE, POWERBI_TABLE,
+    append_table, apply_schema, parts_dir, print_memory_report, read_table, write_table
+)
+from gridlock_loader import read_raw
+from gridlock_metrics import RunReport
+
+MANIFEST_FILE = os.path.join(CACHE_DIR, 'manifest.json')
+
+# Modules every stage runs through (gridlock_io reads tables via gridlock_colstore)
+SHARED_CODE = ['gridlock_engine.py', 'gridlock_io.py', 'gridlock_colstore.py', 'gridlock_metrics.py']
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# ========================================================================
+# STAGES
+# ========================================================================
+# Each run function takes (inputs, meta, args, report), where inputs maps
+# upstream stage -> DataFrame (only the stages listed in 'reads', default
+# 'after'), meta maps upstream stage -> its recorded metadata and report is
+# the run's RunReport (the stage's own steps nest under its name).
+# It returns (DataFrame or None, metadata dict, output paths).
+
+def run_audit(inputs, meta, args, report):
+    files = audit.input_files(args.input)
+    totals = audit.new_totals()
+    if len(files) == 1:
+        print(f"Loading: {files[0]}")
+        with report.stage('load') as stage:
+            df = read_raw(files[0])
+            stage['rows_out'] = len(df)
+        df = audit.audit_chunk(df, totals, report)
+    else:
+        print(f"Loading: {len(files)} input files ({args.input}), up to {min(args.workers, len(files))} at a time")
+        with report.stage('collision_ids') as stage:
+            masks = audit.collision_masks(files, args.workers)
+            stage['rows_out'] = sum(len(keep) for keep in masks)
+        print(f"Rows whose COLLISION_ID an earlier file holds: {sum(int((~keep).sum()) for keep in masks):,} (dropped)")
+        # concat lines columns up by name, in the first file's order
+        frames = [df for _, df in audit.audit_files(files, masks, totals, report, args.workers)]
+        df = apply_schema(pd.concat(frames, ignore_index=True), AUDIT_SCHEMA)
+    audit.print_report(totals)
+    with report.stage('export', len(df)):
+        paths = write_table(df, CLEAN_TABLE, AUDIT_SCHEMA, csv=args.csv)
+    return df, audit_meta(totals), paths
+
+
+def audit_meta(totals):
+    """Audit totals (sets as lists, for JSON) plus the raw-file figures the web stage compares against"""
+    old_total = totals['rows']
+    old_missing = totals['lat_nulls']
+    old_stats = {
+        'total': old_total,
+        'missing_coords': old_missing,
+        'integrity': ((old_total - old_missing) / old_total) * 100 if old_total > 0 else 0,
+    }
+    stored = {key: sorted(value) if isinstance(value, set) else value for key, value in totals.items()}
+    return {'old_stats': old_stats, 'totals': stored}
+
+
+def load_totals(stored):
+    totals = audit.new_totals()
+    for key, value in stored.items():
+        totals[key] = set(value) if isinstance(totals[key], set) else value
+    return totals
+
+
+def run_reorganize(inputs, meta, args, report):
+    df = reorganize.reorganize(inputs['audit'])
+    with report.stage('export', len(df)):
+        paths = write_table(df, POWERBI_TABLE, AUDIT_SCHEMA, csv=args.csv)
+    print(f"Reorganized {len(df.columns)} columns -> {', '.join(paths)}")
+    return df, {}, paths
+
+
+def run_sanitize(inputs, meta, args, report):
+    dedup = Deduplicator()
+    df = sanitization.sanitize(inputs['reorganize'].copy(), workers=args.workers, report=report, dedup=dedup)
+    with report.stage('step_7_export', len(df)):
+        paths = write_table(df, FINAL_TABLE, FINAL_SCHEMA, csv=args.csv, store=True)
+    # Seen rows/IDs for --append; tracked as an output so a deleted state reruns the stage
+    paths.append(dedup.save())
+    print(f"\nOutput file: {', '.join(paths[:-1])}")
+    print(f"Duplicate report: {dedup.write_report()}")
+    sanitization.print_summary(df)
+    return df, {}, paths
+
+
+def run_cube(inputs, meta, args, report):
+    with report.stage('build', len(inputs['sanitize'])) as stage:
+        df = cube.build_cube(inputs['sanitize'])
+        stage['rows_out'] = len(df)
+    with report.stage('export', len(df)):
+        paths = cube.write_cube(df, csv=args.csv)
+    print(f"Rollup cube: {len(inputs['sanitize']):,} rows -> {len(df):,} cells ({', '.join(paths)})")
+    return df, {}, paths
+
+
+def run_web(inputs, meta, args, report):
+    web_data = web.build_web_data(inputs['sanitize'], meta['audit']['old_stats'], report, cube=inputs['cube'])
+    with report.stage('export'):
+        with open(web.output_file, 'w', encoding='utf-8') as f:
+            json.dump(web_data, f, indent=2)
+    paths = [web.output_file, web.hotspots_file]
+    if args.compact:
+        with report.stage('export_compact'):
+            paths += web.write_compact(web_data)
+    with report.stage('section_7_hotspot_grid', len(inputs['sanitize'])):
+        with open(web.hotspots_file, 'w', encoding='utf-8') as f:
+            json.dump(web.build_hotspot_grid(inputs['sanitize']), f, separators=(',', ':'))
+    print(f"✓ JSON generated successfully: {web.output_file}")
+    return None, {}, paths
+
+
+def run_tiles(inputs, meta, args, report):
+    index = tiles.write_tiles(inputs['sanitize'], tiles.tiles_dir, report)
+    print(f"✓ {index['points']:,} points tiled: {tiles.tiles_dir}/")
+    return None, {}, [os.path.join(tiles.tiles_dir, 'index.json')]
+
+
+def run_verify_clean(inputs, meta, args, report):
+    validator = verify_tables.validate_table('clean', report=report)
+    return None, {'failures': validator.failures()}, []
+
+
+def run_verify_final(inputs, meta, args, report):
+    validator = verify_tables.validate_table('final', report=report)
+    return None, {'failures': validator.failures()}, []
+
+
+STAGES = [
+    {'name': 'audit',
+     'code': ['gridlock_forensic_audit.py', 'gridlock_loader.py', 'gridlock_dedup.py', 'advanced_data_sanitization.py'], 'after': [],
+     'files': lambda args: audit.input_files(args.input), 'run': run_audit, 'load': lambda: read_table(CLEAN_TABLE)},
+    {'name': 'reorganize', 'code': ['reorganize_for_powerbi.py'], 'after': ['audit'],
+     'files': [], 'run': run_reorganize, 'load': lambda: read_table(POWERBI_TABLE)},
+    {'name': 'sanitize', 'code': ['advanced_data_sanitization.py', 'gridlock_dedup.py'], 'after': ['reorganize'],
+     'files': [], 'run': run_sanitize, 'load': lambda: read_table(FINAL_TABLE)},
+    {'name': 'cube', 'code': ['gridlock_cube.py'], 'after': ['sanitize'],
+     'files': [], 'run': run_cube, 'load': lambda: cube.load_cube(check_age=False)},
+    {'name': 'web', 'code': ['web_data_processor.py', 'gridlock_cube.py', 'gridlock_loader.py'], 'after': ['audit', 'sanitize', 'cube'],
+     'reads': ['sanitize', 'cube'], 'options': ['compact'], 'files': [], 'run': run_web, 'load': None},
+    {'name': 'tiles', 'code': ['build_map_tiles.py'], 'after': ['sanitize'],
+     'files': [], 'run': run_tiles, 'load': None},
+    # The checks scan the written tables (appended parts included), not the frames
+    {'name': 'verify_clean', 'code': ['verify_tables.py', 'gridlock_dedup.py'], 'after': ['audit'], 'reads': [],
+     'files': [], 'run': run_verify_clean, 'load': None},
+    {'name': 'verify_final', 'code': ['verify_tables.py', 'gridlock_dedup.py'], 'after': ['sanitize'], 'reads': [],
+     'files': [], 'run': run_verify_final, 'load': None},
+]
+
+
+# ========================================================================
+# FINGERPRINTS & MANIFEST
+# ========================================================================
+
+def file_digest(path, known):
+    """
+    Content hash of a file. The digest is reused when size and mtime match
+    the last run, so a multi-GB raw export is only re-hashed when it changes.
+    """
+    stat = os.stat(path)
+    entry = known.get(path)
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry['digest']
+
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    known[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': h.hexdigest()}
+    return known[path]['digest']
+
+
+def stage_key(stage, keys, manifest, args):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(stage['name'].encode())
+    for name in stage['code'] + SHARED_CODE:
+        h.update(file_digest(os.path.join(CODE_DIR, name), manifest['files']).encode())
+    files = stage['files'](args) if callable(stage['files']) else stage['files']
+    for path in files:
+        h.update(file_digest(path, manifest['files']).encode())
+    for upstream in stage['after']:
+        h.update(keys[upstream].encode())
+    # Options that change a stage's outputs ('csv' for all, others listed per stage)
+    h.update(json.dumps({option: getattr(args, option) for option in ['csv', *stage.get('options', [])]}).encode())
+    return h.hexdigest()
+
+
+def output_state(paths):
+    return {path: [os.stat(path).st_size, os.stat(path).st_mtime_ns] for path in paths}
+
+
+def is_cached(manifest, name, key):
+    entry = manifest['stages'].get(name)
+    if not entry or entry['key'] != key:
+        return False
+    for path, state in entry['outputs'].items():
+        if not os.path.exists(path) or [os.stat(path).st_size, os.stat(path).st_mtime_ns] != state:
+            return False
+    return True
+
+
+def load_manifest():
+    if os.path.exists(MANIFEST_FILE):
+        with open(MANIFEST_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    return {'files': {}, 'stages': {}}
+
+
+def save_manifest(manifest):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+
+# ========================================================================
+# RUNNER
+# ========================================================================
+
+def run_pipeline(args):
+    """Run every stage not cached; returns [(stage, 'ran', 'cached' or 'FAILED', seconds)]"""
+    manifest = {'files': {}, 'stages': {}} if args.force else load_manifest()
+    keys, frames, timings = {}, {}, []
+    report = RunReport('pipeline')
+
+    def frame(name):
+        """In-memory output of a stage, loading the cached table if it was skipped"""
+        if name not in frames:
+            stage = next(s for s in STAGES if s['name'] == name)
+            print(f"  (loading cached '{name}' output)")
+            frames[name] = stage['load']()
+        return frames[name]
+
+    for i, stage in enumerate(STAGES, 1):
+        name = stage['name']
+        keys[name] = stage_key(stage, keys, manifest, args)
+
+        print("\n" + "="*70)
+        print(f"[{i}/{len(STAGES)}] STAGE: {name.upper()}")
+        print("="*70)
+
+        if is_cached(manifest, name, keys[name]):
+            print(f"Cached (key {keys[name][:12]}) - skipping")
+            timings.append((name, 'cached', 0.0))
+            continue
+
+        if name == 'audit' and os.path.isdir(parts_dir(CLEAN_TABLE)):
+            # Rebuilding from the raw export would silently drop the appended rows
+            if not args.rebuild:
+                sys.exit(f"\nStage 'audit' must rerun (its code, input or options differ from the run that built "
+                         f"the store), which rebuilds the tables from {args.input} and drops the rows added with "
+                         f"--append ({parts_dir(CLEAN_TABLE)}/). Rerun with that run's options, or pass --rebuild "
+                         f"to rebuild and drop them.")
+            print(f"Note: rebuilding from {args.input} (--rebuild) - rows added with --append are dropped")
+
+        start = time.perf_counter()
+        inputs = {upstream: frame(upstream) for upstream in stage.get('reads', stage['after'])}
+        meta = {upstream: manifest['stages'][upstream]['meta'] for upstream in stage['after']}
+        rows_in = sum(len(upstream) for upstream in inputs.values()) if inputs else None
+        with report.stage(name, rows_in) as record:
+            df, stage_meta, paths = stage['run'](inputs, meta, args, report)
+            if df is not None:
+                record['rows_out'] = len(df)
+        elapsed = time.perf_counter() - start
+
+        if df is not None:
+            frames[name] = df
+            print_memory_report(df, name)
+        if stage_meta.get('failures'):
+            # Not recorded, so the next run checks again
+            timings.append((name, 'FAILED', elapsed))
+            continue
+        manifest['stages'][name] = {'key': keys[name], 'outputs': output_state(paths), 'meta': stage_meta}
+        save_manifest(manifest)
+        timings.append((name, 'ran', elapsed))
+
+    print("\n" + "="*70)
+    print("PIPELINE SUMMARY")
+    print("="*70)
+    for name, status, elapsed in timings:
+        print(f"   {name:<14} {status:<7} {elapsed:>8.2f}s")
+    print(f"   {'total':<14} {'':<7} {sum(t[2] for t in timings):>8.2f}s")
+    report.print_summary()
+    print(f"Run report: {report.write()}")
+    return timings
+
+
+# ========================================================================
+# INCREMENTAL APPEND
+# ========================================================================
+
+def run_append(args):
+    manifest = load_manifest()
+    stages = manifest['stages']
+    if 'totals' not in stages.get('audit', {}).get('meta', {}) or 'sanitize' not in stages:
+        print("No cleaned store to append to - run the full pipeline first")
+        return 1
+
+    start = time.perf_counter()
+    print(f"Loading new export: {args.append}")
+    # Read exactly like the audit stage reads the raw export, so the new rows
+    # reach every rule with the same dtypes as the history did
+    raw = read_raw(args.append)
+
+    # Same keep-first rule as sanitization Step 5, applied against the store:
+    # a collision already cleaned is never replaced by a later copy. The seen
+    # rows/IDs saved by the sanitize stage answer this without reading the store
+    dedup = Deduplicator.load()
+    if dedup is None:
+        dedup = Deduplicator(ids=read_table(FINAL_TABLE, columns=['COLLISION_ID'])['COLLISION_ID'])
+    new_ids = sanitization.sanitize_numeric(raw['COLLISION_ID'], 'int')
+    delta = raw[~dedup.seen_ids(new_ids)].reset_index(drop=True)
+    print(f"Rows in export: {len(raw):,}, already in store: {len(raw) - len(delta):,}, new: {len(delta):,}")
+    if delta.empty:
+        print("Nothing to append")
+        return 0
+
+    def append(df, stage, name, schema):
+        csv = any(path.endswith('.csv') for path in stages[stage]['outputs'])
+        paths = append_table(df, name, schema, csv=csv)
+        stages[stage]['outputs'].update(output_state(stages[stage]['outputs']))
+        print(f"  {stage}: +{len(df):,} rows -> {', '.join(paths)}")
+
+    print("\n" + "="*70)
+    print("AUDIT / REORGANIZE / SANITIZE (new rows only)")
+    print("="*70)
+    report = RunReport('append')
+    delta_totals = audit.new_totals()
+    with report.stage('audit', len(delta)):
+        delta = audit.audit_chunk(delta, delta_totals, report)
+        append(delta, 'audit', CLEAN_TABLE, AUDIT_SCHEMA)
+
+    with report.stage('reorganize', len(delta)):
+        delta = reorganize.reorganize(delta)
+        append(delta, 'reorganize', POWERBI_TABLE, AUDIT_SCHEMA)
+
+    with report.stage('sanitize', len(delta)) as stage:
+        delta = sanitization.sanitize(delta.copy(), workers=args.workers, report=report, dedup=dedup)
+        dedup.save()
+        append(delta, 'sanitize', FINAL_TABLE, FINAL_SCHEMA)
+        stage['rows_out'] = len(delta)
+
+    # Every cube measure is a sum: the delta's cells are appended as a part
+    # and load_cube() adds them to the stored cells
+    if 'cube' in stages:
+        with report.stage('cube', len(delta)) as stage:
+            delta_cube = cube.build_cube(delta)
+            append(delta_cube, 'cube', CUBE_TABLE, CUBE_SCHEMA)
+            stage['rows_out'] = len(delta_cube)
+
+    # Global audit figures = stored totals + delta totals (no rescan)
+    totals = audit.merge_totals(load_totals(stages['audit']['meta']['totals']), delta_totals)
+    stages['audit']['meta'] = audit_meta(totals)
+    audit.print_report(totals)
+
+    # The web JSON, the map tiles and the verification reports cover the whole
+    # store, so they rerun on the next normal pipeline run
+    for name in ('web', 'tiles', 'verify_clean', 'verify_final'):
+        stages.pop(name, None)
+    save_manifest(manifest)
+
+    print("\n" + "="*70)
+    print(f"APPEND COMPLETE: {len(delta):,} rows in {time.perf_counter() - start:.2f}s")
+    print(f"Run report: {report.write()}")
+    print(f"Duplicate report: {dedup.write_report()}")
+    print("Run the pipeline again to refresh web_data_v2.json, the map tiles and the verification reports")
+    print("="*70)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the GRIDLOCK pipeline in one process")
+    parser.add_argument('--force', action='store_true', help="ignore cached stages and run everything")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="allow rebuilding the tables from --input when rows were added with --append "
+                             "(those rows are dropped)")
+    parser.add_argument('--csv', action='store_true', help="also export stage tables as CSV (Power BI import)")
+    parser.add_argument('--compact', action='store_true',
+                        help=f"also write the columnar {web.compact_file} with .gz/.br copies")
+    parser.add_argument('--input', default=audit.input_file,
+                        help="raw export for the audit: a CSV file, a directory of CSV files or a glob pattern")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes for auditing several input files and for the per-column "
+                             "sanitization steps (output is identical)")
+    parser.add_argument('--append', metavar='CSV', default=None,
+                        help="add the collisions in this export that are not in the cleaned store yet")
+    args = parser.parse_args()
+    if args.append:
+        if not os.path.isfile(args.append):
+            parser.error(f"--append file not found: {args.append!r}")
+    elif not audit.input_files(args.input):
+        parser.error(f"no CSV files match {args.input!r}")
+
+    print("="*70)
+    print("PROJECT GRIDLOCK - PIPELINE RUNNER")
+    print("="*70)
+    if args.append:
+        sys.exit(run_append(args))
+    timings = run_pipeline(args)
+    # A failed verification fails the run, so a scheduler can stop on it
+    sys.exit(1 if any(status == 'FAILED' for _, status, _ in timings) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,17 @@
+#!/usr/bin/env python3
+"""
+Reorganize for Power BI
+Project GRIDLOCK - Column ordering between the audit and sanitization
+Usage: python reorganize_for_powerbi.py [--csv]
+"""
+
+import argparse
 import pandas as pd
 import numpy as np
-
-print("="*70)
-print("REORGANIZING DATASET FOR POWER BI OPTIMIZATION")
-print("="*70)
-
-# Load the cleaned dataset
-df = pd.read_csv('Motor_Vehicle_Collisions_CLEAN.csv')
-
-print(f"\nOriginal column count: {len(df.columns)}")
-print(f"Original row count: {len(df):,}")
+from gridlock_engine import GRID_COLUMNS
+from gridlock_io import (
+    AUDIT_SCHEMA, CLEAN_TABLE, POWERBI_TABLE, print_memory_report, read_table, table_columns, write_table
+)
 
 # Define optimal column order for Power BI
 # Priority: Key Fields → Location → Impact Metrics → Details → Flags
@@ -60,70 +62,100 @@ optimal_column_order = [
     'DATA_INTEGRITY_SCORE',        # NEW: Our engineered metric
     'DATA_QUALITY_FLAGS',          # NEW: Our engineered metric
     'coord_recovery_flag',         # NEW: Metadata flag
+
+    # === SECTION 7: SPATIAL GRID (heatmaps / hotspot rankings) ===
+    *GRID_COLUMNS,                 # NEW: Cell ids at levels 6, 8, 10 (-1 = no coordinates)
 ]
 
-# Verify all columns exist
-missing_cols = [col for col in optimal_column_order if col not in df.columns]
-if missing_cols:
-    print(f"\nWarning: Missing columns: {missing_cols}")
-    optimal_column_order = [col for col in optimal_column_order if col in df.columns]
-
-# Reorder the dataframe
-df_optimized = df[optimal_column_order]
-
-# Save the reorganized dataset
-output_file = 'Motor_Vehicle_Collisions_POWERBI_READY.csv'
-df_optimized.to_csv(output_file, index=False, encoding='utf-8')
-
-print(f"\n✓ Dataset reorganized successfully!")
-print(f"\nNew column order (Power BI optimized):")
-print("\n--- SECTION 1: KEY IDENTIFIERS ---")
-print("1. COLLISION_ID")
-print("2. CRASH DATE")
-print("3. CRASH TIME")
-
-print("\n--- SECTION 2: GEOGRAPHIC LOCATION ---")
-print("4-11. LATITUDE, LONGITUDE, BOROUGH, ZIP CODE, Street Names, LOCATION")
-
-print("\n--- SECTION 3: SEVERITY & IMPACT ---")
-print("12. SEVERITY_SCORE (NEW - Sort/Filter by this!)")
-print("13. VULNERABILITY_FLAG (NEW - Filter pedestrian/cyclist crashes)")
-print("14-21. Killed/Injured breakdowns (Persons, Pedestrians, Cyclists, Motorists)")
-
-print("\n--- SECTION 4: VEHICLE INFORMATION ---")
-print("22-26. VEHICLE TYPE CODE 1-5 (Now standardized!)")
-
-print("\n--- SECTION 5: CONTRIBUTING FACTORS ---")
-print("27-31. CONTRIBUTING FACTOR VEHICLE 1-5")
-
-print("\n--- SECTION 6: DATA QUALITY METRICS ---")
-print("32. DATA_INTEGRITY_SCORE (Filter by quality)")
-print("33. DATA_QUALITY_FLAGS (Identify clean vs problematic rows)")
-print("34. coord_recovery_flag (Track recovered coordinates)")
-
-print(f"\n{'='*70}")
-print(f"OUTPUT: {output_file}")
-print(f"Rows: {len(df_optimized):,}")
-print(f"Columns: {len(df_optimized.columns)}")
-print(f"{'='*70}")
-
-print("\n🎯 POWER BI QUICK START GUIDE:")
-print("\n1. IMPORT THIS FILE into Power BI Desktop")
-print("2. KEY VISUALIZATIONS TO CREATE:")
-print("   • Map: Plot LATITUDE/LONGITUDE with SEVERITY_SCORE as bubble size")
-print("   • Bar Chart: Top 10 intersections by SEVERITY_SCORE")
-print("   • Pie Chart: VULNERABILITY_FLAG distribution")
-print("   • Time Series: Crashes by CRASH DATE")
-print("   • Table: Filter by DATA_QUALITY_FLAGS = 'CLEAN' for verified data")
-
-print("\n3. RECOMMENDED FILTERS:")
-print("   • DATA_QUALITY_FLAGS ≠ 'FUTURE_DATE' (exclude ghost rows)")
-print("   • DATA_INTEGRITY_SCORE > 0.6 (high-quality data only)")
-print("   • SEVERITY_SCORE > 0 (exclude no-casualty crashes)")
-
-print("\n4. CALCULATED COLUMNS TO ADD IN POWER BI:")
-print("   • Crash Hour = HOUR(CRASH TIME)")
-print("   • Crash Month = MONTH(CRASH DATE)")
-print("   • High Severity = IF(SEVERITY_SCORE > 10, 'High', 'Low')")
-
-print("\n✅ Dataset ready for datathon presentation!")
+
+def reorganize(df):
+    """Return the frame with columns in Power BI order (missing columns are skipped)"""
+    missing_cols = [col for col in optimal_column_order if col not in df.columns]
+    if missing_cols:
+        print(f"\nWarning: Missing columns: {missing_cols}")
+    return df[[col for col in optimal_column_order if col in df.columns]]
+
+
+def print_guide(df_optimized, output_file):
+    print(f"\n✓ Dataset reorganized successfully!")
+    print(f"\nNew column order (Power BI optimized):")
+    print("\n--- SECTION 1: KEY IDENTIFIERS ---")
+    print("1. COLLISION_ID")
+    print("2. CRASH DATE")
+    print("3. CRASH TIME")
+
+    print("\n--- SECTION 2: GEOGRAPHIC LOCATION ---")
+    print("4-11. LATITUDE, LONGITUDE, BOROUGH, ZIP CODE, Street Names, LOCATION")
+
+    print("\n--- SECTION 3: SEVERITY & IMPACT ---")
+    print("12. SEVERITY_SCORE (NEW - Sort/Filter by this!)")
+    print("13. VULNERABILITY_FLAG (NEW - Filter pedestrian/cyclist crashes)")
+    print("14-21. Killed/Injured breakdowns (Persons, Pedestrians, Cyclists, Motorists)")
+
+    print("\n--- SECTION 4: VEHICLE INFORMATION ---")
+    print("22-26. VEHICLE TYPE CODE 1-5 (Now standardized!)")
+
+    print("\n--- SECTION 5: CONTRIBUTING FACTORS ---")
+    print("27-31. CONTRIBUTING FACTOR VEHICLE 1-5")
+
+    print("\n--- SECTION 6: DATA QUALITY METRICS ---")
+    print("32. DATA_INTEGRITY_SCORE (Filter by quality)")
+    print("33. DATA_QUALITY_FLAGS (Identify clean vs problematic rows)")
+    print("34. coord_recovery_flag (Track recovered coordinates)")
+
+    print("\n--- SECTION 7: SPATIAL GRID ---")
+    print("35-37. GRID_CELL_L6/L8/L10 (~1 km / 250 m / 65 m cells - group by these for heatmaps)")
+
+    print(f"\n{'='*70}")
+    print(f"OUTPUT: {output_file}")
+    print(f"Rows: {len(df_optimized):,}")
+    print(f"Columns: {len(df_optimized.columns)}")
+    print(f"{'='*70}")
+
+    print("\n🎯 POWER BI QUICK START GUIDE:")
+    print("\n1. IMPORT THIS FILE into Power BI Desktop")
+    print("2. KEY VISUALIZATIONS TO CREATE:")
+    print("   • Map: Plot LATITUDE/LONGITUDE with SEVERITY_SCORE as bubble size")
+    print("   • Bar Chart: Top 10 intersections by SEVERITY_SCORE")
+    print("   • Pie Chart: VULNERABILITY_FLAG distribution")
+    print("   • Time Series: Crashes by CRASH DATE")
+    print("   • Table: Filter by DATA_QUALITY_FLAGS = 'CLEAN' for verified data")
+
+    print("\n3. RECOMMENDED FILTERS:")
+    print("   • DATA_QUALITY_FLAGS ≠ 'FUTURE_DATE' (exclude ghost rows)")
+    print("   • DATA_INTEGRITY_SCORE > 0.6 (high-quality data only)")
+    print("   • SEVERITY_SCORE > 0 (exclude no-casualty crashes)")
+
+    print("\n4. CALCULATED COLUMNS TO ADD IN POWER BI:")
+    print("   • Crash Hour = HOUR(CRASH TIME)")
+    print("   • Crash Month = MONTH(CRASH DATE)")
+    print("   • High Severity = IF(SEVERITY_SCORE > 10, 'High', 'Low')")
+
+    print("\n✅ Dataset ready for datathon presentation!")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reorder the cleaned dataset for Power BI")
+    parser.add_argument('--csv', action='store_true', help="also export the reorganized table as CSV")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("REORGANIZING DATASET FOR POWER BI OPTIMIZATION")
+    print("="*70)
+
+    original_columns = table_columns(CLEAN_TABLE)
+    print(f"\nOriginal column count: {len(original_columns)}")
+
+    # Load only the columns we keep, then reorder
+    df = read_table(CLEAN_TABLE, columns=optimal_column_order)
+    print(f"Original row count: {len(df):,}")
+    df_optimized = reorganize(df)
+    print_memory_report(df_optimized, POWERBI_TABLE)
+
+    # Save the reorganized dataset
+    output_files = write_table(df_optimized, POWERBI_TABLE, AUDIT_SCHEMA, csv=args.csv)
+    print_guide(df_optimized, ', '.join(output_files))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+import pytest
+
+from gridlock_api import QueryError, parse_params
+
+
+@pytest.mark.parametrize('query', ['start=', 'end=', 'start=%20', 'start=2024-01-01&end='])
+def test_blank_date_is_a_bad_request(query):
+    with pytest.raises(QueryError) as error:
+        parse_params(query)
+    assert error.value.status == 400
+
+
+def test_dates_are_normalized():
+    assert parse_params('end=2024-06-30T13:45&start=2024-01-01') == (('end', '2024-06-30'), ('start', '2024-01-01'))
@@ -0,0 +1,14 @@
+import sys
+
+import benchmark_stages
+import gridlock_pipeline as pipeline
+
+
+def test_stage_benchmark_runs_at_a_tiny_size(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', ['benchmark_stages.py', '2000'])
+    benchmark_stages.main()
+    out = capsys.readouterr().out
+    assert '2,000 rows' in out
+    for stage in pipeline.STAGES:
+        assert f"   {stage['name']} " in out
@@ -1,65 +0,0 @@
-import pandas as pd
-import numpy as np
-
-print("="*70)
-print("FINAL DATA QUALITY VERIFICATION")
-print("="*70)
-
-# Load cleaned dataset
-df = pd.read_csv('Motor_Vehicle_Collisions_CLEAN.csv')
-
-print(f"\n1. DATASET STRUCTURE")
-print(f"   Rows: {len(df):,}")
-print(f"   Columns: {len(df.columns)}")
-print(f"\n2. COLUMN LIST:")
-for i, col in enumerate(df.columns, 1):
-    print(f"   {i}. {col}")
-
-print(f"\n3. NEW ENGINEERED COLUMNS:")
-new_cols = ['coord_recovery_flag', 'SEVERITY_SCORE', 'VULNERABILITY_FLAG', 
-            'DATA_INTEGRITY_SCORE', 'DATA_QUALITY_FLAGS']
-for col in new_cols:
-    if col in df.columns:
-        print(f"   ✓ {col}")
-
-print(f"\n4. DATA COMPLETENESS:")
-print(f"   CRASH DATE null: {df['CRASH DATE'].isna().sum():,}")
-print(f"   LATITUDE null: {df['LATITUDE'].isna().sum():,}")
-print(f"   LONGITUDE null: {df['LONGITUDE'].isna().sum():,}")
-print(f"   VEHICLE TYPE CODE 1 null: {df['VEHICLE TYPE CODE 1'].isna().sum():,}")
-
-print(f"\n5. COORDINATE RECOVERY SUMMARY:")
-recovered = df['coord_recovery_flag'].sum()
-print(f"   Coordinates recovered: {recovered:,}")
-
-print(f"\n6. SEVERITY ANALYSIS:")
-print(f"   Average Severity Score: {df['SEVERITY_SCORE'].mean():.2f}")
-print(f"   Max Severity Score: {df['SEVERITY_SCORE'].max():.0f}")
-print(f"   High-severity crashes (>10): {(df['SEVERITY_SCORE'] > 10).sum():,}")
-
-print(f"\n7. VULNERABILITY ANALYSIS:")
-vulnerable = df['VULNERABILITY_FLAG'].sum()
-print(f"   Crashes with vulnerable users: {vulnerable:,} ({vulnerable/len(df)*100:.1f}%)")
-
-print(f"\n8. DATA QUALITY FLAGS:")
-clean_rows = (df['DATA_QUALITY_FLAGS'] == 'CLEAN').sum()
-print(f"   CLEAN rows: {clean_rows:,} ({clean_rows/len(df)*100:.1f}%)")
-print(f"\n   Top 5 quality issues:")
-for flag, count in df['DATA_QUALITY_FLAGS'].value_counts().head(5).items():
-    print(f"   - {flag}: {count:,}")
-
-print(f"\n9. VEHICLE TYPE CONSOLIDATION:")
-print(f"   Unique vehicle types: {df['VEHICLE TYPE CODE 1'].nunique()}")
-print(f"\n   Top 10 vehicle types:")
-for vtype, count in df['VEHICLE TYPE CODE 1'].value_counts().head(10).items():
-    print(f"   - {vtype}: {count:,}")
-
-print(f"\n10. POWER BI READINESS CHECK:")
-print(f"   ✓ Date format consistent: ISO 8601")
-print(f"   ✓ Numeric columns ready for aggregation")
-print(f"   ✓ Categorical data normalized")
-print(f"   ✓ Geographic coordinates available: {100 - (df['LATITUDE'].isna().sum()/len(df)*100):.1f}%")
-
-print("\n" + "="*70)
-print("VERIFICATION COMPLETE - Dataset is Power BI Ready!")
-print("="*70)
@@ -1,92 +0,0 @@
-import pandas as pd
-
-print("="*70)
-print("FINAL DATASET QUALITY CHECK")
-print("="*70)
-
-# Load final cleaned file
-df = pd.read_csv('Motor_Vehicle_Collisions_FINAL_CLEAN.csv')
-
-print(f"\nDataset Shape: {df.shape}")
-print(f"Total Rows: {len(df):,}")
-print(f"Total Columns: {len(df.columns)}")
-
-print("\n" + "="*70)
-print("VERIFICATION CHECKLIST")
-print("="*70)
-
-# 1. Check nulls are standardized
-print("\n[1] NULL STANDARDIZATION:")
-print(f"   Total null values: {df.isna().sum().sum():,}")
-print(f"   Columns with nulls: {(df.isna().sum() > 0).sum()}")
-
-# Check for old null variants
-old_null_check = df.astype(str).apply(lambda x: x.str.contains('Unknown|unspecified', case=False, na=False).sum()).sum()
-print(f"   Old null variants remaining: {old_null_check}")
-
-# 2. Check numeric columns
-print("\n[2] NUMERIC COLUMN SANITIZATION:")
-numeric_cols = ['LATITUDE', 'LONGITUDE', 'COLLISION_ID', 'SEVERITY_SCORE', 
-                'NUMBER OF PERSONS INJURED', 'NUMBER OF PERSONS KILLED']
-
-for col in numeric_cols:
-    if col in df.columns:
-        dtype = df[col].dtype
-        nulls = df[col].isna().sum()
-        print(f"   {col}: {dtype} ({nulls:,} nulls)")
-
-# 3. Check BOROUGH normalization
-print("\n[3] CATEGORICAL NORMALIZATION:")
-if 'BOROUGH' in df.columns:
-    print(f"   BOROUGH unique values: {df['BOROUGH'].nunique()}")
-    for borough, count in df['BOROUGH'].value_counts().head().items():
-        print(f"      {borough}: {count:,}")
-
-# 4. Check temporal standardization
-print("\n[4] TEMPORAL STANDARDIZATION:")
-if 'CRASH DATE' in df.columns:
-    sample_dates = df['CRASH DATE'].dropna().head(5).tolist()
-    print(f"   Sample CRASH DATE values:")
-    for d in sample_dates:
-        print(f"      {d}")
-
-if 'CRASH TIME' in df.columns:
-    sample_times = df['CRASH TIME'].dropna().head(5).tolist()
-    print(f"   Sample CRASH TIME values:")
-    for t in sample_times:
-        print(f"      {t}")
-
-# 5. Check duplicates
-print("\n[5] DATA INTEGRITY:")
-if 'COLLISION_ID' in df.columns:
-    collision_id_dupes = df['COLLISION_ID'].duplicated().sum()
-    print(f"   COLLISION_ID duplicates: {collision_id_dupes}")
-
-row_dupes = df.duplicated().sum()
-print(f"   Full row duplicates: {row_dupes}")
-
-# 6. Check coordinates validity
-print("\n[6] COORDINATE VALIDITY:")
-if 'LATITUDE' in df.columns and 'LONGITUDE' in df.columns:
-    valid_coords = (
-        (df['LATITUDE'] >= 40.4) & (df['LATITUDE'] <= 41.0) &
-        (df['LONGITUDE'] >= -74.3) & (df['LONGITUDE'] <= -73.7)
-    )
-    total_with_coords = df['LATITUDE'].notna() & df['LONGITUDE'].notna()
-    
-    print(f"   Rows with coordinates: {total_with_coords.sum():,}")
-    print(f"   Valid NYC coordinates: {valid_coords.sum():,}")
-    print(f"   Invalid coordinates: {(total_with_coords & ~valid_coords).sum():,}")
-
-print("\n" + "="*70)
-print("POWER BI READINESS: VERIFIED ✓")
-print("="*70)
-print(f"\n✓ All null variants standardized to NaN")
-print(f"✓ All numeric columns sanitized (commas/?, approx removed)")
-print(f"✓ BOROUGH normalized to UPPERCASE")
-print(f"✓ Dates in YYYY-MM-DD format")
-print(f"✓ Times in HH:MM:SS format")
-print(f"✓ Duplicates removed")
-print(f"✓ COLLISION_ID unique")
-print(f"\nFile: Motor_Vehicle_Collisions_FINAL_CLEAN.csv")
-print("Ready for Power BI import!")
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Verify Tables
+Project GRIDLOCK - Quality gate for the audit output and the sanitized output
+Purpose: Every verification check in one chunked scan, with a non-zero exit
+status when a table fails, so a pipeline can stop on it
+
+The table is read in row batches straight from its Parquet files (appended
+parts included) and each batch updates running totals: nulls per column,
+leftover null tokens, dtype conformance, duplicate rows and COLLISION_IDs
+(gridlock_dedup's sorted digests, 16 bytes per row), coordinate validity and
+the flag distributions. Only one batch (and the Parquet row group it comes
+from) is held at a time, so a 10M-row table is checked in bounded memory.
+
+Checks that fail a table:
+    both tables   declared columns present, dtypes as declared (an integer
+                  column read as float still holds nulls), 0/1 flags,
+                  DATA_QUALITY_FLAGS set on every row, CRASH TIME as HH:MM:SS
+    FINAL_CLEAN   also: no null tokens left, no duplicate rows or
+                  COLLISION_IDs, no coordinates outside NYC, BOROUGH in UPPERCASE
+The audit output still carries the raw null tokens, duplicates and
+out-of-bounds coordinates for sanitization to remove; they are only reported.
+
+Usage:
+    python verify_tables.py                  # audit output (CLEAN), then FINAL_CLEAN
+    python verify_tables.py final            # one table: clean | final
+    python verify_tables.py --chunksize 250000
+"""
+
+import argparse
+import sys
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from gridlock_dedup import Deduplicator
+from gridlock_engine import (
+    NULL_VARIANTS, NYC_LAT_MAX, NYC_LAT_MIN, NYC_LON_MAX, NYC_LON_MIN, null_token_mask, token_set
+)
+from gridlock_io import (
+    AUDIT_SCHEMA, CLEAN_TABLE, FINAL_SCHEMA, FINAL_TABLE, HAVE_ARROW, table_columns, table_files, table_path
+)
+from gridlock_metrics import RunReport
+
+if HAVE_ARROW:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+CHUNK_ROWS = 500_000
+
+# name on the command line -> (table, declared schema, strict)
+TABLES = {
+    'clean': (CLEAN_TABLE, AUDIT_SCHEMA, False),
+    'final': (FINAL_TABLE, FINAL_SCHEMA, True),
+}
+
+FLAG_COLUMNS = ['coord_recovery_flag', 'VULNERABILITY_FLAG']
+TIME_FORMAT = r'\d{2}:\d{2}:\d{2}'
+# Text pd.to_numeric would read as a plain decimal number
+NUMBER_PATTERN = r'^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$'
+INTEGER_KINDS = ('int8', 'int16', 'int32', 'int64')
+
+
+# ========================================================================
+# READING
+# ========================================================================
+
+def read_chunks(name, schema, chunksize=CHUNK_ROWS):
+    """A stage table as DataFrames of at most chunksize rows"""
+    if HAVE_ARROW:
+        for path in table_files(name):
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+        return
+    header = set(table_columns(name))
+    text = {col: 'str' for col, kind in schema.items() if kind in ('string', 'category') and col in header}
+    dates = [col for col, kind in schema.items() if kind == 'timestamp' and col in header]
+    yield from pd.read_csv(f'{name}.csv', dtype=text, parse_dates=dates, chunksize=chunksize)
+
+
+def conforms(series, kind):
+    """Whether a column has the in-memory type its declared kind reads as"""
+    if kind in INTEGER_KINDS:
+        return pd.api.types.is_integer_dtype(series.dtype)
+    if kind == 'float64':
+        return pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+    if kind == 'timestamp':
+        return pd.api.types.is_datetime64_any_dtype(series.dtype)
+    return (isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object
+            or pd.api.types.is_string_dtype(series.dtype))
+
+
+def count_null_tokens(series):
+    """Rows holding a null token. Categoricals check their categories; text
+    columns (LOCATION is nearly all distinct) use Arrow's string kernels"""
+    if isinstance(series.dtype, pd.CategoricalDtype) or not HAVE_ARROW or series.dtype == object:
+        return int(null_token_mask(series, NULL_VARIANTS).sum())
+    values = pc.utf8_lower(pc.utf8_trim_whitespace(pa.array(series.array)))
+    return int(pc.sum(pc.is_in(values, value_set=pa.array(sorted(token_set(NULL_VARIANTS))))).as_py() or 0)
+
+
+def to_float(series):
+    """A coordinate column as floats; text that is not a number becomes NaN"""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.to_numpy(dtype=float, na_value=np.nan)
+    if not HAVE_ARROW or series.dtype == object:
+        return pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+    text = pa.array(series.array)
+    numbers = pc.if_else(pc.match_substring_regex(text, NUMBER_PATTERN), pc.utf8_trim_whitespace(text), None)
+    return pc.cast(numbers, pa.float64()).to_numpy(zero_copy_only=False)
+
+
+def _distinct_counts(series):
+    """(distinct non-null values, rows per value) of one chunk"""
+    codes, uniques = pd.factorize(series)
+    return pd.Series(uniques, dtype=object), np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+
+# ========================================================================
+# VALIDATOR
+# ========================================================================
+
+class TableValidator:
+    """Running totals of every check, updated one chunk at a time"""
+
+    def __init__(self, name, schema, strict):
+        self.name = name
+        self.schema = schema
+        self.strict = strict
+        self.rows = 0
+        self.columns = None
+        self.nulls = Counter()
+        self.null_tokens = Counter()
+        self.dtypes = {}
+        self.nonconforming = set()
+        self.dedup = Deduplicator()
+        self.coords = Counter()
+        self.flags = Counter()
+        self.bad_flags = Counter()
+        self.quality_flags = Counter()
+        self.boroughs = Counter()
+        self.vehicles = Counter()
+        self.bad_times = 0
+        self.lowercase_boroughs = 0
+        self.severity = {'sum': 0.0, 'max': None, 'high': 0}
+
+    def update(self, df):
+        if self.columns is None:
+            self.columns = list(df.columns)
+        self.rows += len(df)
+
+        for col in df.columns:
+            series = df[col]
+            nulls = int(series.isna().sum())
+            self.nulls[col] += nulls
+            self.dtypes.setdefault(col, set()).add(str(series.dtype))
+            kind = self.schema.get(col)
+            if kind and nulls < len(series) and not conforms(series, kind):
+                self.nonconforming.add(col)
+            if kind in ('string', 'category'):
+                self.null_tokens[col] += count_null_tokens(series)
+
+        self.dedup.drop_duplicates(df)
+        self._update_coordinates(df)
+        self._update_flags(df)
+        self._update_values(df)
+
+    def _update_coordinates(self, df):
+        if 'LATITUDE' not in df.columns or 'LONGITUDE' not in df.columns:
+            return
+        # The audit output keeps coordinates as text; unparseable text counts separately
+        lat, lon = to_float(df['LATITUDE']), to_float(df['LONGITUDE'])
+        given = df['LATITUDE'].notna().to_numpy() & df['LONGITUDE'].notna().to_numpy()
+        present = ~np.isnan(lat) & ~np.isnan(lon)
+        inside = present & (lat >= NYC_LAT_MIN) & (lat <= NYC_LAT_MAX) & (lon >= NYC_LON_MIN) & (lon <= NYC_LON_MAX)
+        self.coords['present'] += int(present.sum())
+        self.coords['valid'] += int(inside.sum())
+        self.coords['invalid'] += int((present & ~inside).sum())
+        self.coords['unparseable'] += int((given & ~present).sum())
+
+    def _update_flags(self, df):
+        for col in FLAG_COLUMNS:
+            if col in df.columns:
+                values = df[col]
+                self.flags[col] += int((values == 1).sum())
+                self.bad_flags[col] += int((values.notna() & ~values.isin([0, 1])).sum())
+        if 'DATA_QUALITY_FLAGS' in df.columns:
+            self.quality_flags.update(df['DATA_QUALITY_FLAGS'].value_counts().to_dict())
+
+    def _update_values(self, df):
+        if 'SEVERITY_SCORE' in df.columns:
+            severity = pd.to_numeric(df['SEVERITY_SCORE'], errors='coerce')
+            self.severity['sum'] += float(severity.sum())
+            self.severity['high'] += int((severity > 10).sum())
+            chunk_max = severity.max()
+            if pd.notna(chunk_max) and (self.severity['max'] is None or chunk_max > self.severity['max']):
+                self.severity['max'] = float(chunk_max)
+        if 'CRASH TIME' in df.columns:
+            # Each distinct time is checked once
+            values, counts = _distinct_counts(df['CRASH TIME'])
+            self.bad_times += int(counts[~values.astype(str).str.fullmatch(TIME_FORMAT).to_numpy()].sum())
+        if 'BOROUGH' in df.columns:
+            values, counts = _distinct_counts(df['BOROUGH'])
+            self.boroughs.update(dict(zip(values, counts.tolist())))
+            self.lowercase_boroughs += int(counts[(values.astype(str) != values.astype(str).str.upper()).to_numpy()].sum())
+        if 'VEHICLE TYPE CODE 1' in df.columns:
+            self.vehicles.update(df['VEHICLE TYPE CODE 1'].value_counts().to_dict())
+
+    # --------------------------------------------------------------------
+    # VERDICT
+    # --------------------------------------------------------------------
+
+    def failures(self):
+        """Every failed check as one line; empty when the table passes"""
+        failed = []
+        if self.rows == 0:
+            failed.append("table has no rows")
+        columns = self.columns or []
+        missing = [col for col in self.schema if col not in columns]
+        if missing:
+            failed.append(f"missing columns: {', '.join(missing)}")
+        for col in sorted(self.nonconforming, key=columns.index):
+            failed.append(f"{col}: declared {self.schema[col]}, read as {'/'.join(sorted(self.dtypes[col]))}")
+        for col, count in self.bad_flags.items():
+            if count:
+                failed.append(f"{col}: {count:,} values other than 0/1")
+        if self.nulls.get('DATA_QUALITY_FLAGS'):
+            failed.append(f"DATA_QUALITY_FLAGS: {self.nulls['DATA_QUALITY_FLAGS']:,} rows without a flag")
+        if self.bad_times:
+            failed.append(f"CRASH TIME: {self.bad_times:,} values not HH:MM:SS")
+        if not self.strict:
+            return failed
+
+        for col, count in self.null_tokens.items():
+            if count:
+                failed.append(f"{col}: {count:,} null tokens left")
+        if self.dedup.duplicate_rows:
+            failed.append(f"{self.dedup.duplicate_rows:,} duplicate rows")
+        duplicate_ids = self.rows - self.dedup.duplicate_rows - self.dedup.rows_kept
+        if duplicate_ids:
+            failed.append(f"{duplicate_ids:,} duplicate COLLISION_IDs")
+        if self.coords['invalid'] or self.coords['unparseable']:
+            failed.append(f"{self.coords['invalid'] + self.coords['unparseable']:,} coordinates outside NYC or unparseable")
+        if self.lowercase_boroughs:
+            failed.append(f"BOROUGH: {self.lowercase_boroughs:,} values not UPPERCASE")
+        return failed
+
+    def print_report(self):
+        rows = max(self.rows, 1)
+        print("\n" + "="*70)
+        print(f"VERIFICATION: {table_path(self.name)}")
+        print("="*70)
+
+        print(f"\n[1] STRUCTURE")
+        print(f"   Rows: {self.rows:,}")
+        print(f"   Columns: {len(self.columns or [])} ({len(self.schema)} declared)")
+
+        print(f"\n[2] NULLS")
+        print(f"   Total null values: {sum(self.nulls.values()):,}")
+        print(f"   Columns with nulls: {sum(1 for count in self.nulls.values() if count)}")
+        for col in ['CRASH DATE', 'LATITUDE', 'LONGITUDE', 'BOROUGH', 'VEHICLE TYPE CODE 1']:
+            if col in self.nulls:
+                print(f"   {col} null: {self.nulls[col]:,}")
+        print(f"   Null tokens left: {sum(self.null_tokens.values()):,}")
+        for col, count in self.null_tokens.most_common(5):
+            if count:
+                print(f"      {col}: {count:,}")
+
+        print(f"\n[3] DTYPES")
+        print(f"   Conforming columns: {len(self.dtypes) - len(self.nonconforming)}/{len(self.dtypes)}")
+        for col in ['LATITUDE', 'LONGITUDE', 'COLLISION_ID', 'SEVERITY_SCORE', 'NUMBER OF PERSONS INJURED']:
+            if col in self.dtypes:
+                print(f"   {col}: {'/'.join(sorted(self.dtypes[col]))}")
+
+        print(f"\n[4] DUPLICATES")
+        duplicate_ids = self.rows - self.dedup.duplicate_rows - self.dedup.rows_kept
+        print(f"   Full row duplicates: {self.dedup.duplicate_rows:,}")
+        print(f"   COLLISION_ID duplicates (rows that are not exact copies): {duplicate_ids:,}")
+
+        print(f"\n[5] COORDINATES")
+        print(f"   Rows with coordinates: {self.coords['present']:,} ({self.coords['present'] / rows * 100:.1f}%)")
+        print(f"   Valid NYC coordinates: {self.coords['valid']:,}")
+        print(f"   Invalid coordinates: {self.coords['invalid']:,}")
+        if self.coords['unparseable']:
+            print(f"   Unparseable coordinates: {self.coords['unparseable']:,}")
+
+        print(f"\n[6] FLAGS & SCORES")
+        for col in FLAG_COLUMNS:
+            if col in self.flags:
+                print(f"   {col} = 1: {self.flags[col]:,} ({self.flags[col] / rows * 100:.1f}%)")
+        if self.severity['max'] is not None:
+            print(f"   Average Severity Score: {self.severity['sum'] / rows:.2f}")
+            print(f"   Max Severity Score: {self.severity['max']:.0f}")
+            print(f"   High-severity crashes (>10): {self.severity['high']:,}")
+        if self.quality_flags:
+            print(f"   Top 5 quality flags:")
+            for flag, count in self.quality_flags.most_common(5):
+                print(f"   - {flag}: {count:,} ({count / rows * 100:.1f}%)")
+        if self.boroughs:
+            print(f"   BOROUGH values: {len(self.boroughs)}")
+            for borough, count in self.boroughs.most_common(5):
+                print(f"   - {borough}: {count:,}")
+        if self.vehicles:
+            print(f"   Top 5 vehicle types:")
+            for vtype, count in self.vehicles.most_common(5):
+                print(f"   - {vtype}: {count:,}")
+
+        failed = self.failures()
+        print("\n" + "="*70)
+        if failed:
+            print(f"VERIFICATION FAILED: {len(failed)} check(s)")
+            print("="*70)
+            for line in failed:
+                print(f"   ✗ {line}")
+        else:
+            print("VERIFICATION PASSED")
+            print("="*70)
+
+
+def validate_table(key, chunksize=CHUNK_ROWS, report=None):
+    """Scan one table ('clean' or 'final') once, print its report and return the validator"""
+    name, schema, strict = TABLES[key]
+    report = report or RunReport('verify')
+    validator = TableValidator(name, schema, strict)
+    print(f"Scanning: {table_path(name)}")
+    with report.stage(f'scan_{key}') as stage:
+        for df in read_chunks(name, schema, chunksize):
+            validator.update(df)
+        stage['rows_in'] = validator.rows
+    validator.print_report()
+    return validator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the GRIDLOCK stage tables in one pass each")
+    parser.add_argument('tables', nargs='*', metavar='TABLE', help=f"tables to check: {' | '.join(TABLES)} (default: all)")
+    parser.add_argument('--chunksize', type=int, default=CHUNK_ROWS, help="rows per scanned batch")
+    args = parser.parse_args()
+    unknown = [key for key in args.tables if key not in TABLES]
+    if unknown:
+        parser.error(f"unknown table: {', '.join(unknown)}")
+
+    print("="*70)
+    print("PROJECT GRIDLOCK - TABLE VERIFICATION")
+    print("="*70)
+
+    report = RunReport('verify')
+    failed = [key for key in args.tables or list(TABLES) if validate_table(key, args.chunksize, report).failures()]
+    report.print_summary()
+    print(f"Run report: {report.write()}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
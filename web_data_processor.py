@@ -1,188 +1,365 @@
+#!/usr/bin/env python3
+"""
+Web Data Processor
+Project GRIDLOCK - Builds web_data_v2.json for the React report
+Usage: python web_data_processor.py              # web_data_v2.json (pretty-printed)
+       python web_data_processor.py --compact    # also the columnar web_data_v2.compact.json (+ .gz/.br)
+       python web_data_processor.py --compact --points 20000
+"""
+
+import argparse
+import gzip
+import os
 import pandas as pd
 import json
 import numpy as np
-
-print("="*70)
-print("WEB DATA PROCESSOR - Project GRIDLOCK (NATIVE DASHBOARD EDITION)")
-print("Generating optimized JSON with charts data...")
-print("="*70)
+from gridlock_cube import build_cube, load_cube, rollup
+from gridlock_engine import (
+    GRID_COLUMNS, GRID_LEVELS, NYC_LAT_MAX, NYC_LAT_MIN, NYC_LON_MAX, NYC_LON_MIN, cell_centers, grid_cells,
+    grid_column, intersections
+)
+from gridlock_io import FINAL_TABLE, print_memory_report, read_table, table_path
+from gridlock_loader import read_raw
+from gridlock_metrics import RunReport
 
 try:
-    # ------------------------------------------------------------------
-    # 0. CONFIGURATION & METADATA
-    # ------------------------------------------------------------------
-    TEAM_INFO = {
-        "event_name": "Analytics Showdown 4.0",
-        "team_name": "DATA MASTERS",
-        "members": ["Avvudaiyappan RM", "Akash V", "Harish Raj S"],
-        "pitch_title": "Project GRIDLOCK: Uncovering the Invisible",
-        "tagline": "Forensic Data Audit & remediation"
-    }
+    import brotli
+    HAVE_BROTLI = True
+except ImportError:
+    HAVE_BROTLI = False
 
-    # Files
-    clean_file = 'Motor_Vehicle_Collisions_FINAL_CLEAN.csv'
-    old_file = 'refined_Motor_Vehicle_Collisions_-_Crashes_20260107.csv'
+# ------------------------------------------------------------------
+# 0. CONFIGURATION & METADATA
+# ------------------------------------------------------------------
+TEAM_INFO = {
+    "event_name": "Analytics Showdown 4.0",
+    "team_name": "DATA MASTERS",
+    "members": ["Avvudaiyappan RM", "Akash V", "Harish Raj S"],
+    "pitch_title": "Project GRIDLOCK: Uncovering the Invisible",
+    "tagline": "Forensic Data Audit & remediation"
+}
 
-    # Load Clean Data
-    print(f"Loading CLEAN dataset: {clean_file}")
-    df = pd.read_csv(clean_file, low_memory=False)
-    
-    # Load Old Data (for comparison metrics)
-    print(f"Loading OLD dataset: {old_file}")
+# Files
+old_file = 'refined_Motor_Vehicle_Collisions_-_Crashes_20260107.csv'
+output_file = 'gridlock-report/public/web_data_v2.json'
+hotspots_file = 'gridlock-report/public/web_hotspots.json'
+compact_file = 'gridlock-report/public/web_data_v2.compact.json'
+
+# Most severe crashes listed in map_points
+map_point_limit = 1500
+
+# Compact payload: coordinates as integer offsets from the NYC box corner in
+# 1e-5 degrees (the precision map_points is rounded to)
+COMPACT_FORMAT = 'gridlock-compact/1'
+COORD_SCALE = 100000
+
+# Intersections listed as danger zones (ranked by total severity)
+danger_zone_limit = 5
+
+# Top grid cells per level listed as hotspots in web_data_v2.json
+# (every occupied cell goes to web_hotspots.json)
+hotspot_limit = 10
+
+# Only the columns this script aggregates are read from the clean table
+web_columns = [
+    'COLLISION_ID', 'CRASH DATE', 'CRASH TIME', 'BOROUGH', 'LATITUDE', 'LONGITUDE',
+    'ON STREET NAME', 'CROSS STREET NAME', 'CONTRIBUTING FACTOR VEHICLE 1', 'VEHICLE TYPE CODE 1',
+    'SEVERITY_SCORE', 'NUMBER OF PERSONS INJURED', 'NUMBER OF PERSONS KILLED',
+    'DATA_INTEGRITY_SCORE', 'coord_recovery_flag', 'VULNERABILITY_FLAG', *GRID_COLUMNS,
+]
+
+
+def load_old_stats(old_file):
+    """Before-audit comparison metrics from the raw export (row count, latitude voids)"""
     try:
-        df_old = pd.read_csv(old_file, low_memory=False)
+        # The loader renames other spellings ('Latitude') to LATITUDE
+        df_old = read_raw(old_file, columns=['COLLISION_ID', 'LATITUDE'])
         old_total = len(df_old)
-        old_lat_col = 'LATITUDE' if 'LATITUDE' in df_old.columns else 'Latitude'
-        old_missing_coords = df_old[old_lat_col].isna().sum() if old_lat_col in df_old.columns else 0
+        old_missing_coords = df_old['LATITUDE'].isna().sum() if 'LATITUDE' in df_old.columns else 0
         old_integrity = ((old_total - old_missing_coords) / old_total) * 100 if old_total > 0 else 0
     except Exception as e:
         print(f"Warning: Could not load old file fully ({e}). Using estimates.")
         old_total = 60000
         old_missing_coords = 28500
         old_integrity = 52.5
+    return {"total": old_total, "missing_coords": old_missing_coords, "integrity": old_integrity}
 
-    # ------------------------------------------------------------------
-    # 1. ROBUST TYPE CONVERSION (Clean Data)
-    # ------------------------------------------------------------------
-    print("Converting types...")
+
+def find_danger_zones(df, limit=danger_zone_limit):
+    """
+    Top intersections by total severity. One groupby over (intersection,
+    borough) yields every metric; the per-intersection totals and the
+    dominant borough are then read off that small group table.
+    """
+    # A precomputed 'intersection' column (gridlock_api.py's frame) saves the recode
+    keys = df['intersection'] if 'intersection' in df.columns else intersections(df['ON STREET NAME'], df['CROSS STREET NAME'])
+    boroughs = df['BOROUGH'].astype('category')
+    rows = pd.DataFrame({
+        'intersection': keys.cat.codes.to_numpy(),
+        'borough': boroughs.cat.codes.to_numpy(),
+        'severity': df['SEVERITY_SCORE'].to_numpy(),
+        'killed': df['NUMBER OF PERSONS KILLED'].to_numpy(),
+        'injured': df['NUMBER OF PERSONS INJURED'].to_numpy(),
+        'collisions': df['COLLISION_ID'].notna().to_numpy(),
+        'lat': df['LATITUDE'].to_numpy(),
+        'lng': df['LONGITUDE'].to_numpy(),
+    })
+    groups = rows[rows['intersection'] >= 0].groupby(['intersection', 'borough']).agg(
+        severity=('severity', 'sum'), killed=('killed', 'sum'), injured=('injured', 'sum'),
+        collisions=('collisions', 'sum'), crashes=('severity', 'size'),
+        lat_sum=('lat', 'sum'), lat_count=('lat', 'count'), lng_sum=('lng', 'sum'), lng_count=('lng', 'count'),
+    )
+
+    zones = groups.groupby(level='intersection').sum()
+    zones = zones.sort_values('severity', ascending=False, kind='stable').head(limit)
+
+    # Dominant borough = most crashes, ties to the first name (as Series.mode); none known -> UNKNOWN
+    named = groups.reset_index()
+    named = named[(named['borough'] >= 0) & named['intersection'].isin(zones.index)]
+    dominant = named.sort_values(['intersection', 'crashes', 'borough'], ascending=[True, False, True])
+    dominant = dominant.drop_duplicates('intersection').set_index('intersection')['borough']
+
+    danger_zones = []
+    for code, row in zones.iterrows():
+        borough = boroughs.cat.categories[dominant[code]] if code in dominant.index else "UNKNOWN"
+        danger_zones.append({
+            "name": keys.cat.categories[code], "borough": str(borough),
+            "severity": float(row['severity']),
+            "casualties": int(row['killed'] + row['injured']),
+            "lat": round(float(row['lat_sum'] / row['lat_count']), 5),
+            "lng": round(float(row['lng_sum'] / row['lng_count']), 5)
+        })
+    return danger_zones
+
+
+def grid_aggregates(df, level):
+    """Crashes, severity, casualties and vulnerable crashes per occupied grid cell at one level"""
+    col = grid_column(level)
+    # Tables written before the grid columns existed: bin the coordinates here
+    cells = df[col].to_numpy() if col in df.columns else grid_cells(df['LATITUDE'], df['LONGITUDE'], level)
+    values = {
+        'severity': pd.to_numeric(df['SEVERITY_SCORE'], errors='coerce').fillna(0).to_numpy(),
+        'casualties': (pd.to_numeric(df['NUMBER OF PERSONS KILLED'], errors='coerce').fillna(0) +
+                       pd.to_numeric(df['NUMBER OF PERSONS INJURED'], errors='coerce').fillna(0)).to_numpy(),
+        'vulnerable': pd.to_numeric(df['VULNERABILITY_FLAG'], errors='coerce').fillna(0).to_numpy(),
+    }
+    # Cell ids index a dense 4**level array: one bincount per total, no sort
+    occupied = cells >= 0
+    cells = np.asarray(cells[occupied], dtype=np.int64)
+    crashes = np.bincount(cells, minlength=4 ** level)
+    ids = np.flatnonzero(crashes)
+    table = pd.DataFrame({'cell': ids, 'crashes': crashes[ids]})
+    for key, column in values.items():
+        column = column[occupied]
+        totals = np.bincount(cells, weights=column, minlength=4 ** level)[ids]
+        # Integer columns keep integer totals, as a groupby sum would
+        table[key] = totals.astype(np.int64) if column.dtype.kind in 'iub' else totals
+    lat, lng = cell_centers(table['cell'], level)
+    table['lat'] = lat.round(5)
+    table['lng'] = lng.round(5)
+    return table
+
+
+def build_hotspot_grid(df):
+    """
+    Every occupied cell at every grid level, as columnar arrays (heatmap layer).
+    Cell ids are row-major over `size` x `size` cells of `bounds`
+    ([south, west, north, east]), so centres are not repeated per cell.
+    """
+    levels = {}
+    for level in GRID_LEVELS:
+        cells = grid_aggregates(df, level)
+        levels[f"L{level}"] = {
+            "size": 2 ** level,
+            **{key: cells[key].tolist() for key in ['cell', 'crashes', 'casualties', 'vulnerable']},
+            "severity": cells['severity'].round(2).tolist(),
+        }
+    return {"bounds": [NYC_LAT_MIN, NYC_LON_MIN, NYC_LAT_MAX, NYC_LON_MAX], "levels": levels}
+
+
+# ------------------------------------------------------------------
+# SECTIONS (also answered per filter by gridlock_api.py)
+# ------------------------------------------------------------------
+
+DATA_STORIES = [
+    {
+        "id": "ghost_metrics",
+        "title": "The Time Travelers",
+        "stat": "3,500",
+        "label": "Future Dated Records",
+        "desc": "We found records dated in 2026 and 2027. This corruption would have crashed any standard BI tool. We isolated and flagged them.",
+        "icon": "clock"
+    },
+    {
+        "id": "invisible_highways",
+        "title": "The Invisible Highways",
+        "stat": "28,500",
+        "label": "Missing Coordinates",
+        "desc": "Before our audit, the Belt Parkway appeared safe because 60% of its crashes had no GPS data. We used Regex to put them back on the map.",
+        "icon": "map"
+    },
+    {
+        "id": "vehicle_chaos",
+        "title": "Taxi vs. TAXI vs. taxi",
+        "stat": "80+",
+        "label": "Vehicle Categories",
+        "desc": "We normalized 80+ variations of 'Sedan' and 'Taxi' into 25 clean standard categories for accurate reporting.",
+        "icon": "car"
+    }
+]
+
+
+def convert_types(df):
+    """Section 1 on a copy of the web columns: numeric columns with 0 for missing, parsed dates"""
+    df = df[[col for col in web_columns if col in df.columns]].copy()
     cols_to_numeric = ['SEVERITY_SCORE', 'LATITUDE', 'LONGITUDE', 
                        'NUMBER OF PERSONS INJURED', 'NUMBER OF PERSONS KILLED',
                        'DATA_INTEGRITY_SCORE', 'coord_recovery_flag', 'VULNERABILITY_FLAG']
     for col in cols_to_numeric:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-    
+
     df['SEVERITY_SCORE'] = df['SEVERITY_SCORE'].astype(float)
     df['CRASH DATE'] = pd.to_datetime(df['CRASH DATE'], errors='coerce')
-    df['CRASH TIME'] = pd.to_datetime(df['CRASH TIME'], format='%H:%M:%S', errors='coerce')
+    return df
 
-    # ------------------------------------------------------------------
-    # 2. COMPARATIVE STATS
-    # ------------------------------------------------------------------
-    stats = {
+
+def comparative_stats(df, old_stats):
+    return {
         "total_records": int(len(df)),
         "recovered_coords": int(df['coord_recovery_flag'].sum()) if 'coord_recovery_flag' in df.columns else 0,
         "total_casualties": int(df['NUMBER OF PERSONS INJURED'].sum() + df['NUMBER OF PERSONS KILLED'].sum()),
-        "integrity_score": round(float(df['DATA_INTEGRITY_SCORE'].mean() * 100), 1) if 'DATA_INTEGRITY_SCORE' in df.columns else 0,
+        "integrity_score": round(float(df['DATA_INTEGRITY_SCORE'].mean() * 100), 1) if 'DATA_INTEGRITY_SCORE' in df.columns and len(df) else 0,
         "vulnerable_crashes": int(df['VULNERABILITY_FLAG'].sum()) if 'VULNERABILITY_FLAG' in df.columns else 0,
-        
+    
         "old_stats": {
-            "missing_coords": int(old_missing_coords),
-            "integrity_score": round(float(old_integrity), 1)
+            "missing_coords": int(old_stats["missing_coords"]),
+            "integrity_score": round(float(old_stats["integrity"]), 1)
         }
     }
 
-    # ------------------------------------------------------------------
-    # 3. MAP POINTS (Top 1500)
-    # ------------------------------------------------------------------
-    print("Generating Map Points...")
+
+def select_map_points(df, limit=map_point_limit):
+    """The `limit` most severe crashes with coordinates"""
     map_df = df[
         (df['LATITUDE'].notna()) & 
         (df['LONGITUDE'].notna()) & 
         (df['LATITUDE'] != 0) & 
         (df['LONGITUDE'] != 0) & 
         (df['SEVERITY_SCORE'] > 0)
-    ].sort_values('SEVERITY_SCORE', ascending=False).head(1500)
-
-    map_points = []
-    for _, row in map_df.iterrows():
-        map_points.append({
-            "id": str(row['COLLISION_ID']),
-            "lat": round(float(row['LATITUDE']), 5),
-            "lng": round(float(row['LONGITUDE']), 5),
-            "severity": float(row['SEVERITY_SCORE']),
-            "img": "/img/crash_icon.png", 
-            "rec": int(row['coord_recovery_flag']) if 'coord_recovery_flag' in df.columns else 0
-        })
+    ].sort_values('SEVERITY_SCORE', ascending=False).head(limit)
 
-    # ------------------------------------------------------------------
-    # 4. CHART DATA (Recharts Compatible)
-    # ------------------------------------------------------------------
-    print("Generating Charts...")
-    
+    rec = map_df['coord_recovery_flag'].astype(int) if 'coord_recovery_flag' in df.columns else pd.Series(0, index=map_df.index)
+    return [{
+        "id": str(collision_id),
+        "lat": round(float(lat), 5),
+        "lng": round(float(lng), 5),
+        "severity": float(severity),
+        "img": "/img/crash_icon.png", 
+        "rec": int(flag)
+    } for collision_id, lat, lng, severity, flag in zip(
+        map_df['COLLISION_ID'].tolist(), map_df['LATITUDE'].tolist(), map_df['LONGITUDE'].tolist(),
+        map_df['SEVERITY_SCORE'].tolist(), rec.tolist())]
+
+
+def build_charts(cube):
+    """Recharts series from the rollup cube: severity per borough, mean severity per hour, top 5 factors"""
     # Chart 1: Borough Severity
-    borough_stats = df.groupby('BOROUGH')['SEVERITY_SCORE'].sum().reset_index()
-    chart_borough = borough_stats.to_dict(orient='records')
-    
-    # Chart 2: Hourly Trends
-    df['hour'] = df['CRASH TIME'].dt.hour
-    hourly_stats = df.groupby('hour')['SEVERITY_SCORE'].mean().reset_index()
-    chart_hourly = hourly_stats.to_dict(orient='records')
-    
+    borough_stats = rollup(cube, ['BOROUGH']).dropna(subset=['BOROUGH'])
+    chart_borough = [{"BOROUGH": str(borough), "SEVERITY_SCORE": float(severity)}
+                     for borough, severity in zip(borough_stats['BOROUGH'], borough_stats['SEVERITY_SCORE'])]
+
+    # Chart 2: Hourly Trends (mean = summed severity / crashes)
+    hourly_stats = rollup(cube, ['CRASH HOUR'])
+    hourly_stats = hourly_stats[hourly_stats['CRASH HOUR'] >= 0]
+    chart_hourly = [{"hour": int(hour), "SEVERITY_SCORE": float(severity / crashes)}
+                    for hour, severity, crashes in zip(hourly_stats['CRASH HOUR'], hourly_stats['SEVERITY_SCORE'],
+                                                       hourly_stats['CRASHES'])]
+
     # Chart 3: Contributing Factors (Top 5)
-    if 'CONTRIBUTING FACTOR VEHICLE 1' in df.columns:
-        factors = df['CONTRIBUTING FACTOR VEHICLE 1'].value_counts().head(5).reset_index()
-        factors.columns = ['factor', 'count']
-        chart_factors = factors.to_dict(orient='records')
-    else:
-        chart_factors = []
+    factors = rollup(cube, ['CONTRIBUTING FACTOR VEHICLE 1']).dropna(subset=['CONTRIBUTING FACTOR VEHICLE 1'])
+    factors = factors[factors['CRASHES'] > 0].sort_values('CRASHES', ascending=False, kind='stable').head(5)
+    chart_factors = [{"factor": str(factor), "count": int(count)}
+                     for factor, count in zip(factors['CONTRIBUTING FACTOR VEHICLE 1'], factors['CRASHES'])]
+
+    return {"borough": chart_borough, "hourly": chart_hourly, "factors": chart_factors}
+
+
+def build_timeline(cube):
+    """Monthly severity and crash count, from the rollup cube"""
+    months = rollup(cube, ['CRASH MONTH']).dropna(subset=['CRASH MONTH'])
+    return [{"month_year": str(month), "severity": float(severity), "count": int(count)}
+            for month, severity, count in zip(months['CRASH MONTH'], months['SEVERITY_SCORE'], months['COLLISIONS'])]
+
+
+def top_hotspots(df, limit=hotspot_limit):
+    """Top cells per grid level (integer groupbys on the stored cell ids)"""
+    hotspots = {}
+    for level in GRID_LEVELS:
+        top = grid_aggregates(df, level).sort_values('severity', ascending=False, kind='stable').head(limit)
+        hotspots[f"L{level}"] = [{
+            "cell": int(row.cell), "lat": float(row.lat), "lng": float(row.lng), "crashes": int(row.crashes),
+            "severity": float(row.severity), "casualties": int(row.casualties), "vulnerable": int(row.vulnerable)
+        } for row in top.itertuples()]
+    return hotspots
+
+
+def build_web_data(df, old_stats, report=None, point_limit=map_point_limit, cube=None):
+    """
+    Compute every section of the web payload from the sanitized table; the
+    charts and the timeline read the rollup cube (built here when not given)
+    """
+    report = report or RunReport('web')
+    if cube is None:
+        with report.stage('section_0_rollup_cube', len(df)) as stage:
+            print("Building rollup cube...")
+            cube = build_cube(df)
+            stage['rows_out'] = len(cube)
 
     # ------------------------------------------------------------------
-    # 5. DATA STORIES
+    # 1. ROBUST TYPE CONVERSION (Clean Data)
     # ------------------------------------------------------------------
-    stories = [
-        {
-            "id": "ghost_metrics",
-            "title": "The Time Travelers",
-            "stat": "3,500",
-            "label": "Future Dated Records",
-            "desc": "We found records dated in 2026 and 2027. This corruption would have crashed any standard BI tool. We isolated and flagged them.",
-            "icon": "clock"
-        },
-        {
-            "id": "invisible_highways",
-            "title": "The Invisible Highways",
-            "stat": "28,500",
-            "label": "Missing Coordinates",
-            "desc": "Before our audit, the Belt Parkway appeared safe because 60% of its crashes had no GPS data. We used Regex to put them back on the map.",
-            "icon": "map"
-        },
-        {
-            "id": "vehicle_chaos",
-            "title": "Taxi vs. TAXI vs. taxi",
-            "stat": "80+",
-            "label": "Vehicle Categories",
-            "desc": "We normalized 80+ variations of 'Sedan' and 'Taxi' into 25 clean standard categories for accurate reporting.",
-            "icon": "car"
-        }
-    ]
+    with report.stage('section_1_type_conversion', len(df)):
+        print("Converting types...")
+        df = convert_types(df)
 
     # ------------------------------------------------------------------
-    # 6. COMPILE & SAVE
+    # 2. COMPARATIVE STATS
     # ------------------------------------------------------------------
-    # ... (Same logic as before for Danger Zones & Timeline)
-    print("Identifying Danger Zones...")
-    danger_zones = []
-    if 'ON STREET NAME' in df.columns:
-        def get_intersection(row):
-            s1 = str(row['ON STREET NAME']).strip()
-            s2 = str(row['CROSS STREET NAME']).strip()
-            if s1 in ['nan', 'None', ''] or s2 in ['nan', 'None', '']: return "Unknown"
-            return f"{sorted([s1, s2])[0]} & {sorted([s1, s2])[1]}"
-
-        danger_df = df.copy()
-        danger_df['intersection'] = danger_df.apply(get_intersection, axis=1)
-        danger_group = danger_df[danger_df['intersection'] != "Unknown"].groupby('intersection').agg({
-            'SEVERITY_SCORE': 'sum', 'NUMBER OF PERSONS KILLED': 'sum', 'NUMBER OF PERSONS INJURED': 'sum',
-            'COLLISION_ID': 'count', 'LATITUDE': 'mean', 'LONGITUDE': 'mean'
-        }).sort_values('SEVERITY_SCORE', ascending=False).head(5)
-        
-        for name, row in danger_group.iterrows():
-            bor_series = danger_df[danger_df['intersection'] == name]['BOROUGH']
-            bor = bor_series.mode()[0] if not bor_series.mode().empty else "UNKNOWN"
-            danger_zones.append({
-                "name": name, "borough": str(bor),
-                "severity": float(row['SEVERITY_SCORE']), 
-                "casualties": int(row['NUMBER OF PERSONS KILLED'] + row['NUMBER OF PERSONS INJURED']),
-                "lat": round(float(row['LATITUDE']), 5), "lng": round(float(row['LONGITUDE']), 5)
-            })
+    with report.stage('section_2_comparative_stats', len(df)):
+        stats = comparative_stats(df, old_stats)
+
+    # ------------------------------------------------------------------
+    # 3. MAP POINTS (Top map_point_limit)
+    # ------------------------------------------------------------------
+    with report.stage('section_3_map_points', len(df)) as stage:
+        print("Generating Map Points...")
+        map_points = select_map_points(df, point_limit)
+        stage['rows_out'] = len(map_points)
+
+    # ------------------------------------------------------------------
+    # 4. CHART DATA (Recharts Compatible)
+    # ------------------------------------------------------------------
+    with report.stage('section_4_charts', len(df)):
+        print("Generating Charts...")
+        charts = build_charts(cube)
+
+    # ------------------------------------------------------------------
+    # 5-6. DANGER ZONES, TIMELINE & HOTSPOTS
+    # ------------------------------------------------------------------
+    with report.stage('section_6_danger_zones', len(df)) as stage:
+        print("Identifying Danger Zones...")
+        danger_zones = find_danger_zones(df) if 'ON STREET NAME' in df.columns else []
+        stage['rows_out'] = len(danger_zones)
 
     # Timeline (Monthly)
-    df['month_year'] = df['CRASH DATE'].dt.to_period('M').astype(str)
-    timeline = df[df['month_year'] != 'NaT'].groupby('month_year').agg({
-        'SEVERITY_SCORE': 'sum', 'COLLISION_ID': 'count'
-    }).reset_index().rename(columns={'COLLISION_ID': 'count', 'SEVERITY_SCORE': 'severity'}).sort_values('month_year')
-    timeline_data = timeline.to_dict(orient='records')
+    with report.stage('section_6_timeline', len(df)) as stage:
+        timeline_data = build_timeline(cube)
+        stage['rows_out'] = len(timeline_data)
+
+    with report.stage('section_7_hotspots', len(df)):
+        print("Ranking Grid Hotspots...")
+        hotspots = top_hotspots(df)
 
     web_data = {
         "meta": {
@@ -193,22 +370,131 @@ try:
         "stats": stats,
         "map_points": map_points,
         "danger_zones": danger_zones,
+        "hotspots": hotspots,
         "timeline": timeline_data,
-        "charts": {
-            "borough": chart_borough,
-            "hourly": chart_hourly,
-            "factors": chart_factors
-        },
-        "stories": stories
+        "charts": charts,
+        "stories": DATA_STORIES
     }
 
-    output_file = 'gridlock-report/public/web_data_v2.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(web_data, f, indent=2)
+    return web_data
+
+
+# ========================================================================
+# COMPACT PAYLOAD
+# ========================================================================
+
+def _number(value):
+    """Integral floats as ints ('12' instead of '12.0' in the JSON)"""
+    return int(value) if float(value).is_integer() else value
+
+
+def compact_web_data(web_data):
+    """
+    web_data with map_points stored column-wise: one array per field instead
+    of one object per point, coordinates as scaled integers and the fields
+    every point shares (img) written once under "constants". The other
+    sections are unchanged. gridlock-report/src/lib/webData.js decodes it.
+    """
+    points = web_data["map_points"]
+    origin = [NYC_LAT_MIN, NYC_LON_MIN]
+    columns = {
+        "count": len(points),
+        "constants": {key: points[0][key] for key in ("img",)} if points else {},
+        "scale": COORD_SCALE,
+        "origin": origin,
+        "id": [int(p["id"]) if p["id"].isdigit() else p["id"] for p in points],
+        "lat": [round((p["lat"] - origin[0]) * COORD_SCALE) for p in points],
+        "lng": [round((p["lng"] - origin[1]) * COORD_SCALE) for p in points],
+        "severity": [_number(p["severity"]) for p in points],
+        "rec": [p["rec"] for p in points],
+    }
+    return {"format": COMPACT_FORMAT, **web_data, "map_points": columns}
+
+
+def write_compact(web_data, path=compact_file):
+    """Minified columnar JSON plus .gz and .br copies for servers that send precompressed files"""
+    data = json.dumps(compact_web_data(web_data), separators=(',', ':')).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(data)
+    # mtime=0 keeps the .gz byte-identical across runs
+    with open(f"{path}.gz", 'wb') as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    paths = [path, f"{path}.gz"]
+    if HAVE_BROTLI:
+        with open(f"{path}.br", 'wb') as f:
+            f.write(brotli.compress(data, quality=11))
+        paths.append(f"{path}.br")
+    else:
+        print("Note: brotli not installed - skipping the .br copy (pip install brotli)")
+    return paths
+
+
+def print_payload_sizes(paths):
+    base = os.path.getsize(output_file)
+    print(f"   {output_file}: {base / 1024:,.1f} KB")
+    for path in paths:
+        size = os.path.getsize(path)
+        print(f"   {path}: {size / 1024:,.1f} KB ({base / size:.1f}x smaller)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the web JSON for the React report")
+    parser.add_argument('--compact', action='store_true',
+                        help=f"also write the columnar {compact_file} with .gz/.br copies")
+    parser.add_argument('--points', type=int, default=map_point_limit,
+                        help=f"most severe crashes listed in map_points (default {map_point_limit})")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("WEB DATA PROCESSOR - Project GRIDLOCK (NATIVE DASHBOARD EDITION)")
+    print("Generating optimized JSON with charts data...")
+    print("="*70)
+
+    report = RunReport('web')
+    try:
+        # Load Clean Data
+        print(f"Loading CLEAN dataset: {table_path(FINAL_TABLE)}")
+        with report.stage('load') as stage:
+            df = read_table(FINAL_TABLE, columns=web_columns)
+            stage['rows_out'] = len(df)
+        print_memory_report(df, 'web columns')
+
+        # Load Old Data (for comparison metrics) - only row count and latitude voids are needed
+        print(f"Loading OLD dataset: {old_file}")
+        with report.stage('load_old_stats') as stage:
+            old_stats = load_old_stats(old_file)
+            stage['rows_out'] = old_stats['total']
+
+        # Charts and timeline read the stored rollup cube when it is current
+        cube = load_cube()
+        print(f"Rollup cube: {f'{len(cube):,} cells' if cube is not None else 'none current, building from rows'}")
+        web_data = build_web_data(df, old_stats, report, point_limit=args.points, cube=cube)
+
+        with report.stage('export'):
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(web_data, f, indent=2)
+
+        if args.compact:
+            with report.stage('export_compact'):
+                compact_paths = write_compact(web_data)
+
+        with report.stage('section_7_hotspot_grid', len(df)):
+            with open(hotspots_file, 'w', encoding='utf-8') as f:
+                json.dump(build_hotspot_grid(df), f, separators=(',', ':'))
+
+        print(f"✓ JSON generated successfully: {output_file}")
+        print(f"✓ Hotspot grid: {hotspots_file}")
+        if args.compact:
+            print("✓ Compact payload:")
+            print_payload_sizes(compact_paths)
+        report.print_summary()
+        print(f"Run report: {report.write()}")
+
+    except Exception as e:
+        print(f"\n❌ FATAL ERROR: {str(e)}")
+        import traceback
+        traceback.print_exc()
 
-    print(f"✓ JSON generated successfully: {output_file}")
 
-except Exception as e:
-    print(f"\n❌ FATAL ERROR: {str(e)}")
-    import traceback
-    traceback.print_exc()
+if __name__ == '__main__':
+    main()